@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+"""
+Shared helpers for the benchmark scripts
+
+- Stand-in spidev / OPi.GPIO modules so the drivers import off-device
+- Fake sysfs GPIO and PWM trees
+- Loading the Raspberry Pi demo lib next to the Orange Pi lib (both are
+  packages called "lib")
+- Percentiles and JSON result output
+"""
+
+import os
+import sys
+import json
+import time
+import types
+import platform
+import threading
+import importlib.util
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+OPI_LIB = os.path.join(BENCH_DIR, '..', 'lib')
+DEMO_LIB = os.path.join(BENCH_DIR, '..', 'raspberryPi_TripleLCDHat_Demo', 'python', 'lib')
+PIN_CHECKER = os.path.join(BENCH_DIR, '..', '..', 'pin_checker')
+
+
+class FakeSpiDev:
+    """spidev.SpiDev stand-in that only counts what it is sent"""
+
+    def __init__(self, bus=None, device=None):
+        self.max_speed_hz = 0
+        self.mode = 0
+        self.bytes = 0
+        self.calls = 0
+
+    def open(self, bus, device):
+        pass
+
+    def close(self):
+        pass
+
+    def writebytes(self, data):
+        self.calls += 1
+        self.bytes += len(data)
+
+    writebytes2 = writebytes
+
+    def xfer2(self, data):
+        self.writebytes(data)
+        return [0] * len(data)
+
+
+def _fake_opi_gpio(root):
+    """OPi.GPIO stand-in over a sysfs-like tree (board pin N -> gpioN)
+
+    Like the real library, every output()/input() opens the value file.
+    """
+    gpio = types.ModuleType('OPi.GPIO')
+    gpio.BOARD, gpio.BCM, gpio.SUNXI = 10, 11, 12
+    gpio.OUT, gpio.IN = 'out', 'in'
+    gpio.HIGH, gpio.LOW = 1, 0
+    gpio._mode = None
+
+    def path(pin):
+        return os.path.join(root, f'gpio{pin}', 'value')
+
+    def setmode(mode):
+        gpio._mode = mode
+
+    def getmode():
+        return gpio._mode
+
+    def setup(pin, direction, initial=None, pull_up_down=None):
+        os.makedirs(os.path.dirname(path(pin)), exist_ok=True)
+        with open(path(pin), 'w') as f:
+            f.write('1\n' if initial else '0\n')
+
+    def output(pin, value):
+        with open(path(pin), 'w') as f:
+            f.write('1' if value else '0')
+
+    def input(pin):
+        with open(path(pin)) as f:
+            return int(f.read(1))
+
+    for fn in (setmode, getmode, setup, output, input):
+        setattr(gpio, fn.__name__, fn)
+    gpio.setwarnings = lambda flag: None
+    gpio.cleanup = lambda *pins: None
+    return gpio
+
+
+def make_fake_sysfs(root, pins):
+    """Create gpioN/{value,direction} for each pin under root"""
+    for pin in pins:
+        d = os.path.join(root, f'gpio{pin}')
+        os.makedirs(d, exist_ok=True)
+        for name, value in (('value', '0\n'), ('direction', 'out\n'), ('edge', 'none\n')):
+            with open(os.path.join(d, name), 'w') as f:
+                f.write(value)
+    for name in ('export', 'unexport'):
+        open(os.path.join(root, name), 'a').close()
+
+
+def make_fake_pwm(root, chip=0):
+    """Create pwmchipN under root whose export behaves like the kernel's
+
+    export is a FIFO served by a thread: writing a channel number to it
+    creates pwmN/{period,duty_cycle,enable}. Returns the list of exported
+    channel numbers, appended to as exports arrive.
+    """
+    chip_path = os.path.join(root, f'pwmchip{chip}')
+    os.makedirs(chip_path, exist_ok=True)
+    open(os.path.join(chip_path, 'unexport'), 'a').close()
+    export = os.path.join(chip_path, 'export')
+    os.mkfifo(export)
+    exported = []
+
+    def serve():
+        while True:
+            with open(export) as f:
+                text = f.read().strip()
+            if not text:
+                continue
+            channel = int(text)
+            exported.append(channel)
+            d = os.path.join(chip_path, f'pwm{channel}')
+            os.makedirs(d, exist_ok=True)
+            for name in ('period', 'duty_cycle', 'enable'):
+                with open(os.path.join(d, name), 'w') as f:
+                    f.write('0\n')
+
+    threading.Thread(target=serve, name='fake-pwm-export', daemon=True).start()
+    return exported
+
+
+def install_fakes(root):
+    """Register stand-in spidev and OPi.GPIO modules (off-device runs only)"""
+    spidev = types.ModuleType('spidev')
+    spidev.SpiDev = FakeSpiDev
+    sys.modules['spidev'] = spidev
+    opi = types.ModuleType('OPi')
+    opi.GPIO = _fake_opi_gpio(root)
+    sys.modules['OPi'] = opi
+    sys.modules['OPi.GPIO'] = opi.GPIO
+
+
+def load_module(name, path):
+    """Import a file under an explicit module name"""
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def load_package(name, directory):
+    """Import a package directory under an explicit name (e.g. the demo lib)"""
+    spec = importlib.util.spec_from_file_location(
+        name, os.path.join(directory, '__init__.py'), submodule_search_locations=[directory])
+    package = importlib.util.module_from_spec(spec)
+    sys.modules[name] = package
+    spec.loader.exec_module(package)
+    return package
+
+
+def percentiles(samples, points=(50, 90, 99)):
+    """{'p50': ..., 'p99': ..., 'max': ...} of a list of numbers"""
+    if not samples:
+        return {}
+    ordered = sorted(samples)
+    result = {f'p{p}': ordered[min(len(ordered) - 1, len(ordered) * p // 100)] for p in points}
+    result['max'] = ordered[-1]
+    result['mean'] = sum(ordered) / len(ordered)
+    return result
+
+
+def host_info():
+    return {
+        'host': platform.node(),
+        'machine': platform.machine(),
+        'python': platform.python_version(),
+        'timestamp': time.time(),
+    }
+
+
+def write_results(results, path=None):
+    """Print results as JSON, or write them to path"""
+    text = json.dumps(results, indent=2, sort_keys=True)
+    if path:
+        with open(path, 'w') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
@@ -0,0 +1,455 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+End-to-end cost of putting frames on the panels, stage by stage
+
+Runs the panel drivers off-device against two transports:
+- fake:     spidev / GPIO stand-ins that only count
+- emulated: the demo lib's ST7735S/ST7789 command-stream emulator, which
+            also checks that the last frame really ended up on the glass
+
+Drivers: LCD_0inch96 and LCD_1inch3 (demo lib, gpiozero) and
+LCD_0inch96_opi (Orange Pi lib, OPi.GPIO). Scenarios: static (same frame
+again), dashboard (one clock line changes), scroll (a ticker band moves)
+and motion (every pixel changes). Full frames go through every full-frame
+path of the driver, dashboard and scroll also through the window path
+(ShowImageWindow) where the driver has one.
+
+Per driver: RGB565 conversion ns/pixel. Per transport: window setup cost.
+Per scenario and path: FPS, frame time, bytes, SPI transfers, GPIO writes
+and syscalls per frame, and peak Python memory per frame (tracemalloc).
+Syscalls are estimated: one ioctl per started 4096 bytes of a spidev
+transfer, plus one ioctl per GPIO write for gpiozero (lgpio) or
+open+write+close for OPi.GPIO (sysfs).
+
+  python3 bench_display.py
+  python3 bench_display.py --drivers LCD_1inch3 --scenarios motion,scroll --json display.json
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+import importlib
+import contextlib
+import tracemalloc
+
+from _common import (OPI_LIB, DEMO_LIB, FakeSpiDev, host_info, install_fakes,
+                     load_package, percentiles, write_results)
+
+SPI_BUFSIZ = 4096       # spidev's per-ioctl transfer limit
+FONT = os.path.join(DEMO_LIB, '..', 'Font', 'Font01.ttf')
+DISTINCT_FRAMES = 16    # scenario frames are generated once and cycled
+MEM_FRAMES = 5          # frames run under tracemalloc per path
+
+DRIVERS = ('LCD_0inch96', 'LCD_0inch96_opi', 'LCD_1inch3')
+TRANSPORTS = ('fake', 'emulated')
+
+
+class Counters:
+    def __init__(self):
+        self.bytes = self.transfers = self.ioctls = self.gpio = 0
+
+    def spi(self, n):
+        self.transfers += 1
+        self.bytes += n
+        self.ioctls += max(1, -(-n // SPI_BUFSIZ))
+
+    def snapshot(self):
+        return (self.bytes, self.transfers, self.ioctls, self.gpio)
+
+
+class CountingSpi:
+    """Counts transfers on their way to a FakeSpiDev or EmulatedSpi"""
+
+    def __init__(self, inner, counters):
+        self.inner = inner
+        self.counters = counters
+        self.max_speed_hz = 0
+        self.mode = 0
+
+    def writebytes(self, data):
+        self.counters.spi(len(data))
+        self.inner.writebytes(data)
+
+    def writebytes2(self, data):
+        self.counters.spi(len(data))
+        self.inner.writebytes2(data)
+
+    def close(self):
+        self.inner.close()
+
+
+class CountingPin:
+    """gpiozero output stand-in for the demo drivers"""
+
+    def __init__(self, counters):
+        self.counters = counters
+        self.value = 0
+        self.frequency = None
+
+    def on(self):
+        self.counters.gpio += 1
+        self.value = 1
+
+    def off(self):
+        self.counters.gpio += 1
+        self.value = 0
+
+    def close(self):
+        pass
+
+
+class _BenchPins:
+    # Mixin for the demo driver classes: pins count instead of driving GPIO
+    counters = None
+
+    def gpio_mode(self, Pin, Mode, pull_up=None, active_state=True):
+        return CountingPin(self.counters)
+
+    def gpio_pwm(self, Pin):
+        return CountingPin(self.counters)
+
+
+class _PinLevel:
+    # DC level for the emulator, from the levels OPi.GPIO.output() was given
+    def __init__(self, levels, pin):
+        self.levels = levels
+        self.pin = pin
+
+    @property
+    def value(self):
+        return self.levels.get(self.pin, 0)
+
+
+class Panel:
+    """One driver on one transport, behind the same small interface
+
+    paths: {name: (update(image, rect), partial)}; full-frame paths ignore
+    rect, window paths send only the rect (x0, y0, x1, y1).
+    """
+
+    def __init__(self, width, height, counters, controller, gpio_syscalls,
+                 convert, window, paths, close):
+        self.width, self.height = width, height
+        self.counters = counters
+        self.controller = controller
+        self.gpio_syscalls = gpio_syscalls
+        self.convert = convert
+        self.window = window
+        self.paths = paths
+        self.close = close
+
+
+def rgb565(image):
+    import numpy as np
+    img = np.asarray(image.convert('RGB'))
+    pix = np.empty(img.shape[:2] + (2,), dtype=np.uint8)
+    pix[..., 0] = (img[..., 0] & 0xF8) | (img[..., 1] >> 5)
+    pix[..., 1] = ((img[..., 1] << 3) & 0xE0) | (img[..., 2] >> 3)
+    return pix.tobytes()
+
+
+def _emulator():
+    return importlib.import_module('rpi_lib.Emulator')
+
+
+def open_demo(name, transport):
+    cls = getattr(importlib.import_module('rpi_lib.' + name), name)
+    counters = Counters()
+    controller = None
+    if transport == 'emulated':
+        Emulator = _emulator()
+        controller = Emulator.Controller(**Emulator.PANELS[name])
+        inner = Emulator.EmulatedSpi(controller)
+    else:
+        inner = FakeSpiDev()
+    disp = type('Bench' + name, (_BenchPins, cls), {'counters': counters})(spi=CountingSpi(inner, counters))
+    if controller is not None:
+        inner.dc = disp.DC_PIN
+    disp.Init()
+
+    def window(image, rect):
+        x0, y0, x1, y1 = rect
+        disp.ShowImageWindow(image.crop(rect), x0, y0)
+
+    return Panel(disp.width, disp.height, counters, controller, 1,
+                 convert=disp.image_to_rgb565,
+                 window=lambda: disp.SetWindows(0, 0, disp.width, disp.height),
+                 paths={
+                     'ShowImage': (lambda image, rect: disp.ShowImage(image), False),
+                     'ShowBuffer': (lambda image, rect: disp.ShowBuffer(disp.image_to_rgb565(image)), False),
+                     'ShowImageWindow': (window, True),
+                 },
+                 close=disp.module_exit)
+
+
+def open_opi(name, transport):
+    if OPI_LIB not in sys.path:
+        sys.path.append(OPI_LIB)
+    import lcdconfig_opi as config
+    import LCD_0inch96_opi
+    counters = Counters()
+    levels = {}
+    output = getattr(config.GPIO.output, 'inner', config.GPIO.output)
+
+    def counted_output(pin, value):
+        counters.gpio += 1
+        levels[pin] = value
+        output(pin, value)
+    counted_output.inner = output
+    config.GPIO.output = counted_output
+
+    controller = None
+    config.OPiGPIO.cleanup()
+    config.OPiGPIO.setup()
+    if transport == 'emulated':
+        Emulator = _emulator()
+        controller = Emulator.Controller(**Emulator.PANELS['LCD_0inch96'])
+        inner = Emulator.EmulatedSpi(controller)
+        inner.dc = _PinLevel(levels, config.DC_PIN)
+    else:
+        inner = FakeSpiDev()
+    config.OPiGPIO.spi = CountingSpi(inner, counters)
+    drv = LCD_0inch96_opi.LCD_0inch96()
+    drv.init_lcd()
+
+    def convert(image):
+        # show_image converts inline: run it with the I/O switched off
+        saved = config.digital_write, config.spi_writebyte, config.spi_writebytes
+        config.digital_write = config.spi_writebyte = config.spi_writebytes = lambda *args: None
+        try:
+            drv.show_image(image)
+        finally:
+            config.digital_write, config.spi_writebyte, config.spi_writebytes = saved
+
+    return Panel(drv.width, drv.height, counters, controller, 3,
+                 convert=convert,
+                 window=lambda: drv.set_window(0, 0, drv.width, drv.height),
+                 paths={'show_image': (lambda image, rect: drv.show_image(image), False)},
+                 close=drv.cleanup)
+
+
+OPENERS = {
+    'LCD_0inch96': open_demo,
+    'LCD_1inch3': open_demo,
+    'LCD_0inch96_opi': open_opi,
+}
+
+
+def _font(size):
+    from PIL import ImageFont
+    if os.path.exists(FONT):
+        return ImageFont.truetype(FONT, size)
+    return ImageFont.load_default()
+
+
+def _base(w, h):
+    from PIL import Image, ImageDraw
+    image = Image.new('RGB', (w, h), 'WHITE')
+    draw = ImageDraw.Draw(image)
+    draw.rectangle((0, 0, w - 1, 17), fill='NAVY')
+    draw.text((4, 1), 'status', fill='WHITE', font=_font(14))
+    draw.rectangle((4, h - 30, w // 2, h - 24), fill='GREEN')
+    return image
+
+
+def scenario_static(w, h):
+    return [(_base(w, h), None)]
+
+
+def scenario_dashboard(w, h):
+    # A clock line changes on an otherwise fixed screen
+    from PIL import ImageDraw
+    rect = (4, 22, min(w - 4, 150), 46)
+    font = _font(20)
+    frames = []
+    for i in range(DISTINCT_FRAMES):
+        image = _base(w, h)
+        ImageDraw.Draw(image).text((rect[0], rect[1]), '12:%02d:%02d.%d' % (i // 6, i % 60, i % 10),
+                                   fill='BLACK', font=font)
+        frames.append((image, rect))
+    return frames
+
+
+def scenario_scroll(w, h):
+    # A ticker band along the bottom moves 2 px per frame
+    from PIL import ImageDraw
+    rect = (0, h - 20, w, h)
+    font = _font(16)
+    frames = []
+    for i in range(DISTINCT_FRAMES):
+        image = _base(w, h)
+        draw = ImageDraw.Draw(image)
+        draw.rectangle(rect, fill='BLACK')
+        draw.text((w - 2 * i, rect[1] + 1), 'cpu 12% temp 48C up 3d', fill='YELLOW', font=font)
+        frames.append((image, rect))
+    return frames
+
+
+def scenario_motion(w, h):
+    import numpy as np
+    from PIL import Image
+    rng = np.random.default_rng(0)
+    return [(Image.fromarray(rng.integers(0, 256, (h, w, 3), dtype=np.uint8)), None)
+            for _ in range(DISTINCT_FRAMES)]
+
+
+SCENARIOS = {
+    'static': scenario_static,
+    'dashboard': scenario_dashboard,
+    'scroll': scenario_scroll,
+    'motion': scenario_motion,
+}
+
+
+def per_frame(panel, before, frames):
+    after = panel.counters.snapshot()
+    nbytes, transfers, ioctls, gpio = (a - b for a, b in zip(after, before))
+    return {
+        'bytes_per_frame': nbytes / frames,
+        'spi_transfers_per_frame': transfers / frames,
+        'gpio_writes_per_frame': gpio / frames,
+        'syscalls_per_frame': (ioctls + gpio * panel.gpio_syscalls) / frames,
+    }
+
+
+def measure_convert(panel, images, count):
+    clock = time.perf_counter_ns
+    t0 = clock()
+    for i in range(count):
+        panel.convert(images[i % len(images)][0])
+    return (clock() - t0) / (count * panel.width * panel.height)
+
+
+def measure_window(panel, count):
+    before = panel.counters.snapshot()
+    clock = time.perf_counter_ns
+    samples = []
+    for _ in range(count):
+        t0 = clock()
+        panel.window()
+        samples.append((clock() - t0) / 1000)
+    result = per_frame(panel, before, count)
+    return {
+        'us': percentiles(samples),
+        'bytes': result['bytes_per_frame'],
+        'spi_transfers': result['spi_transfers_per_frame'],
+        'gpio_writes': result['gpio_writes_per_frame'],
+        'syscalls': result['syscalls_per_frame'],
+    }
+
+
+def measure_path(panel, update, partial, frames, count, budget):
+    # Window paths run after the full-frame ones, so the rest of the glass
+    # already shows the scenario's background
+    pixels = panel.width * panel.height
+    if partial:
+        x0, y0, x1, y1 = frames[0][1]
+        pixels = (x1 - x0) * (y1 - y0)
+    clock = time.perf_counter_ns
+    before = panel.counters.snapshot()
+    samples = []
+    deadline = time.monotonic() + budget
+    for i in range(count):
+        image, rect = frames[i % len(frames)]
+        t0 = clock()
+        update(image, rect)
+        samples.append(clock() - t0)
+        if time.monotonic() > deadline:
+            break
+    done = len(samples)
+    total = sum(samples)
+    result = {
+        'frames': done,
+        'pixels_per_frame': pixels,
+        'fps': done * 1e9 / total if total else 0.0,
+        'frame_us': percentiles([s / 1000 for s in samples]),
+        'ns_per_pixel': total / (done * pixels),
+        **per_frame(panel, before, done),
+    }
+    peaks = []
+    tracemalloc.start()
+    try:
+        for i in range(MEM_FRAMES):
+            image, rect = frames[(done + i) % len(frames)]
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+            update(image, rect)
+            peaks.append(tracemalloc.get_traced_memory()[1] - base)
+    finally:
+        tracemalloc.stop()
+    result['peak_bytes_per_frame'] = max(peaks)
+    if panel.controller is not None:
+        # The whole glass should now show the last frame sent
+        result['matches_frame'] = panel.controller.visible().tobytes() == rgb565(image)
+    return result
+
+
+def bench_transport(name, transport, results, args):
+    with open(os.devnull, 'w') as quiet, contextlib.redirect_stdout(quiet):
+        # the Orange Pi driver prints on every call
+        panel = OPENERS[name](name, transport)
+        try:
+            frames = {s: SCENARIOS[s](panel.width, panel.height) for s in args.scenarios.split(',')}
+            if 'convert_ns_per_pixel' not in results:
+                results['convert_ns_per_pixel'] = measure_convert(
+                    panel, scenario_motion(panel.width, panel.height), args.convert_count)
+            result = {'window_setup': measure_window(panel, args.window_count), 'scenarios': {}}
+            for scenario, images in frames.items():
+                paths = result['scenarios'][scenario] = {}
+                for path, (update, partial) in panel.paths.items():
+                    if partial and images[0][1] is None:
+                        continue    # nothing changes in part of the screen
+                    paths[path] = measure_path(panel, update, partial, images,
+                                               args.frames, args.budget)
+        finally:
+            panel.close()
+    return result
+
+
+def bench_driver(name, args):
+    results = {}
+    for transport in args.transports.split(','):
+        try:
+            results[transport] = bench_transport(name, transport, results, args)
+        except Exception as e:
+            results[transport] = {'error': f"{type(e).__name__}: {e}"}
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Display path benchmark")
+    parser.add_argument('--drivers', default=','.join(DRIVERS), help="comma separated driver names")
+    parser.add_argument('--transports', default=','.join(TRANSPORTS), help="fake and/or emulated")
+    parser.add_argument('--scenarios', default=','.join(SCENARIOS), help="comma separated scenario names")
+    parser.add_argument('--frames', type=int, default=200, help="frames per path")
+    parser.add_argument('--budget', type=float, default=5.0, help="stop a path after this many seconds")
+    parser.add_argument('--convert-count', type=int, default=50, help="conversions for ns/pixel")
+    parser.add_argument('--window-count', type=int, default=2000, help="window setups timed")
+    parser.add_argument('--json', metavar='FILE', help="write results to FILE instead of stdout")
+    args = parser.parse_args()
+
+    tmp = tempfile.TemporaryDirectory(prefix='bench_display_')
+    install_fakes(tmp.name)
+    load_package('rpi_lib', DEMO_LIB)
+
+    results = {}
+    for name in args.drivers.split(','):
+        try:
+            results[name] = bench_driver(name, args)
+        except Exception as e:
+            results[name] = {'skipped': f"{type(e).__name__}: {e}"}
+
+    write_results({
+        'benchmark': 'display',
+        'frames': args.frames,
+        **host_info(),
+        'results': results,
+    }, args.json)
+    tmp.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+GPIO toggle-rate and latency benchmark across the GPIO backends
+
+Backends (all driving the same header pin):
+
+- lcdconfig-sysfs: lcdconfig.GPIOPin, opens the value file on every write
+- opi-gpio:        OPi.GPIO through lcdconfig_opi.OrangePiGPIO
+- gpiozero:        the Raspberry Pi demo lcdconfig (gpiozero devices)
+- pin-checker:     pin_checker Pin, value file held open (pwrite/pread)
+
+For each backend: toggles/sec, write and read latency percentiles, and
+the jitter of a fixed-rate toggle loop.
+
+On the board (real sysfs, OPi.GPIO and gpiozero):
+  sudo python3 bench_gpio.py --pin 12 --json gpio.json
+Anywhere else the hardware libraries are replaced by stand-ins over a
+temporary sysfs-like tree and gpiozero uses its MockFactory:
+  python3 bench_gpio.py --fake
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+import statistics
+import contextlib
+
+from _common import (OPI_LIB, DEMO_LIB, PIN_CHECKER, host_info, install_fakes,
+                     load_module, make_fake_sysfs, percentiles, write_results)
+
+sys.path.append(OPI_LIB)
+sys.path.append(PIN_CHECKER)
+
+import sysfs_gpio
+from gpio_control import GPIOController, Pin, physical_to_gpio
+
+
+def backend_lcdconfig_sysfs(pin, root, fake):
+    import lcdconfig
+    gpio_num = physical_to_gpio(pin)
+    if not fake:
+        sysfs_gpio.export(gpio_num, 'out')
+    out = lcdconfig.GPIOPin(gpio_num)
+    out.value_path = sysfs_gpio.value_path(gpio_num, root)
+
+    def write(value):
+        if value:
+            out.on()
+        else:
+            out.off()
+
+    def close():
+        if not fake:
+            sysfs_gpio.unexport(gpio_num)
+
+    # GPIOPin is output only
+    return write, None, close
+
+
+def backend_opi_gpio(pin, root, fake):
+    import lcdconfig_opi
+    board = lcdconfig_opi.OrangePiGPIO()
+    with contextlib.redirect_stdout(None):
+        board.setup()
+        if pin not in (lcdconfig_opi.RST_PIN, lcdconfig_opi.DC_PIN,
+                       lcdconfig_opi.CS_PIN, lcdconfig_opi.BL_PIN):
+            lcdconfig_opi.GPIO.setup(pin, lcdconfig_opi.GPIO.OUT)
+
+    def close():
+        with contextlib.redirect_stdout(None):
+            board.cleanup()
+
+    return (lambda value: board.digital_write(pin, value),
+            lambda: board.digital_read(pin), close)
+
+
+def backend_gpiozero(pin, root, fake):
+    rpi = load_module('rpi_lcdconfig', os.path.join(DEMO_LIB, 'lcdconfig.py'))
+    if fake:
+        from gpiozero.pins.mock import MockFactory
+        rpi.Device.pin_factory = MockFactory()
+    # Only the pin under test; skip __init__ so no RST/DC/BL devices are claimed
+    board = object.__new__(rpi.RaspberryPi)
+    device = board.gpio_mode(f'BOARD{pin}', True)
+    return (lambda value: board.digital_write(device, value),
+            lambda: board.digital_read(device), device.close)
+
+
+def backend_pin_checker(pin, root, fake):
+    out = Pin(pin, 'out', gpio=GPIOController(root=root))
+    return out.set, out.read, out.close
+
+
+BACKENDS = {
+    'lcdconfig-sysfs': backend_lcdconfig_sysfs,
+    'opi-gpio': backend_opi_gpio,
+    'gpiozero': backend_gpiozero,
+    'pin-checker': backend_pin_checker,
+}
+
+
+def time_calls(fn, count, toggle):
+    """Per-call latencies in µs; fn gets alternating 1/0 when toggle is set"""
+    clock = time.perf_counter_ns
+    samples = [0] * count
+    if toggle:
+        for i in range(count):
+            t0 = clock()
+            fn(i & 1 ^ 1)
+            samples[i] = clock() - t0
+    else:
+        for i in range(count):
+            t0 = clock()
+            fn()
+            samples[i] = clock() - t0
+    return [s / 1000 for s in samples]
+
+
+def timed_toggles(write, rate, count):
+    """Toggle at a fixed rate with absolute deadlines; lateness in µs"""
+    period = int(1e9 / rate)
+    clock = time.monotonic_ns
+    late = []
+    deadline = clock() + period
+    for i in range(count):
+        remaining = deadline - clock()
+        if remaining > 0:
+            time.sleep(remaining / 1e9)
+        write(i & 1 ^ 1)
+        late.append((clock() - deadline) / 1000)
+        deadline += period
+    return late
+
+
+def measure(write, read, args):
+    for i in range(min(100, args.count)):     # warm up caches and lazy setup
+        write(i & 1)
+    writes = time_calls(write, args.count, True)
+    result = {
+        'toggles_per_sec': len(writes) / (sum(writes) / 1e6),
+        'write_us': percentiles(writes),
+        'write_stdev_us': statistics.pstdev(writes),
+    }
+    if read is not None:
+        result['read_us'] = percentiles(time_calls(read, args.count, False))
+    late = timed_toggles(write, args.rate, args.jitter_count)
+    result['jitter'] = {
+        'rate_hz': args.rate,
+        'late_us': percentiles(late),
+        'stdev_us': statistics.pstdev(late),
+    }
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="GPIO toggle-rate and latency benchmark")
+    parser.add_argument('--pin', type=int, default=12, help="physical header pin (default: 12, LCD backlight)")
+    parser.add_argument('--backends', default=','.join(BACKENDS), help="comma separated backend names")
+    parser.add_argument('--count', type=int, default=20000, help="writes/reads per latency run")
+    parser.add_argument('--rate', type=float, default=1000, help="toggle rate for the jitter run (Hz)")
+    parser.add_argument('--jitter-count', type=int, default=2000)
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument('--fake', action='store_true', help="use stand-ins instead of the hardware")
+    mode.add_argument('--hardware', action='store_true', help="fail instead of falling back to stand-ins")
+    parser.add_argument('--json', metavar='FILE', help="write results to FILE instead of stdout")
+    args = parser.parse_args()
+
+    fake = args.fake or (not args.hardware and not os.path.isdir(sysfs_gpio.GPIO_ROOT))
+    root = sysfs_gpio.GPIO_ROOT
+    tmp = None
+    if fake:
+        tmp = tempfile.TemporaryDirectory(prefix='bench_gpio_')
+        root = tmp.name
+        make_fake_sysfs(root, [physical_to_gpio(args.pin)])
+        install_fakes(root)
+
+    results = {}
+    for name in args.backends.split(','):
+        try:
+            write, read, close = BACKENDS[name](args.pin, root, fake)
+        except Exception as e:
+            results[name] = {'skipped': f"{type(e).__name__}: {e}"}
+            continue
+        try:
+            results[name] = measure(write, read, args)
+        except OSError as e:
+            results[name] = {'error': str(e)}
+        finally:
+            close()
+
+    write_results({
+        'benchmark': 'gpio',
+        'mode': 'fake' if fake else 'hardware',
+        'pin': args.pin,
+        'count': args.count,
+        **host_info(),
+        'results': results,
+    }, args.json)
+    if tmp is not None:
+        tmp.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+GPIO export startup benchmark for Orange Pi Zero 2W
+
+Measures how long it takes to get a set of header pins exported and
+configured as outputs with three strategies:
+
+- legacy:     export, then sleep 100 ms per pin (old GPIOController/OrangePi)
+- sequential: export one pin at a time, waiting only for readiness
+- batch:      sysfs_gpio.export_many() - export all, wait for all together
+
+Run as root (or a gpio group member) on the board:
+  sudo python3 bench_gpio_export.py --legacy
+  sudo python3 bench_gpio_export.py --pins 71,72,73 --repeat 20 --json out.json
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'lib'))
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'pin_checker'))
+
+import sysfs_gpio
+from gpio_control import ORANGEPI_ZERO2W_PINOUT
+
+
+def run_legacy(pins, root):
+    for pin in pins:
+        sysfs_gpio._request_export(pin, root)
+        time.sleep(0.1)
+        sysfs_gpio.set_direction(pin, 'out', root)
+
+
+def run_sequential(pins, root):
+    for pin in pins:
+        sysfs_gpio.export(pin, 'out', root=root)
+
+
+def run_batch(pins, root):
+    sysfs_gpio.export_many(pins, 'out', root=root)
+
+
+STRATEGIES = {
+    'legacy': run_legacy,
+    'sequential': run_sequential,
+    'batch': run_batch,
+}
+
+
+def measure(strategy, pins, root, repeat):
+    samples = []
+    for _ in range(repeat):
+        for pin in pins:
+            sysfs_gpio.unexport(pin, root)
+        start = time.perf_counter()
+        STRATEGIES[strategy](pins, root)
+        samples.append((time.perf_counter() - start) * 1000)
+    ready = sum(1 for pin in pins if sysfs_gpio.is_ready(pin, root))
+    for pin in pins:
+        sysfs_gpio.unexport(pin, root)
+    return {
+        'pins': len(pins),
+        'ready': ready,
+        'repeat': repeat,
+        'total_ms_median': statistics.median(samples),
+        'total_ms_max': max(samples),
+        'per_pin_ms': statistics.median(samples) / len(pins),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="GPIO export startup benchmark")
+    parser.add_argument('--pins', help="comma separated GPIO numbers (default: all header GPIOs)")
+    parser.add_argument('--root', default=sysfs_gpio.GPIO_ROOT, help="sysfs gpio directory")
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--legacy', action='store_true', help="also time the fixed-sleep strategy (slow)")
+    parser.add_argument('--json', metavar='FILE', help="write results to FILE instead of stdout")
+    args = parser.parse_args()
+
+    if args.pins:
+        pins = [int(p) for p in args.pins.split(',')]
+    else:
+        pins = sorted(ORANGEPI_ZERO2W_PINOUT.values())
+
+    strategies = ['sequential', 'batch']
+    if args.legacy:
+        strategies.insert(0, 'legacy')
+
+    results = {
+        'benchmark': 'gpio_export',
+        'timestamp': time.time(),
+        'root': args.root,
+        'results': {name: measure(name, pins, args.root, 1 if name == 'legacy' else args.repeat)
+                    for name in strategies},
+    }
+    text = json.dumps(results, indent=2)
+    if args.json:
+        with open(args.json, 'w') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
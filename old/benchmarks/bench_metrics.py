@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Per-sample cost of the status-panel metrics (demo lib Gain_Param)
+
+Times each Gain_Param provider in steady state (files already open) and,
+with --legacy, the subprocess-based versions CPU.py used to run every
+frame (top, df).
+
+  python3 bench_metrics.py
+  python3 bench_metrics.py --legacy --json metrics.json
+"""
+
+import os
+import time
+import argparse
+import importlib
+
+from _common import DEMO_LIB, host_info, load_package, percentiles, write_results
+
+load_package('rpi_lib', DEMO_LIB)
+Gain_Param = importlib.import_module('rpi_lib.Gain_Param')
+
+
+def legacy_top():
+    os.popen('top -bi -n 2 -d 0.02').read()
+
+
+def legacy_df():
+    os.popen('df -h /').read()
+
+
+def measure(fn, count):
+    fn()     # open files / first sample
+    clock = time.perf_counter_ns
+    samples = []
+    for _ in range(count):
+        t0 = clock()
+        fn()
+        samples.append((clock() - t0) / 1000)
+    return {'count': count, 'us': percentiles(samples)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Status metric sampling cost")
+    parser.add_argument('--count', type=int, default=5000, help="samples per metric")
+    parser.add_argument('--legacy', action='store_true', help="also time the top/df subprocesses")
+    parser.add_argument('--json', metavar='FILE', help="write results to FILE instead of stdout")
+    args = parser.parse_args()
+
+    gain = Gain_Param.Gain_Param()
+    metrics = {
+        'cpu': gain.GET_CPU,
+        'memory': gain.GET_MemInfo,
+        'net': gain.GET_Net,
+        'temp': gain.GET_Temps,
+        'disk_cached': gain.GET_Disks,
+        'disk_refresh': lambda: (gain.GET_Disks(), gain.disk.refresh()),
+        'ip': gain.GET_IP,
+    }
+    results = {}
+    for name, fn in metrics.items():
+        try:
+            results[name] = measure(fn, args.count)
+        except OSError as e:
+            results[name] = {'skipped': str(e)}
+    if args.legacy:
+        for name, fn in (('legacy_top', legacy_top), ('legacy_df', legacy_df)):
+            results[name] = measure(fn, 20)
+
+    write_results({'benchmark': 'metrics', **host_info(), 'results': results}, args.json)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Check the sysfs PWM backlight driver against a fake /sys/class/pwm tree
+
+Runs lib/backlight.HardwarePWM on a temporary pwmchip0 (see make_fake_pwm)
+and checks the channel export, the period/duty_cycle write order the
+kernel requires (duty never above period at any step), the enable writes
+and the unexport on close. Also checks the software PWM frequency cap.
+Needs no hardware:
+  python3 check_backlight.py
+"""
+
+import os
+import sys
+import tempfile
+
+from _common import OPI_LIB, make_fake_pwm
+
+sys.path.append(OPI_LIB)
+
+import backlight
+
+
+def record_writes():
+    """Patch backlight._write_fd to log (attribute, value) pairs"""
+    writes = []
+    write_fd = backlight._write_fd
+
+    def logged(fd, value):
+        writes.append((os.path.basename(os.readlink(f'/proc/self/fd/{fd}')), value))
+        write_fd(fd, value)
+    backlight._write_fd = logged
+    return writes
+
+
+def read(path):
+    with open(path) as f:
+        return f.read().strip()
+
+
+def check(failures, name, got, want):
+    if got == want:
+        print(f"   ✅ {name}")
+    else:
+        print(f"   ❌ {name}: got {got!r}, want {want!r}")
+        failures.append(name)
+
+
+def check_hardware(root, failures):
+    print("HardwarePWM on a fake pwmchip0")
+    exported = make_fake_pwm(root, chip=0)
+    writes = record_writes()
+    chan = os.path.join(root, 'pwmchip0', 'pwm0')
+
+    pwm = backlight.HardwarePWM(0, 0, frequency=1000, root=root)
+    check(failures, "channel 0 exported", (exported, pwm.exported), ([0], True))
+    check(failures, "init: duty, period, then enable", writes,
+          [('duty_cycle', 0), ('period', 1000000), ('enable', 1)])
+
+    del writes[:]
+    pwm.set_duty(0.5)
+    check(failures, "set_duty writes duty_cycle only", writes, [('duty_cycle', 500000)])
+
+    del writes[:]
+    pwm.set_frequency(2000)
+    check(failures, "shorter period: duty_cycle before period", writes,
+          [('duty_cycle', 250000), ('period', 500000)])
+
+    del writes[:]
+    pwm.set_frequency(500)
+    check(failures, "longer period: period before duty_cycle", writes,
+          [('period', 2000000), ('duty_cycle', 1000000)])
+
+    del writes[:]
+    pwm.close()
+    check(failures, "close disables the output", writes, [('enable', 0)])
+    check(failures, "close unexports the channel", read(os.path.join(root, 'pwmchip0', 'unexport')), '0')
+    check(failures, "files hold the last values",
+          [read(os.path.join(chan, n)) for n in ('period', 'duty_cycle', 'enable')],
+          ['2000000', '1000000', '0'])
+
+
+def check_software(failures):
+    print("SoftwarePWM frequency cap")
+
+    class Pin:
+        def on(self):
+            pass
+
+        def off(self):
+            pass
+
+    pwm = backlight.SoftwarePWM(Pin(), frequency=1000)
+    try:
+        check(failures, "constructor caps at MAX_FREQUENCY", pwm.frequency, backlight.SoftwarePWM.MAX_FREQUENCY)
+        pwm.set_frequency(1000)
+        check(failures, "set_frequency caps at MAX_FREQUENCY", pwm.frequency, backlight.SoftwarePWM.MAX_FREQUENCY)
+        pwm.set_frequency(100)
+        check(failures, "lower frequencies are kept", pwm.frequency, 100)
+    finally:
+        pwm.close()
+
+
+def main():
+    failures = []
+    with tempfile.TemporaryDirectory(prefix='check_backlight_') as root:
+        check_hardware(root, failures)
+    check_software(failures)
+    if failures:
+        print(f"❌ {len(failures)} check(s) failed")
+        sys.exit(1)
+    print("✅ All backlight checks passed")
+
+
+if __name__ == "__main__":
+    main()
@@ -16,6 +16,7 @@ import json
 
 # Add the lib directory to the Python path
 sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'lib'))
+import sysfs_gpio
 
 # Simple GPIO-only version - EXACT copy from test_pins_cycle.py
 class SimpleOrangePi:
@@ -28,20 +29,13 @@ class SimpleOrangePi:
     
     def setup(self, pin, direction):
         """Setup a GPIO pin"""
-        try:
-            # Export the pin
-            with open('/sys/class/gpio/export', 'w') as f:
-                f.write(str(pin))
-            time.sleep(0.01)
-            
-            # Set direction
-            with open(f'/sys/class/gpio/gpio{pin}/direction', 'w') as f:
-                f.write(direction)
-            
-            self.setup_pins.append(pin)
-            return True
-        except:
-            return False
+        return self.setup_many([pin], direction)[pin]
+    
+    def setup_many(self, pins, direction):
+        """Setup several GPIO pins, exporting them in one batch"""
+        ready = sysfs_gpio.export_many(pins, direction)
+        self.setup_pins.extend(pin for pin, ok in ready.items() if ok)
+        return ready
     
     def digital_write(self, pin, value):
         """Write HIGH or LOW to a pin"""
@@ -117,12 +111,12 @@ class PinIdentifier:
         print(f"Testing {len(ALL_PINS)} GPIO pins...")
         print("Setting up pins as outputs...\n")
         
+        ready = self.opi.setup_many(ALL_PINS, self.opi.OUT)
         for pin in ALL_PINS:
-            try:
-                self.opi.setup(pin, self.opi.OUT)
+            if ready[pin]:
                 self.working_pins.append(pin)
-            except Exception as e:
-                print(f"Could not setup pin {pin}: {e}")
+            else:
+                print(f"Could not setup pin {pin}")
         
         print(f"Successfully configured {len(self.working_pins)} pins\n")
     
@@ -26,6 +26,9 @@ import time
 
 # Add the lib directory to the Python path
 sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'lib'))
+import sysfs_gpio
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'pin_checker'))
+from gpio_control import WaveformScheduler, walking_ones
 
 # Simple GPIO-only version - no SPI needed for pin testing
 class SimpleOrangePi:
@@ -38,20 +41,13 @@ class SimpleOrangePi:
     
     def setup(self, pin, direction):
         """Setup a GPIO pin"""
-        try:
-            # Export the pin
-            with open('/sys/class/gpio/export', 'w') as f:
-                f.write(str(pin))
-            time.sleep(0.01)
-            
-            # Set direction
-            with open(f'/sys/class/gpio/gpio{pin}/direction', 'w') as f:
-                f.write(direction)
-            
-            self.setup_pins.append(pin)
-            return True
-        except:
-            return False
+        return self.setup_many([pin], direction)[pin]
+    
+    def setup_many(self, pins, direction):
+        """Setup several GPIO pins, exporting them in one batch"""
+        ready = sysfs_gpio.export_many(pins, direction)
+        self.setup_pins.extend(pin for pin, ok in ready.items() if ok)
+        return ready
     
     def digital_write(self, pin, value):
         """Write HIGH or LOW to a pin"""
@@ -88,42 +84,55 @@ def cycle_pins(pins, delay, cycles_info):
     """Cycle through pins with specified timing"""
     print(cycles_info)
     
-    for cycle in range(len(pins) if cycles_info.startswith("indefinitely") else int(cycles_info.split()[0])):
-        if not cycles_info.startswith("indefinitely"):
-            print(f"  Cycle {cycle + 1}...")
-        
-        for i, pin in enumerate(pins):
+    cycles = len(pins) if cycles_info.startswith("indefinitely") else int(cycles_info.split()[0])
+    
+    def pin_setter(i, pin):
+        def set_pin(value):
+            # Report a failing pin and keep cycling, as the sleep loop did;
+            # an exception here would end the whole waveform
             try:
-                # Turn pin HIGH
-                opi.digital_write(pin, opi.HIGH)
-                print(f"GPIO {pin} = HIGH (pin {i+1}/{len(pins)})", end='                    \r')
-                sys.stdout.flush()
-                time.sleep(delay / 2)
-                
-                # Turn pin LOW
-                opi.digital_write(pin, opi.LOW)
-                time.sleep(delay / 2)
-                
+                opi.digital_write(pin, value)
+                if value:
+                    print(f"GPIO {pin} = HIGH (pin {i+1}/{len(pins)})", end='                    \r')
+                    sys.stdout.flush()
             except Exception as e:
                 print(f"Error with pin {pin}: {e}")
-                continue
+        return set_pin
+    
+    setters = [pin_setter(i, pin) for i, pin in enumerate(pins)]
+    
+    def steps():
+        for cycle in range(cycles):
+            if not cycles_info.startswith("indefinitely"):
+                print(f"  Cycle {cycle + 1}...")
+            yield from walking_ones(setters, delay, cycles=1)
+    
+    # The scheduler keeps each pin's slot on an absolute timeline, so the
+    # cycle speed is exact no matter how long the writes take
+    global current
+    current = scheduler.add(steps())
+    current.wait()
+    if current.error is not None:
+        print(f"Cycle stopped: {current.error}")
 
 # Initialize OrangePi
 print("Initializing simple GPIO library...")
 opi = SimpleOrangePi()
+scheduler = WaveformScheduler()
+current = None
 
 print(f"Testing {len(ALL_PINS)} GPIO pins...")
 print("Watch for ANY change on the HAT (backlight, display activity, etc.)")
 print("Press Ctrl+C to stop\n")
 
-# Setup all pins as outputs
-working_pins = []
+# Setup all pins as outputs (one batch export, no per-pin sleeps)
+setup_start = time.monotonic()
+ready = opi.setup_many(ALL_PINS, opi.OUT)
+working_pins = [pin for pin in ALL_PINS if ready[pin]]
 for pin in ALL_PINS:
-    try:
-        opi.setup(pin, opi.OUT)
-        working_pins.append(pin)
-    except Exception as e:
-        print(f"Could not setup pin {pin}: {e}")
+    if not ready[pin]:
+        print(f"Could not setup pin {pin}")
+print(f"Setup took {(time.monotonic() - setup_start) * 1000:.1f} ms")
 
 print(f"Successfully configured {len(working_pins)} pins")
 print("Starting timed cycles...\n")
@@ -140,6 +149,10 @@ try:
     
 except KeyboardInterrupt:
     print("\n\nCleaning up...")
+    if current is not None:
+        current.cancel()
+    scheduler.close()
+    print(f"Timing: {scheduler.stats()}")
     # Turn all pins off using the library
     for pin in working_pins:
         try:
@@ -0,0 +1,298 @@
+# -*- coding: utf-8 -*-
+"""
+Backlight PWM drivers for Orange Pi Zero 2W
+Hardware PWM through /sys/class/pwm, with a software PWM fallback for
+boards (or pins) that have no PWM channel routed to the backlight.
+"""
+
+import os
+import time
+import logging
+import threading
+
+PWM_ROOT = '/sys/class/pwm'
+
+
+def _write_fd(fd, value):
+    """Write an integer to a held-open sysfs attribute"""
+    # The trailing newline keeps the value readable when the "sysfs" is a
+    # plain directory tree: a shorter value never merges with old digits.
+    os.pwrite(fd, b'%d\n' % value, 0)
+
+
+class HardwarePWM:
+    """One sysfs PWM channel with its period/duty/enable files kept open"""
+
+    def __init__(self, chip=0, channel=0, frequency=1000, root=PWM_ROOT, timeout=1.0):
+        self.chip_path = os.path.join(root, f'pwmchip{chip}')
+        self.path = os.path.join(self.chip_path, f'pwm{channel}')
+        self.channel = channel
+        self.exported = False
+
+        if not os.path.isdir(self.chip_path):
+            raise OSError(f"PWM chip not found: {self.chip_path}")
+        if not os.path.isdir(self.path):
+            with open(os.path.join(self.chip_path, 'export'), 'w') as f:
+                f.write(str(channel))
+            self.exported = True
+            self._wait_for(os.path.join(self.path, 'duty_cycle'), timeout)
+
+        self._period_fd = os.open(os.path.join(self.path, 'period'), os.O_WRONLY)
+        self._duty_fd = os.open(os.path.join(self.path, 'duty_cycle'), os.O_WRONLY)
+        self._enable_fd = os.open(os.path.join(self.path, 'enable'), os.O_WRONLY)
+
+        self.period_ns = 0
+        self.duty_ns = 0
+        self.duty = 0.0
+        self.enabled = False
+        self.set_frequency(frequency)
+        self.set_duty(0.0)
+        self.enable(True)
+
+    @staticmethod
+    def _wait_for(path, timeout):
+        """Wait for udev to create (and chmod) a freshly exported channel"""
+        deadline = time.monotonic() + timeout
+        delay = 0.0005
+        while not os.access(path, os.W_OK):
+            if time.monotonic() > deadline:
+                raise OSError(f"PWM channel did not appear: {path}")
+            time.sleep(delay)
+            delay = min(delay * 2, 0.02)
+
+    def set_frequency(self, frequency):
+        """Change the PWM frequency, keeping the current duty fraction"""
+        period_ns = int(round(1e9 / frequency))
+        duty_ns = int(round(period_ns * self.duty))
+        # The kernel rejects duty_cycle > period at every intermediate step
+        if duty_ns > self.period_ns:
+            _write_fd(self._period_fd, period_ns)
+            _write_fd(self._duty_fd, duty_ns)
+        else:
+            _write_fd(self._duty_fd, duty_ns)
+            _write_fd(self._period_fd, period_ns)
+        self.period_ns = period_ns
+        self.duty_ns = duty_ns
+
+    def set_duty(self, duty):
+        """Set duty cycle as a fraction 0.0-1.0"""
+        duty = min(max(duty, 0.0), 1.0)
+        duty_ns = int(round(self.period_ns * duty))
+        if duty_ns != self.duty_ns:
+            _write_fd(self._duty_fd, duty_ns)
+            self.duty_ns = duty_ns
+        self.duty = duty
+
+    def enable(self, on=True):
+        """Start or stop the PWM output"""
+        _write_fd(self._enable_fd, 1 if on else 0)
+        self.enabled = on
+
+    def close(self):
+        """Disable the channel and release its files"""
+        if self._enable_fd is None:
+            return
+        try:
+            self.enable(False)
+        except OSError:
+            pass
+        for fd in (self._period_fd, self._duty_fd, self._enable_fd):
+            os.close(fd)
+        self._period_fd = self._duty_fd = self._enable_fd = None
+        if self.exported:
+            try:
+                with open(os.path.join(self.chip_path, 'unexport'), 'w') as f:
+                    f.write(str(self.channel))
+            except OSError:
+                pass
+
+
+class SoftwarePWM:
+    """Bit-banged PWM on a GPIO pin, driven by a dedicated thread
+
+    The thread sleeps to absolute deadlines and measures how late each edge
+    lands; the running lateness is used to wake up early next time and is
+    reported by stats(). A duty of 0 or 1 parks the thread on an event, so a
+    fully on (or off) backlight costs no CPU.
+    """
+
+    # Software PWM at kHz rates costs a core in Python; a couple of hundred
+    # Hz is already flicker-free for an LED backlight.
+    MAX_FREQUENCY = 200
+
+    def __init__(self, pin, frequency=200):
+        self.pin = pin
+        self.frequency = min(frequency, self.MAX_FREQUENCY)
+        self.duty = 0.0
+
+        # Keep the value file open rather than letting GPIOPin reopen it
+        # twice per period
+        self._fd = None
+        if hasattr(pin, 'value_path'):
+            try:
+                self._fd = os.open(pin.value_path, os.O_WRONLY)
+            except OSError:
+                self._fd = None
+
+        self._lead = 0.0
+        self._edges = 0
+        self._late_sum = 0.0
+        self._late_max = 0.0
+
+        self._wake = threading.Event()
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name='SoftwarePWM', daemon=True)
+        self._level(0)
+        self._thread.start()
+
+    def _level(self, value):
+        if self._fd is not None:
+            os.pwrite(self._fd, b'1\n' if value else b'0\n', 0)
+        elif value:
+            self.pin.on()
+        else:
+            self.pin.off()
+
+    def _sleep_until(self, deadline):
+        remaining = deadline - self._lead - time.monotonic()
+        if remaining > 0:
+            time.sleep(remaining)
+        late = time.monotonic() - deadline
+        self._edges += 1
+        self._late_sum += late
+        if late > self._late_max:
+            self._late_max = late
+        # Exponential average of wake-up lateness; only ever lead, never lag
+        self._lead = max(0.0, self._lead + 0.05 * late)
+
+    def _run(self):
+        while self._running:
+            duty = self.duty
+            if duty <= 0.0 or duty >= 1.0:
+                self._level(1 if duty >= 1.0 else 0)
+                self._wake.wait()
+                self._wake.clear()
+                continue
+            period = 1.0 / self.frequency
+            start = time.monotonic()
+            self._level(1)
+            self._sleep_until(start + period * duty)
+            self._level(0)
+            self._sleep_until(start + period)
+        self._level(0)
+
+    def set_frequency(self, frequency):
+        """Change the PWM frequency (at most MAX_FREQUENCY)"""
+        self.frequency = min(frequency, self.MAX_FREQUENCY)
+
+    def set_duty(self, duty):
+        """Set duty cycle as a fraction 0.0-1.0"""
+        self.duty = min(max(duty, 0.0), 1.0)
+        self._wake.set()
+
+    def stats(self):
+        """Edge timing statistics in microseconds"""
+        edges = self._edges
+        return {
+            'edges': edges,
+            'mean_late_us': (self._late_sum / edges) * 1e6 if edges else 0.0,
+            'max_late_us': self._late_max * 1e6,
+            'lead_us': self._lead * 1e6,
+        }
+
+    def close(self):
+        """Stop the thread and leave the pin LOW"""
+        if not self._running:
+            return
+        self._running = False
+        self._wake.set()
+        self._thread.join()
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+
+class Backlight:
+    """Brightness control with fades run on a background timer thread"""
+
+    def __init__(self, pwm, fade_rate=100):
+        self.pwm = pwm
+        self.fade_rate = fade_rate
+        self.level = 0.0
+
+        self._cond = threading.Condition()
+        self._fade = None   # (start_time, duration, start_level, target_level)
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name='BacklightFade', daemon=True)
+        self._thread.start()
+
+    def set(self, duty):
+        """Set brightness immediately (0-100), cancelling any fade"""
+        with self._cond:
+            self._fade = None
+            self._apply(duty / 100.0)
+            self._cond.notify_all()
+
+    def fade(self, duty, duration=0.5):
+        """Fade to brightness (0-100) over duration seconds, without blocking"""
+        with self._cond:
+            self._fade = (time.monotonic(), duration, self.level, duty / 100.0)
+            self._cond.notify_all()
+
+    def wait(self, timeout=None):
+        """Block until the running fade (if any) finishes"""
+        with self._cond:
+            return self._cond.wait_for(lambda: self._fade is None, timeout)
+
+    def set_frequency(self, frequency):
+        """Change the underlying PWM frequency"""
+        self.pwm.set_frequency(frequency)
+
+    def _apply(self, level):
+        self.level = min(max(level, 0.0), 1.0)
+        self.pwm.set_duty(self.level)
+
+    def _run(self):
+        step = 1.0 / self.fade_rate
+        with self._cond:
+            while self._running:
+                if self._fade is None:
+                    self._cond.wait()
+                    continue
+                start, duration, begin, target = self._fade
+                now = time.monotonic()
+                t = (now - start) / duration if duration > 0 else 1.0
+                if t >= 1.0:
+                    self._apply(target)
+                    self._fade = None
+                    self._cond.notify_all()
+                    continue
+                self._apply(begin + (target - begin) * t)
+                # Step on a fixed grid from the fade start so steps don't drift
+                next_tick = start + (int((now - start) / step) + 1) * step
+                self._cond.wait(max(0.0, next_tick - time.monotonic()))
+
+    def close(self):
+        """Stop the fade thread and release the PWM output"""
+        with self._cond:
+            if not self._running:
+                return
+            self._running = False
+            self._cond.notify_all()
+        self._thread.join()
+        self.pwm.close()
+
+
+def open_backlight(pin, pwm_channel=None, frequency=1000, root=PWM_ROOT):
+    """Return a Backlight on hardware PWM if available, else software PWM
+
+    pwm_channel is a (chip, channel) tuple naming the sysfs PWM output wired
+    to the backlight; pin is the GPIO used for the software fallback.
+    """
+    if pwm_channel is not None:
+        chip, channel = pwm_channel
+        try:
+            return Backlight(HardwarePWM(chip, channel, frequency, root=root))
+        except OSError as e:
+            logging.warning(f"Hardware PWM unavailable ({e}), using software PWM")
+    return Backlight(SoftwarePWM(pin, frequency))
@@ -0,0 +1,231 @@
+# -*- coding: utf-8 -*-
+"""
+Edge-triggered button input for Orange Pi Zero 2W
+Uses the sysfs GPIO "edge" attribute and epoll, so an idle key costs no CPU
+and a press is dispatched as soon as the kernel reports the interrupt.
+"""
+
+import os
+import time
+import select
+import logging
+import threading
+import collections
+
+try:
+    from . import sysfs_gpio
+except ImportError:
+    import sysfs_gpio
+
+GPIO_ROOT = sysfs_gpio.GPIO_ROOT
+
+PRESS = 'press'
+RELEASE = 'release'
+HOLD = 'hold'
+
+# timestamp is time.monotonic_ns() taken when the edge was picked up
+ButtonEvent = collections.namedtuple('ButtonEvent', 'pin kind value timestamp')
+
+
+def _write(path, value):
+    with open(path, 'w') as f:
+        f.write(str(value))
+
+
+class Button:
+    """GPIO input with debounced press/release/hold events
+
+    Callback attributes follow gpiozero naming (when_activated,
+    when_deactivated, when_held) so the Raspberry Pi examples work
+    unchanged; callbacks are called without arguments. Events are also put
+    on `events` when a queue.Queue is given.
+    """
+
+    def __init__(self, pin, active_high=True, bounce_time=0.01, hold_time=1.0,
+                 events=None, watcher=None, root=GPIO_ROOT):
+        self.pin = pin
+        self.active_high = active_high
+        self.bounce_time = bounce_time
+        self.hold_time = hold_time
+        self.events = events
+        self.path = os.path.join(root, f'gpio{pin}')
+        self.value_path = os.path.join(self.path, 'value')
+
+        self.when_activated = None
+        self.when_deactivated = None
+        self.when_held = None
+
+        sysfs_gpio.export(pin, 'in', root=root)
+        _write(os.path.join(self.path, 'edge'), 'both')
+
+        self.fd = os.open(self.value_path, os.O_RDONLY | os.O_NONBLOCK)
+        self.is_pressed = self._read_active()
+        self.last_change = time.monotonic_ns()
+        # A key already down at start-up was never pressed while we
+        # watched: no HOLD for it, only after a real press edge
+        self.held = self.is_pressed
+        self._presses = 0
+        self._pressed = threading.Condition()
+
+        self.watcher = watcher if watcher is not None else default_watcher()
+        self.watcher.add(self)
+
+    def _read_active(self):
+        raw = os.pread(self.fd, 2, 0)[:1] == b'1'
+        return raw == self.active_high
+
+    @property
+    def value(self):
+        """1 while the button is active, like gpiozero"""
+        return 1 if self._read_active() else 0
+
+    def wait_for_press(self, timeout=None):
+        """Block until the next press event; False on timeout"""
+        with self._pressed:
+            seen = self._presses
+            return self._pressed.wait_for(lambda: self._presses != seen, timeout)
+
+    def close(self):
+        """Stop watching and release the value file"""
+        if self.fd is None:
+            return
+        self.watcher.remove(self)
+        try:
+            _write(os.path.join(self.path, 'edge'), 'none')
+        except OSError:
+            pass
+        os.close(self.fd)
+        self.fd = None
+
+
+class ButtonWatcher:
+    """Single epoll thread serving every Button
+
+    Debounce: an edge is accepted only when bounce_time has passed since the
+    last accepted change. Edges inside the window are not lost; the level is
+    re-read when the window closes, so a bounce that settles in a new state
+    still produces its event. Long presses use the epoll timeout, never a
+    polling loop.
+    """
+
+    def __init__(self):
+        self._epoll = select.epoll()
+        self._buttons = {}
+        self._recheck = {}      # fd -> monotonic_ns deadline for settling
+        # Re-entrant so callbacks may close() their own Button
+        self._lock = threading.RLock()
+        self._wake_r, self._wake_w = os.pipe()
+        os.set_blocking(self._wake_r, False)
+        self._epoll.register(self._wake_r, select.EPOLLIN)
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name='ButtonWatcher', daemon=True)
+        self._thread.start()
+
+    def add(self, button):
+        with self._lock:
+            self._buttons[button.fd] = button
+            # Consume the initial "readable" state sysfs reports on open
+            os.pread(button.fd, 2, 0)
+            self._epoll.register(button.fd, select.EPOLLPRI | select.EPOLLERR)
+        os.write(self._wake_w, b'x')
+
+    def remove(self, button):
+        with self._lock:
+            if self._buttons.pop(button.fd, None) is not None:
+                self._epoll.unregister(button.fd)
+            self._recheck.pop(button.fd, None)
+        os.write(self._wake_w, b'x')
+
+    def _timeout(self, now):
+        """Seconds until the next debounce recheck or hold deadline"""
+        deadline = None
+        for fd, when in self._recheck.items():
+            deadline = when if deadline is None else min(deadline, when)
+        for button in self._buttons.values():
+            if button.is_pressed and not button.held and button.hold_time:
+                when = button.last_change + int(button.hold_time * 1e9)
+                deadline = when if deadline is None else min(deadline, when)
+        if deadline is None:
+            return -1
+        return max(0, deadline - now) / 1e9
+
+    def _dispatch(self, button, kind, now):
+        if kind == PRESS:
+            callback = button.when_activated
+            with button._pressed:
+                button._presses += 1
+                button._pressed.notify_all()
+        elif kind == RELEASE:
+            callback = button.when_deactivated
+        else:
+            callback = button.when_held
+        if button.events is not None:
+            button.events.put(ButtonEvent(button.pin, kind, 1 if kind != RELEASE else 0, now))
+        if callback is not None:
+            try:
+                callback()
+            except Exception:
+                logging.exception(f"Button {button.pin} {kind} callback failed")
+
+    def _sample(self, button, now):
+        # Always read: sysfs keeps signalling POLLPRI until the value file
+        # is re-read, so skipping it would spin for the whole bounce window
+        active = button._read_active()
+        if now - button.last_change < int(button.bounce_time * 1e9):
+            self._recheck[button.fd] = button.last_change + int(button.bounce_time * 1e9)
+            return
+        self._recheck.pop(button.fd, None)
+        if active == button.is_pressed:
+            return
+        button.is_pressed = active
+        button.last_change = now
+        button.held = False
+        self._dispatch(button, PRESS if active else RELEASE, now)
+
+    def _run(self):
+        while self._running:
+            with self._lock:
+                timeout = self._timeout(time.monotonic_ns())
+            events = self._epoll.poll(timeout)
+            now = time.monotonic_ns()
+            with self._lock:
+                for fd, _mask in events:
+                    if fd == self._wake_r:
+                        try:
+                            os.read(self._wake_r, 64)
+                        except BlockingIOError:
+                            pass
+                        continue
+                    button = self._buttons.get(fd)
+                    if button is not None:
+                        self._sample(button, now)
+                for fd, when in list(self._recheck.items()):
+                    if when <= now and fd in self._buttons:
+                        self._sample(self._buttons[fd], now)
+                for button in list(self._buttons.values()):
+                    if (button.is_pressed and not button.held and button.hold_time and
+                            now - button.last_change >= int(button.hold_time * 1e9)):
+                        button.held = True
+                        self._dispatch(button, HOLD, now)
+
+    def close(self):
+        """Stop the watcher thread"""
+        self._running = False
+        os.write(self._wake_w, b'x')
+        self._thread.join()
+        self._epoll.close()
+        os.close(self._wake_r)
+        os.close(self._wake_w)
+
+
+_default_watcher = None
+_default_lock = threading.Lock()
+
+
+def default_watcher():
+    """Shared watcher used by Buttons created without an explicit one"""
+    global _default_watcher
+    with _default_lock:
+        if _default_watcher is None:
+            _default_watcher = ButtonWatcher()
+        return _default_watcher
@@ -16,6 +16,15 @@ import spidev
 import logging
 import numpy as np
 
+try:
+    from . import backlight
+    from . import buttons
+    from . import sysfs_gpio
+except ImportError:
+    import backlight
+    import buttons
+    import sysfs_gpio
+
 class GPIOPin:
     """Simple GPIO pin wrapper using sysfs"""
     def __init__(self, pin):
@@ -45,7 +54,7 @@ class GPIOPin:
 class OrangePi:
     """Orange Pi hardware interface using sysfs GPIO"""
     
-    def __init__(self, spi=spidev.SpiDev(1,0), spi_freq=10000000, rst=24, dc=4, bl=13, bl_freq=1000, i2c=None, i2c_freq=100000):     
+    def __init__(self, spi=spidev.SpiDev(1,0), spi_freq=10000000, rst=24, dc=4, bl=13, bl_freq=1000, i2c=None, i2c_freq=100000, bl_pwm=None):     
         self.np = np
         self.INPUT = False
         self.OUTPUT = True
@@ -58,24 +67,22 @@ class OrangePi:
         self.dc_pin = dc
         self.bl_pin = bl
         
-        # Initialize GPIO pins via sysfs
-        self._export_gpio(rst)
-        self._export_gpio(dc)
-        self._export_gpio(bl)
-        
-        time.sleep(0.1)  # Wait for export
-        
-        self._set_direction(rst, "out")
-        self._set_direction(dc, "out")
-        self._set_direction(bl, "out")
+        # Initialize GPIO pins via sysfs: export all three at once and wait
+        # only as long as it takes for the value files to become writable
+        ready = sysfs_gpio.export_many([rst, dc, bl], "out")
+        for pin, ok in ready.items():
+            if not ok:
+                logging.warning(f"GPIO {pin} not ready after export")
         
         # Create pin objects
         self.RST_PIN = GPIOPin(rst)
         self.DC_PIN = GPIOPin(dc)
         self.BL_PIN = GPIOPin(bl)
         
-        # Backlight control (simple on/off for now, no PWM)
+        # Backlight: hardware PWM when bl_pwm=(chip, channel) names the
+        # sysfs PWM output wired to BL, software PWM on the BL pin otherwise
         self.bl_state = 1.0
+        self.backlight = backlight.open_backlight(self.BL_PIN, bl_pwm, bl_freq)
         
         # Initialize SPI
         self.SPI = spi
@@ -84,33 +91,30 @@ class OrangePi:
             self.SPI.mode = 0b00
     
     def _export_gpio(self, pin):
-        """Export GPIO pin via sysfs"""
-        try:
-            with open('/sys/class/gpio/export', 'w') as f:
-                f.write(str(pin))
-        except:
-            # Pin might already be exported
-            pass
+        """Export GPIO pin via sysfs and wait until it is usable"""
+        sysfs_gpio.export(pin)
     
     def _unexport_gpio(self, pin):
         """Unexport GPIO pin"""
-        try:
-            with open('/sys/class/gpio/unexport', 'w') as f:
-                f.write(str(pin))
-        except:
-            pass
+        sysfs_gpio.unexport(pin)
     
     def _set_direction(self, pin, direction):
         """Set GPIO direction (in/out)"""
-        try:
-            with open(f'/sys/class/gpio/gpio{pin}/direction', 'w') as f:
-                f.write(direction)
-        except Exception as e:
-            logging.warning(f"Could not set direction for GPIO {pin}: {e}")
+        if not sysfs_gpio.set_direction(pin, direction):
+            logging.warning(f"Could not set direction for GPIO {pin}")
 
     def gpio_mode(self, Pin, Mode, pull_up=None, active_state=True):
-        """Configure GPIO pin - returns the pin object"""
-        return GPIOPin(Pin)
+        """Configure GPIO pin - returns the pin object
+
+        Inputs are edge-triggered Buttons, so gpiozero-style
+        when_activated/when_deactivated callbacks fire on Orange Pi too.
+        """
+        if Mode:
+            return GPIOPin(Pin)
+        # sysfs cannot set pulls; like gpiozero, pull_up only picks the
+        # active level (pulled up means active LOW)
+        active_high = active_state if pull_up is None else not pull_up
+        return buttons.Button(Pin, active_high=active_high)
 
     def digital_write(self, pin, value):
         """Write digital value to pin"""
@@ -141,16 +145,19 @@ class OrangePi:
             self.SPI.writebytes(data)
             
     def bl_DutyCycle(self, duty):
-        """Set backlight duty cycle (0-100) - simplified to on/off"""
+        """Set backlight duty cycle (0-100)"""
         self.bl_state = duty / 100.0
-        if duty > 0:
-            self.BL_PIN.on()
-        else:
-            self.BL_PIN.off()
-        
+        self.backlight.set(duty)
+
+    def bl_Fade(self, duty, duration=0.5):
+        """Fade backlight to duty cycle (0-100) in the background"""
+        self.bl_state = duty / 100.0
+        self.backlight.fade(duty, duration)
+
     def bl_Frequency(self, freq):
-        """Set backlight PWM frequency - not implemented in simple mode"""
-        pass
+        """Set backlight PWM frequency"""
+        self.BL_freq = freq
+        self.backlight.set_frequency(freq)
            
     def module_init(self):
         """Initialize the module"""
@@ -168,6 +175,7 @@ class OrangePi:
         logging.debug("gpio cleanup...")
         self.digital_write(self.RST_PIN, 1)
         self.digital_write(self.DC_PIN, 0)
+        self.backlight.close()
         self.BL_PIN.off()
         
         # Unexport GPIOs
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+"""
+sysfs GPIO export helpers for Orange Pi Zero 2W
+Waits for gpioN/value to become usable instead of sleeping a fixed time.
+
+The kernel creates gpioN/ synchronously on export; what takes time is udev
+fixing up group/permissions so non-root users can write it. Polling
+os.access() with a short exponential back-off catches that in well under a
+millisecond on an idle board, and a batch export overlaps the wait for all
+pins instead of paying it once per pin.
+"""
+
+import os
+import time
+import errno
+
+GPIO_ROOT = '/sys/class/gpio'
+
+
+def _write(path, value):
+    with open(path, 'w') as f:
+        f.write(str(value))
+
+
+def value_path(pin, root=GPIO_ROOT):
+    """Path of a pin's value attribute"""
+    return os.path.join(root, f'gpio{pin}', 'value')
+
+
+def is_ready(pin, root=GPIO_ROOT):
+    """True when the pin is exported and its value file is writable"""
+    return os.access(value_path(pin, root), os.W_OK)
+
+
+def _request_export(pin, root):
+    """Write to export; a pin that is already exported is not an error"""
+    if os.path.exists(value_path(pin, root)):
+        return True
+    try:
+        _write(os.path.join(root, 'export'), pin)
+        return True
+    except OSError as e:
+        # EBUSY: exported by someone else in the meantime
+        return e.errno == errno.EBUSY
+
+
+def wait_ready(pins, timeout=1.0, root=GPIO_ROOT):
+    """Wait until every pin in pins is ready; returns the set still pending"""
+    pending = {pin for pin in pins if not is_ready(pin, root)}
+    deadline = time.monotonic() + timeout
+    delay = 0.0002
+    while pending and time.monotonic() < deadline:
+        time.sleep(delay)
+        delay = min(delay * 2, 0.01)
+        pending = {pin for pin in pending if not is_ready(pin, root)}
+    return pending
+
+
+def set_direction(pin, direction, root=GPIO_ROOT):
+    """Set direction ("in", "out", "high" or "low"); returns success"""
+    try:
+        _write(os.path.join(root, f'gpio{pin}', 'direction'), direction)
+        return True
+    except OSError:
+        return False
+
+
+def export(pin, direction=None, timeout=1.0, root=GPIO_ROOT):
+    """Export one pin and wait for it to be usable; returns success"""
+    return export_many([pin], direction, timeout, root)[pin]
+
+
+def export_many(pins, direction=None, timeout=1.0, root=GPIO_ROOT):
+    """Export several pins at once and wait for all of them together
+
+    Returns {pin: success}. direction, if given, is applied to each pin
+    that became ready.
+    """
+    requested = [pin for pin in pins if _request_export(pin, root)]
+    pending = wait_ready(requested, timeout, root)
+    result = {}
+    for pin in pins:
+        ok = pin in requested and pin not in pending
+        if ok and direction is not None:
+            ok = set_direction(pin, direction, root)
+        result[pin] = ok
+    return result
+
+
+def unexport(pin, root=GPIO_ROOT):
+    """Unexport a pin; returns success"""
+    try:
+        _write(os.path.join(root, 'unexport'), pin)
+        return True
+    except OSError:
+        return False
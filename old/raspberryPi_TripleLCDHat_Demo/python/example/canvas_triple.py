@@ -0,0 +1,51 @@
+#!/usr/bin/python
+# -*- coding: UTF-8 -*-
+# All three HAT panels as one canvas: a label slides across them and only
+# the strip it moves through is sent each frame.
+import sys
+import time
+import logging
+import spidev as SPI
+sys.path.append("..")
+from lib import LCD_0inch96
+from lib import LCD_1inch3
+from lib import Canvas
+from PIL import ImageFont
+
+logging.basicConfig(level=logging.DEBUG)
+
+try:
+    disp_0 = LCD_0inch96.LCD_0inch96(spi=SPI.SpiDev(0, 0),spi_freq=10000000,rst=24,dc=4,bl=13)
+    disp_1 = LCD_0inch96.LCD_0inch96(spi=SPI.SpiDev(0, 1),spi_freq=10000000,rst=23,dc=5,bl=12)
+    disp_2 = LCD_1inch3.LCD_1inch3(spi=SPI.SpiDev(1, 0),spi_freq=10000000,rst=27,dc=22,bl=19)
+    for disp in (disp_0, disp_1, disp_2):
+        disp.Init()
+        disp.bl_DutyCycle(100)
+
+    # Two 160x80 panels stacked on the left, the 240x240 panel to their right
+    canvas = Canvas.VirtualCanvas()
+    canvas.add('top', disp_0, 0, 0, bus=0)
+    canvas.add('bottom', disp_1, 0, 80, bus=0)
+    canvas.add('big', disp_2, 160, 0, bus=1)
+    canvas.flush()
+
+    font = ImageFont.truetype("../Font/Font01.ttf",24)
+    width, height = canvas.size
+    x, y = -120, 68
+    while True:
+        strip = (max(0, x - 4), y, min(width, x + 124), y + 30)
+        canvas.draw.rectangle(strip, fill = "WHITE")
+        canvas.draw.text((x, y), 'Triple HAT', font = font, fill = "BLUE")
+        canvas.invalidate(strip)
+        canvas.flush()
+        x = x + 4 if x < width else -120
+        time.sleep(0.02)
+
+except IOError as e:
+    logging.info(e)
+except KeyboardInterrupt:
+    canvas.close()
+    for disp in (disp_0, disp_1, disp_2):
+        disp.module_exit()
+    logging.info("quit:")
+    exit()
@@ -0,0 +1,23 @@
+#!/usr/bin/python
+# -*- coding: UTF-8 -*-
+# Same screens as CPU.py, driven by dashboard.json; only changed widgets are redrawn
+#   python dashboard.py [layout.json]
+import os
+import sys
+import logging
+sys.path.append("..")
+from lib import Dashboard
+
+logging.basicConfig(level=logging.DEBUG)
+
+path = sys.argv[1] if len(sys.argv) > 1 else os.path.join(os.path.dirname(os.path.abspath(__file__)), 'dashboard.json')
+
+try:
+    dash = Dashboard.Dashboard(Dashboard.load_layout(path))
+    dash.run()
+except IOError as e:
+    logging.info(e)
+except KeyboardInterrupt:
+    logging.info("quit: %d widget updates", dash.pushes)
+    dash.close()
+    exit()
@@ -0,0 +1,58 @@
+#!/usr/bin/python
+# -*- coding: UTF-8 -*-
+# Display daemon: owns all three HAT panels and draws what clients send.
+#   python display_server.py [--socket /tmp/lcd.sock] [--port 7035] [--emulator DIR]
+# Panels are 0 (0.96inch CE0), 1 (0.96inch CE1) and 2 (1.3inch). From
+# another process:
+#   from lib import Display_Server
+#   lcd = Display_Server.Client('/tmp/lcd.sock')
+#   lcd.fill(2, 0, 0, 240, 240, (0, 0, 255))
+import sys
+import asyncio
+import argparse
+import logging
+sys.path.append("..")
+from lib import LCD_0inch96
+from lib import LCD_1inch3
+from lib import Display_Server
+from lib import Emulator
+
+logging.basicConfig(level=logging.DEBUG)
+
+parser = argparse.ArgumentParser(description="LCD display server")
+parser.add_argument('--socket', default='/tmp/lcd.sock', help="UNIX socket path")
+parser.add_argument('--port', type=int, help="also listen on this localhost TCP port")
+parser.add_argument('--emulator', metavar='DIR',
+                    help="no HAT: emulate the panels and save panelN.png snapshots to DIR on exit")
+args = parser.parse_args()
+
+if args.emulator:
+    disp_0 = Emulator.emulate(LCD_0inch96.LCD_0inch96)
+    disp_1 = Emulator.emulate(LCD_0inch96.LCD_0inch96)
+    disp_2 = Emulator.emulate(LCD_1inch3.LCD_1inch3)
+else:
+    import spidev as SPI
+    disp_0 = LCD_0inch96.LCD_0inch96(spi=SPI.SpiDev(0, 0),spi_freq=10000000,rst=24,dc=4,bl=13)
+    disp_1 = LCD_0inch96.LCD_0inch96(spi=SPI.SpiDev(0, 1),spi_freq=10000000,rst=23,dc=5,bl=12)
+    disp_2 = LCD_1inch3.LCD_1inch3(spi=SPI.SpiDev(1, 0),spi_freq=10000000,rst=27,dc=22,bl=19)
+displays = (disp_0, disp_1, disp_2)
+for disp in displays:
+    disp.Init()
+    disp.clear()
+    disp.bl_DutyCycle(100)
+
+server = Display_Server.DisplayServer()
+server.add(disp_0, bus=0)
+server.add(disp_1, bus=0)
+server.add(disp_2, bus=1)
+try:
+    asyncio.run(server.serve(args.socket, port=args.port))
+except KeyboardInterrupt:
+    server.close()
+    if args.emulator:
+        for i, disp in enumerate(displays):
+            disp.emulator.save('%s/panel%d.png' % (args.emulator, i))
+    for disp in displays:
+        disp.module_exit()
+    logging.info("quit:")
+    exit()
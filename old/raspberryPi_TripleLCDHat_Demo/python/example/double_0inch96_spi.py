@@ -26,11 +26,17 @@ device_1 = 1
 import re 
 import math
 from lib import Gain_Param
+from lib import Mirror
 
 #Initialize screen
 disp_0 = LCD_0inch96.LCD_0inch96(spi=SPI.SpiDev(bus_0, device_0),spi_freq=10000000,rst=RST_0,dc=DC_0,bl=BL_0)
 disp_1 = LCD_0inch96.LCD_0inch96(spi=SPI.SpiDev(bus_1, device_1),spi_freq=10000000,rst=RST_1,dc=DC_1,bl=BL_1)
 
+# Same frame on both panels: converted to RGB565 once, written to each
+mirror = Mirror.MirrorGroup()
+mirror.add(disp_0, bus=bus_0)
+mirror.add(disp_1, bus=bus_1)
+
 # Define the BCM pin number of the button
 KEY1_PIN = 25
 KEY2_PIN = 26
@@ -78,8 +84,7 @@ image1 = Image.new("RGB", (disp_0.width, disp_0.height), "WHITE")
 draw = ImageDraw.Draw(image1)
 gain = Gain_Param.Gain_Param()
 
-disp_0.ShowImage(image1)
-disp_1.ShowImage(image1)
+mirror.show(image1)
 
 logging.basicConfig(level=logging.DEBUG)
 
@@ -93,14 +98,12 @@ try:
             logging.info("draw text")
             draw.text((20, 0), u'你好微雪', font = Font1, fill = "CYAN")
             draw.text((18, 50), 'Hello Waveshare', font = Font2, fill = "CYAN")
-            disp_0.ShowImage(image1)
-            disp_1.ShowImage(image1)
+            mirror.show(image1)
             time.sleep(1.5)
 
             logging.info("show image")
             image = Image.open('../pic/LCD_0inch96.jpg')
-            disp_0.ShowImage(image)
-            disp_1.ShowImage(image)
+            mirror.show(image)
             time.sleep(1.5)
 
         if curr_state_key2 == 1:
@@ -0,0 +1,48 @@
+#!/usr/bin/python
+# -*- coding: UTF-8 -*-
+import sys
+import time
+import logging
+import spidev as SPI
+sys.path.append("..")
+from lib import LCD_0inch96
+from lib import Gain_Sampler
+from lib import Sparkline
+
+# Raspberry Pi pin configuration:
+RST_0 =24
+DC_0 = 4
+BL_0 = 13
+bus_0 = 0
+device_0 = 0
+
+logging.basicConfig(level=logging.DEBUG)
+
+try:
+    disp = LCD_0inch96.LCD_0inch96(spi=SPI.SpiDev(bus_0, device_0),spi_freq=10000000,rst=RST_0,dc=DC_0,bl=BL_0,bl_freq=1000)
+    disp.Init()
+    disp.clear()
+    disp.bl_DutyCycle(100)
+
+    sampler = Gain_Sampler.default_sampler().start()
+
+    # CPU usage on the top half, temperature (30-80 C) on the bottom half
+    cpu_graph = Sparkline.Sparkline(disp, 0, 0, disp.width, 40, fg=(0, 255, 0), fill=True)
+    temp_graph = Sparkline.Sparkline(disp, 0, 40, disp.width, 40, vmin=30, vmax=80, fg=(255, 128, 0))
+    cpu_graph.redraw()
+    temp_graph.redraw()
+
+    # One new column per second; each push sends only 1x40 columns
+    while True:
+        metrics = sampler.snapshot.values
+        cpu_graph.push(metrics.get('cpu', 0))
+        temp_graph.push(metrics.get('temp', 0))
+        time.sleep(1)
+
+except IOError as e:
+    logging.info(e)
+except KeyboardInterrupt:
+    sampler.stop()
+    disp.module_exit()
+    logging.info("quit:")
+    exit()
@@ -0,0 +1,102 @@
+#!/usr/bin/python
+# -*- coding: UTF-8 -*-
+# key_double.py on asyncio, plus a clock on the 1.3inch panel:
+# one process drives all three panels and both keys without polling loops.
+import sys
+import time
+import asyncio
+import logging
+import spidev as SPI
+sys.path.append("..")
+from lib import LCD_0inch96
+from lib import LCD_1inch3
+from lib import Async_LCD
+from PIL import Image,ImageDraw,ImageFont
+
+# Raspberry Pi pin configuration:
+RST_0 =24
+DC_0 = 4
+BL_0 = 13
+bus_0 = 0
+device_0 = 0
+
+RST_1 =23
+DC_1 = 5
+BL_1 = 12
+bus_1 = 0
+device_1 = 1
+
+RST_2 = 27
+DC_2 = 22
+BL_2 = 19
+bus_2 = 1
+device_2 = 0
+
+# Define the BCM pin number of the button
+KEY1_PIN = 25
+KEY2_PIN = 26
+
+logging.basicConfig(level=logging.DEBUG)
+
+Font2 = ImageFont.truetype("../Font/Font01.ttf",15)
+Font3 = ImageFont.truetype("../Font/Font01.ttf",40)
+
+
+def text_page(width, height, lines):
+    image = Image.new("RGB", (width, height), "WHITE")
+    draw = ImageDraw.Draw(image)
+    for xy, text, colour in lines:
+        draw.text(xy, text, font = Font2, fill = colour)
+    return image
+
+
+async def show_both(panels, image):
+    # Both small panels update concurrently
+    await asyncio.gather(*(p.show(image) for p in panels))
+
+
+async def key_pages(key, panels, image):
+    async for event in key.events():
+        if event.kind == 'press':
+            logging.info("key pressed, %.1f ms ago", (time.monotonic() - event.time) * 1000)
+            await show_both(panels, image)
+
+
+async def clock(panel):
+    image = Image.new("RGB", (panel.width, 60), "WHITE")
+    draw = ImageDraw.Draw(image)
+    draw.text((20, 5), time.strftime("%H:%M:%S"), font = Font3, fill = "BLACK")
+    await panel.show_window(image, 0, 90)
+
+
+async def main():
+    disp_0 = LCD_0inch96.LCD_0inch96(spi=SPI.SpiDev(bus_0, device_0),spi_freq=10000000,rst=RST_0,dc=DC_0,bl=BL_0)
+    disp_1 = LCD_0inch96.LCD_0inch96(spi=SPI.SpiDev(bus_1, device_1),spi_freq=10000000,rst=RST_1,dc=DC_1,bl=BL_1)
+    disp_2 = LCD_1inch3.LCD_1inch3(spi=SPI.SpiDev(bus_2, device_2),spi_freq=10000000,rst=RST_2,dc=DC_2,bl=BL_2)
+    small = [Async_LCD.AsyncDisplay(disp_0), Async_LCD.AsyncDisplay(disp_1)]
+    large = Async_LCD.AsyncDisplay(disp_2)
+    await asyncio.gather(*(p.init() for p in small + [large]))
+
+    key1 = Async_LCD.AsyncButton(disp_0.gpio_mode(KEY1_PIN,disp_0.INPUT,None))
+    key2 = Async_LCD.AsyncButton(disp_0.gpio_mode(KEY2_PIN,disp_0.INPUT,None))
+
+    w, h = disp_0.width, disp_0.height
+    await show_both(small, text_page(w, h, [((10, 10), 'Please press the key', "BLACK"),
+                                            ((18, 40), 'Hello Waveshare!', "BLUE")]))
+    page1 = text_page(w, h, [((18, 30), 'Hello Waveshare', "CYAN")])
+    page2 = Image.open('../pic/LCD_0inch96.jpg')
+
+    try:
+        await asyncio.gather(key_pages(key1, small, page1),
+                             key_pages(key2, small, page2),
+                             Async_LCD.every(1.0, clock, large, align=True))
+    finally:
+        await asyncio.gather(*(p.close() for p in small + [large]))
+
+
+try:
+    asyncio.run(main())
+except IOError as e:
+    logging.info(e)
+except KeyboardInterrupt:
+    logging.info("quit:")
@@ -0,0 +1,44 @@
+#!/usr/bin/python
+# -*- coding: UTF-8 -*-
+# Play an animated GIF/APNG or a directory of images on the 0.96inch panel
+#   python play_gif.py animation.gif [--loop] [--fps 10]
+import sys
+import argparse
+import logging
+import spidev as SPI
+sys.path.append("..")
+from lib import LCD_0inch96
+from lib import Player
+
+# Raspberry Pi pin configuration:
+RST =24
+DC = 4
+BL = 13
+bus = 0
+device = 0
+
+logging.basicConfig(level=logging.DEBUG)
+
+parser = argparse.ArgumentParser(description="Animation player")
+parser.add_argument('source', help="GIF/APNG file or directory of images")
+parser.add_argument('--loop', action='store_true')
+parser.add_argument('--fps', type=float, default=10, help="frame rate for image directories")
+parser.add_argument('--seconds', type=float, help="stop after this many seconds")
+args = parser.parse_args()
+
+try:
+    disp = LCD_0inch96.LCD_0inch96(spi=SPI.SpiDev(bus, device),spi_freq=10000000,rst=RST,dc=DC,bl=BL)
+    disp.Init()
+    disp.bl_DutyCycle(100)
+
+    report = Player.Player(disp, fps=args.fps).play(args.source, loop=args.loop, seconds=args.seconds)
+    logging.info("%d frames in %.1f s: %.1f fps achieved, %.1f fps target, %d dropped",
+                 report['frames'], report['seconds'], report['achieved_fps'],
+                 report['target_fps'], report['dropped'])
+    disp.module_exit()
+except IOError as e:
+    logging.info(e)
+except KeyboardInterrupt:
+    disp.module_exit()
+    logging.info("quit:")
+    exit()
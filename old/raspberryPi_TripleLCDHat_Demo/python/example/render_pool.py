@@ -0,0 +1,52 @@
+#!/usr/bin/python
+# -*- coding: UTF-8 -*-
+# Three panels fed by render processes: the clocks on the small panels keep
+# ticking while the big panel draws a slow picture.
+import sys
+import time
+import logging
+sys.path.append("..")
+from lib import Render_Pool
+from PIL import Image, ImageDraw, ImageFont
+
+logging.basicConfig(level=logging.DEBUG)
+
+PANELS = {
+    'top':    {'bus': 0, 'device': 0, 'rst': 24, 'dc': 4, 'bl': 13},
+    'bottom': {'bus': 0, 'device': 1, 'rst': 23, 'dc': 5, 'bl': 12},
+    'big':    {'driver': 'LCD_1inch3', 'bus': 1, 'device': 0, 'rst': 27, 'dc': 22, 'bl': 19},
+}
+
+
+def render_clock(width, height, fmt, color):
+    image = Image.new("RGB", (width, height), "BLACK")
+    draw = ImageDraw.Draw(image)
+    font = ImageFont.truetype("../Font/Font01.ttf", 30)
+    draw.text((8, 20), time.strftime(fmt), fill=color, font=font)
+    return image
+
+
+def render_rings(width, height, step):
+    # Deliberately slow: one ellipse per pixel of radius
+    image = Image.new("RGB", (width, height), "WHITE")
+    draw = ImageDraw.Draw(image)
+    for r in range(width // 2, 0, -1):
+        shade = (r * 8 + step * 16) % 256
+        draw.ellipse((width // 2 - r, height // 2 - r, width // 2 + r, height // 2 + r),
+                     fill=(shade, 255 - shade, 128))
+    return image
+
+
+pool = Render_Pool.RenderPool(PANELS, processes=3)
+try:
+    step = 0
+    while True:
+        pool.submit('top', render_clock, '%H:%M:%S', "WHITE", block=False)
+        pool.submit('bottom', render_clock, '%d/%m/%Y', "YELLOW", block=False)
+        pool.submit('big', render_rings, step, block=False)
+        step += 1
+        time.sleep(0.1)
+except KeyboardInterrupt:
+    logging.info(pool.close())
+    logging.info("quit:")
+    exit()
@@ -0,0 +1,127 @@
+import time
+import asyncio
+import collections
+import concurrent.futures
+
+# kind is 'press' or 'release'; time is time.monotonic()
+ButtonEvent = collections.namedtuple('ButtonEvent', 'kind time')
+
+
+class AsyncDisplay():
+    """Awaitable wrapper around one panel driver
+
+    SPI transfers run in a single worker thread per panel, so a panel's
+    writes stay in order while the event loop (and the other panels) keep
+    running:
+
+        disp = AsyncDisplay(LCD_0inch96.LCD_0inch96(...))
+        await disp.init()
+        await disp.show(image)
+    """
+    def __init__(self, disp):
+        self.disp = disp
+        self.width, self.height = disp.width, disp.height
+        self.executor = concurrent.futures.ThreadPoolExecutor(1, thread_name_prefix='lcd')
+
+    async def call(self, fn, *args):
+        """Run fn(*args) on this panel's worker thread"""
+        return await asyncio.get_running_loop().run_in_executor(self.executor, fn, *args)
+
+    async def init(self, backlight=100):
+        await self.call(self.disp.Init)
+        await self.call(self.disp.clear)
+        await self.call(self.disp.bl_DutyCycle, backlight)
+
+    async def show(self, image):
+        await self.call(self.disp.ShowImage, image)
+
+    async def show_window(self, image, x, y):
+        await self.call(self.disp.ShowImageWindow, image, x, y)
+
+    async def close(self):
+        await self.call(self.disp.module_exit)
+        self.executor.shutdown()
+
+
+class AsyncButton():
+    """Button events as an async stream
+
+    Hooks the gpiozero when_activated/when_deactivated callbacks (they run
+    on gpiozero's thread) and hands events to the loop thread-safely.
+    Create it from inside the event loop:
+
+        key1 = AsyncButton(disp.gpio_mode(25, disp.INPUT, None))
+        async for event in key1.events():
+            if event.kind == 'press': ...
+    """
+    def __init__(self, device, loop=None):
+        self.device = device
+        self.loop = loop or asyncio.get_running_loop()
+        self.listeners = []
+        device.when_activated = lambda: self._post('press')
+        device.when_deactivated = lambda: self._post('release')
+
+    def _post(self, kind):
+        event = ButtonEvent(kind, time.monotonic())
+        self.loop.call_soon_threadsafe(self._deliver, event)
+
+    def _deliver(self, event):
+        for queue in self.listeners:
+            queue.put_nowait(event)
+
+    async def events(self):
+        """Every press/release from now on; each caller gets its own queue"""
+        queue = asyncio.Queue()
+        self.listeners.append(queue)
+        try:
+            while True:
+                yield await queue.get()
+        finally:
+            self.listeners.remove(queue)
+
+    async def wait_for_press(self):
+        async for event in self.events():
+            if event.kind == 'press':
+                return event
+
+    @property
+    def is_pressed(self):
+        return bool(self.device.value)
+
+
+async def every(interval, fn, *args, align=False):
+    """Call (or await) fn(*args) every `interval` seconds without drift
+
+    Deadlines are absolute on the loop clock; missed periods are skipped
+    rather than run back to back. With align=True the first call waits
+    for the next wall-clock multiple of interval (e.g. whole seconds for
+    a clock).
+    """
+    loop = asyncio.get_running_loop()
+    due = loop.time()
+    if align:
+        due += interval - time.time() % interval
+    while True:
+        await asyncio.sleep(max(0.0, due - loop.time()))
+        result = fn(*args)
+        if asyncio.iscoroutine(result):
+            await result
+        due += interval
+        now = loop.time()
+        if due < now:
+            due = now + interval - (now - due) % interval
+
+
+async def snapshots(sampler):
+    """Each new Gain_Sampler snapshot as it is published"""
+    loop = asyncio.get_running_loop()
+    seq = -1
+    while True:
+        snapshot = sampler.snapshot
+        if snapshot.seq == seq:
+            # Sampler.wait blocks, so it runs on the default executor
+            snapshot = await loop.run_in_executor(None, sampler.wait, seq, 5.0)
+            if snapshot.seq == seq:
+                continue
+        seq = snapshot.seq
+        yield snapshot
@@ -0,0 +1,122 @@
+import threading
+import concurrent.futures
+from PIL import Image, ImageDraw
+
+
+def _intersect(a, b):
+    x0, y0 = max(a[0], b[0]), max(a[1], b[1])
+    x1, y1 = min(a[2], b[2]), min(a[3], b[3])
+    return (x0, y0, x1, y1) if x0 < x1 and y0 < y1 else None
+
+
+def _merge(rects):
+    # Join overlapping rectangles so no pixel is sent twice
+    rects = list(rects)
+    merged = True
+    while merged:
+        merged = False
+        for i in range(len(rects)):
+            for j in range(i + 1, len(rects)):
+                a, b = rects[i], rects[j]
+                if a[0] < b[2] and b[0] < a[2] and a[1] < b[3] and b[1] < a[3]:
+                    rects[i] = (min(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), max(a[3], b[3]))
+                    del rects[j]
+                    merged = True
+                    break
+            if merged:
+                break
+    return rects
+
+
+class VirtualCanvas():
+    """One drawing surface spread over several panels
+
+    Panels are placed at (x, y) in canvas pixels; the canvas is the bounding
+    box of all of them. Draw on `canvas.image` (or `canvas.draw`), mark what
+    changed with invalidate(), then flush(): only the damaged part of each
+    panel is cropped, converted and sent, in that panel's own window.
+    Panels on different buses are sent concurrently.
+
+        canvas = VirtualCanvas()
+        canvas.add('left', disp_0, 0, 0, bus=0)
+        canvas.add('right', disp_1, 0, 80, bus=0)
+        canvas.add('big', disp_2, 160, 0, bus=1)
+        canvas.draw.text((150, 70), 'across panels', fill='BLACK')
+        canvas.invalidate((150, 70, 260, 90))
+        canvas.flush()
+    """
+    def __init__(self, background='WHITE'):
+        self.background = background
+        self.panels = {}     # name -> (disp, rect, bus)
+        self.image = None
+        self.draw = None
+        self.damage = []
+        self.lock = threading.Lock()
+        self.executor = None
+        self.bytes_sent = 0
+
+    def add(self, name, disp, x, y, bus=0):
+        self.panels[name] = (disp, (x, y, x + disp.width, y + disp.height), bus)
+        self._resize()
+
+    @property
+    def size(self):
+        if not self.panels:
+            return (0, 0)
+        return (max(r[2] for _, r, _ in self.panels.values()),
+                max(r[3] for _, r, _ in self.panels.values()))
+
+    def _resize(self):
+        old = self.image
+        self.image = Image.new('RGB', self.size, self.background)
+        if old is not None:
+            self.image.paste(old, (0, 0))
+        self.draw = ImageDraw.Draw(self.image)
+        buses = {bus for _, _, bus in self.panels.values()}
+        if self.executor is not None:
+            self.executor.shutdown()
+        self.executor = concurrent.futures.ThreadPoolExecutor(len(buses), thread_name_prefix='canvas')
+        self.invalidate()
+
+    def invalidate(self, rect=None):
+        """Mark (x0, y0, x1, y1) as changed; None marks the whole canvas"""
+        with self.lock:
+            self.damage.append(rect if rect is not None else (0, 0) + self.size)
+
+    def show(self, image, damage=None):
+        """Replace the canvas with a full-size frame and send the damaged parts"""
+        self.image.paste(image, (0, 0))
+        if damage is None:
+            self.invalidate()
+        else:
+            for rect in damage:
+                self.invalidate(rect)
+        self.flush()
+
+    def flush(self):
+        """Send every damaged region to the panels it covers; returns bytes sent"""
+        with self.lock:
+            damage, self.damage = self.damage, []
+        by_bus = {}
+        for name, (disp, rect, bus) in self.panels.items():
+            clipped = [r for r in (_intersect(d, rect) for d in damage) if r]
+            if clipped:
+                by_bus.setdefault(bus, []).append((disp, rect, _merge(clipped)))
+        jobs = [self.executor.submit(self._send, work) for work in by_bus.values()]
+        sent = sum(job.result() for job in jobs)
+        self.bytes_sent += sent
+        return sent
+
+    def _send(self, work):
+        sent = 0
+        for disp, (px, py, _, _), rects in work:
+            for x0, y0, x1, y1 in rects:
+                buf = disp.image_to_rgb565(self.image.crop((x0, y0, x1, y1)))
+                disp.ShowBuffer(buf, x0 - px, y0 - py, x1 - x0, y1 - y0)
+                sent += len(buf)
+        return sent
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
@@ -0,0 +1,197 @@
+import os
+import json
+import time
+import importlib
+import spidev
+from PIL import Image, ImageDraw, ImageFont
+
+from . import Gain_Sampler
+from . import Sparkline
+
+
+def load_layout(path):
+    """Read a JSON layout; font paths are taken relative to the file"""
+    with open(path) as f:
+        layout = json.load(f)
+    layout['base'] = os.path.dirname(os.path.abspath(path))
+    return layout
+
+
+class Widget():
+    """A rectangle on one panel bound to a metric
+
+    content() returns what the widget would show now; the dashboard calls
+    render() only when that differs from what was last pushed.
+    """
+    def __init__(self, dashboard, disp, spec):
+        self.disp = disp
+        self.spec = spec
+        self.x, self.y = spec.get('x', 0), spec.get('y', 0)
+        self.w = spec.get('w', disp.width - self.x)
+        self.h = spec.get('h', disp.height - self.y)
+        self.metric = spec.get('metric')
+        self.shown = None
+
+    def content(self, snapshot, now):
+        return snapshot.values.get(self.metric)
+
+    def next_change(self, now):
+        # Absolute time the content changes by itself (None: only on new samples)
+        return None
+
+    def render(self, content, snapshot):
+        pass
+
+
+class TextWidget(Widget):
+    """One line of text, e.g. {"metric": "cpu", "format": "CPU Usage: {:.0f}%"}"""
+    def __init__(self, dashboard, disp, spec):
+        Widget.__init__(self, dashboard, disp, spec)
+        self.format = spec.get('format', '{}')
+        self.font = dashboard.font(spec.get('font'), spec.get('size'))
+        self.color = spec.get('color', 'BLACK')
+        self.background = spec.get('background', dashboard.background(disp))
+
+    def content(self, snapshot, now):
+        value = snapshot.values.get(self.metric)
+        return self.format.format(value) if value is not None else ''
+
+    def render(self, content, snapshot):
+        image = Image.new('RGB', (self.w, self.h), self.background)
+        ImageDraw.Draw(image).text((0, 0), content, fill=self.color, font=self.font)
+        self.disp.ShowImageWindow(image, self.x, self.y)
+
+
+class ClockWidget(TextWidget):
+    """Local time through time.strftime, e.g. {"format": "Time: %H:%M:%S"}"""
+    def __init__(self, dashboard, disp, spec):
+        TextWidget.__init__(self, dashboard, disp, spec)
+        seconds = any(code in self.format for code in ('%S', '%T', '%X', '%c', '%s'))
+        self.step = 1 if seconds else 60
+
+    def content(self, snapshot, now):
+        return time.strftime(self.format, time.localtime(now))
+
+    def next_change(self, now):
+        return (int(now) // self.step + 1) * self.step
+
+
+class GraphWidget(Widget):
+    """Sparkline of a metric; one column per new sample"""
+    def __init__(self, dashboard, disp, spec):
+        Widget.__init__(self, dashboard, disp, spec)
+        options = {k: spec[k] for k in ('vmin', 'vmax', 'fill', 'gap') if k in spec}
+        for k in ('fg', 'bg'):
+            if k in spec:
+                options[k] = tuple(spec[k])
+        self.graph = Sparkline.Sparkline(disp, self.x, self.y, self.w, self.h, **options)
+        self.graph.redraw()
+
+    def content(self, snapshot, now):
+        # A new sample is a change even if the value is the same
+        return snapshot.stamps.get(self.metric)
+
+    def render(self, content, snapshot):
+        self.graph.push(snapshot.values[self.metric])
+
+
+WIDGETS = {
+    'text': TextWidget,
+    'clock': ClockWidget,
+    'graph': GraphWidget,
+}
+
+
+class Dashboard():
+    """Panels and widgets from a layout; pushes only widgets that changed
+
+        layout = Dashboard.load_layout('dashboard.json')
+        Dashboard.Dashboard(layout).run()
+
+    Layout keys: "panels" ({name: {driver, bus, device, rst, dc, bl,
+    background, backlight}}), "widgets" ([{panel, type, x, y, w, h, metric,
+    format, font, size, color}]) and a default "font" ({path, size}). Between changes the loop
+    sleeps until the sampler publishes or the next clock tick is due.
+    `displays` may hold already-created driver objects by panel name.
+    """
+    def __init__(self, layout, sampler=None, displays=None):
+        self.layout = layout
+        self.base = layout.get('base', '.')
+        self.sampler = sampler if sampler is not None else Gain_Sampler.default_sampler()
+        self.fonts = {}
+        self.panels = layout['panels']
+        self.displays = dict(displays or {})
+        for name, panel in self.panels.items():
+            if name not in self.displays:
+                self.displays[name] = self._open(panel)
+        self.widgets = []
+        self.pushes = 0
+
+    def _open(self, panel):
+        driver = importlib.import_module('.' + panel.get('driver', 'LCD_0inch96'), __package__)
+        cls = getattr(driver, panel.get('driver', 'LCD_0inch96'))
+        disp = cls(spi=spidev.SpiDev(panel.get('bus', 0), panel.get('device', 0)),
+                   spi_freq=panel.get('spi_freq', 10000000),
+                   rst=panel['rst'], dc=panel['dc'], bl=panel['bl'])
+        disp.Init()
+        return disp
+
+    def background(self, disp):
+        for name, d in self.displays.items():
+            if d is disp:
+                return self.panels[name].get('background', 'WHITE')
+        return 'WHITE'
+
+    def font(self, path=None, size=None):
+        default = self.layout.get('font', {})
+        path = path or default.get('path')
+        size = size or default.get('size', 15)
+        key = (path, size)
+        if key not in self.fonts:
+            if path:
+                self.fonts[key] = ImageFont.truetype(os.path.join(self.base, path), size)
+            else:
+                self.fonts[key] = ImageFont.load_default()
+        return self.fonts[key]
+
+    def start(self):
+        """Paint panel backgrounds, create the widgets and start sampling"""
+        for name, disp in self.displays.items():
+            panel = self.panels[name]
+            disp.ShowImage(Image.new('RGB', (disp.width, disp.height), panel.get('background', 'WHITE')))
+            disp.bl_DutyCycle(panel.get('backlight', 100))
+        self.widgets = [WIDGETS[spec.get('type', 'text')](self, self.displays[spec['panel']], spec)
+                        for spec in self.layout['widgets']]
+        self.sampler.start()
+
+    def update(self, snapshot=None, now=None):
+        """Render the widgets whose content changed; returns how many"""
+        snapshot = snapshot if snapshot is not None else self.sampler.snapshot
+        now = now if now is not None else time.time()
+        changed = 0
+        for widget in self.widgets:
+            content = widget.content(snapshot, now)
+            if content != widget.shown:
+                widget.render(content, snapshot)
+                widget.shown = content
+                changed += 1
+        self.pushes += changed
+        return changed
+
+    def run(self):
+        """Update forever, sleeping until the next sample or clock tick"""
+        if not self.widgets:
+            self.start()
+        while True:
+            snapshot = self.sampler.snapshot
+            seq = snapshot.seq
+            now = time.time()
+            self.update(snapshot, now)
+            due = [t for t in (w.next_change(now) for w in self.widgets) if t is not None]
+            timeout = max(0.0, min(due) - time.time()) if due else None
+            self.sampler.wait(seq, timeout)
+
+    def close(self):
+        self.sampler.stop()
+        for disp in self.displays.values():
+            disp.module_exit()
@@ -0,0 +1,306 @@
+import io
+import os
+import socket
+import struct
+import asyncio
+import logging
+import threading
+import concurrent.futures
+from PIL import Image
+
+from . import lcdconfig
+
+# Every message is a 14 byte HEADER followed by `length` payload bytes:
+#   op (B), panel (B), x, y, w, h (H each), length (I), little-endian,
+#   no padding
+HEADER = struct.Struct('<BBHHHHI')
+OP_REGION = 1    # payload: w*h RGB565 pixels, row by row
+OP_PNG = 2       # payload: PNG (or any PIL-readable) image placed at x, y
+OP_FILL = 3      # payload: 2 bytes RGB565 colour for the w x h rectangle
+OP_INFO = 4      # reply: panel count (B) then width, height (HH) per panel
+OP_SYNC = 5      # reply: one byte once everything sent before is on the panels
+MAX_PAYLOAD = 4 << 20
+
+
+class Update():
+    __slots__ = ('op', 'x', 'y', 'w', 'h', 'payload')
+
+    def __init__(self, op, x, y, w, h, payload):
+        self.op, self.x, self.y, self.w, self.h, self.payload = op, x, y, w, h, payload
+
+    def covers(self, other):
+        return (self.x <= other.x and self.y <= other.y and
+                other.x + other.w <= self.x + self.w and
+                other.y + other.h <= self.y + self.h)
+
+
+class _Panel():
+    def __init__(self, disp, bus):
+        self.disp = disp
+        self.bus = bus
+        self.pending = []
+        self.scheduled = False
+        self.written = 0
+        self.merged = 0
+
+
+class _Client(asyncio.BufferedProtocol):
+    # Reads each payload straight into its own buffer, which then goes to
+    # the panel as-is: no copy between the socket and spidev.
+    def __init__(self, server):
+        self.server = server
+        self.transport = None
+        self.header = bytearray(HEADER.size)
+        self.buf = self.header
+        self.pos = 0
+        self.message = None
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def get_buffer(self, sizehint):
+        return memoryview(self.buf)[self.pos:]
+
+    def buffer_updated(self, nbytes):
+        self.pos += nbytes
+        if self.pos < len(self.buf):
+            return
+        self.pos = 0
+        if self.buf is self.header:
+            self.message = HEADER.unpack(self.header)
+            length = self.message[-1]
+            if length > MAX_PAYLOAD:
+                return self._fail('payload of %d bytes is too large' % length)
+            if length:
+                self.buf = bytearray(length)
+                return
+            payload = b''
+        else:
+            payload = self.buf
+            self.buf = self.header
+        try:
+            self.server.handle(self, *self.message[:-1], payload)
+        except (ValueError, IndexError, OSError) as e:
+            self._fail(e)
+
+    def _fail(self, error):
+        logging.warning('display client dropped: %s', error)
+        self.transport.close()
+
+    def connection_lost(self, exc):
+        self.server.resume(self)
+
+
+class DisplayServer():
+    """Owns the panels and draws what clients send over a socket
+
+    Clients connect on a UNIX socket (and/or a localhost TCP port) and send
+    framed messages (see HEADER and the OP_ codes, or use Client). Updates
+    are queued per panel: a new update that covers an older, still unsent
+    one replaces it, so a client drawing faster than SPI only costs the
+    frames that actually reach the panel. Panels on one bus are written by
+    one thread, different buses in parallel.
+
+        server = DisplayServer()
+        server.add(disp_0, bus=0)
+        server.add(disp_2, bus=1)
+        asyncio.run(server.serve('/tmp/lcd.sock', port=7035))
+    """
+    def __init__(self, max_pending=1 << 20):
+        self.panels = []
+        self.executors = {}
+        self.lock = threading.Lock()
+        self.max_pending = max_pending    # bytes queued before clients are paused
+        self.pending_bytes = 0
+        self.paused = set()
+        self.loop = None
+
+    def add(self, disp, bus=0):
+        """Add a panel; clients address it by the returned index"""
+        self.panels.append(_Panel(disp, bus))
+        if bus not in self.executors:
+            self.executors[bus] = concurrent.futures.ThreadPoolExecutor(1, thread_name_prefix='lcd-bus%d' % bus)
+        return len(self.panels) - 1
+
+    def info(self):
+        return struct.pack('<B', len(self.panels)) + b''.join(
+            struct.pack('<HH', p.disp.width, p.disp.height) for p in self.panels)
+
+    def handle(self, client, op, panel, x, y, w, h, payload):
+        if op == OP_INFO:
+            client.transport.write(self.info())
+            return
+        if op == OP_SYNC:
+            asyncio.ensure_future(self._sync(client))
+            return
+        p = self.panels[panel]
+        if op == OP_PNG:
+            with Image.open(io.BytesIO(payload)) as image:
+                w, h = image.size
+        elif op == OP_REGION:
+            if len(payload) != w * h * 2:
+                raise ValueError('region %dx%d needs %d bytes, got %d' % (w, h, w * h * 2, len(payload)))
+        elif op == OP_FILL:
+            if len(payload) != 2:
+                raise ValueError('fill needs a 2 byte colour')
+        else:
+            raise ValueError('unknown op %d' % op)
+        if w == 0 or h == 0 or x + w > p.disp.width or y + h > p.disp.height:
+            raise ValueError('%dx%d at (%d, %d) is outside the %dx%d panel'
+                             % (w, h, x, y, p.disp.width, p.disp.height))
+        self.submit(panel, Update(op, x, y, w, h, payload))
+        if self.pending_bytes > self.max_pending:
+            client.transport.pause_reading()
+            self.paused.add(client)
+
+    def submit(self, panel, update):
+        """Queue an update for a panel, dropping pending ones it covers"""
+        p = self.panels[panel]
+        with self.lock:
+            keep = []
+            for u in p.pending:
+                if update.covers(u):
+                    p.merged += 1
+                    self.pending_bytes -= len(u.payload)
+                else:
+                    keep.append(u)
+            keep.append(update)
+            self.pending_bytes += len(update.payload)
+            p.pending = keep
+            if p.scheduled:
+                return
+            p.scheduled = True
+        self.executors[p.bus].submit(self._flush, p)
+
+    def _flush(self, p):
+        with self.lock:
+            updates, p.pending = p.pending, []
+            p.scheduled = False
+            self.pending_bytes -= sum(len(u.payload) for u in updates)
+        disp = p.disp
+        for u in updates:
+            try:
+                if u.op == OP_REGION:
+                    disp.ShowBuffer(u.payload, u.x, u.y, u.w, u.h)
+                elif u.op == OP_FILL:
+                    disp.ShowBuffer(bytes(u.payload) * (u.w * u.h), u.x, u.y, u.w, u.h)
+                else:
+                    with Image.open(io.BytesIO(u.payload)) as image:
+                        disp.ShowBuffer(disp.image_to_rgb565(image.convert('RGB')), u.x, u.y, u.w, u.h)
+                p.written += 1
+            except Exception:
+                logging.exception('update on panel %d failed', self.panels.index(p))
+        if self.paused and self.loop is not None:
+            self.loop.call_soon_threadsafe(self._resume_all)
+
+    def _resume_all(self):
+        if self.pending_bytes <= self.max_pending:
+            for client in list(self.paused):
+                self.resume(client)
+
+    def resume(self, client):
+        if client in self.paused:
+            self.paused.discard(client)
+            if not client.transport.is_closing():
+                client.transport.resume_reading()
+
+    async def _sync(self, client):
+        # Each bus thread runs flushes in order, so a no-op queued behind
+        # them completes only after every update received so far is sent.
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(ex, int) for ex in self.executors.values()))
+        if not client.transport.is_closing():
+            client.transport.write(b'\x01')
+
+    async def serve(self, path=None, host='127.0.0.1', port=None):
+        """Serve on a UNIX socket path and/or a TCP port until cancelled"""
+        self.loop = asyncio.get_running_loop()
+        servers = []
+        if path is not None:
+            if os.path.exists(path):
+                os.unlink(path)
+            servers.append(await self.loop.create_unix_server(lambda: _Client(self), path))
+        if port is not None:
+            servers.append(await self.loop.create_server(lambda: _Client(self), host, port))
+        if not servers:
+            raise ValueError('give a socket path and/or a TCP port')
+        try:
+            await asyncio.gather(*(s.serve_forever() for s in servers))
+        finally:
+            for s in servers:
+                s.close()
+            if path is not None and os.path.exists(path):
+                os.unlink(path)
+
+    def close(self):
+        for executor in self.executors.values():
+            executor.shutdown()
+
+
+class Client():
+    """Blocking client for DisplayServer
+
+        lcd = Client('/tmp/lcd.sock')          # or Client(('127.0.0.1', 7035))
+        width, height = lcd.info()[0]
+        lcd.fill(0, 0, 0, width, height, (0, 0, 0))
+        lcd.region(0, 10, 10, 32, 32, rgb565_bytes)
+        lcd.sync()
+    """
+    def __init__(self, address):
+        family = socket.AF_UNIX if isinstance(address, str) else socket.AF_INET
+        self.sock = socket.socket(family, socket.SOCK_STREAM)
+        self.sock.connect(address)
+        if family == socket.AF_INET:
+            self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def _send(self, op, panel=0, x=0, y=0, w=0, h=0, payload=b''):
+        # Header and payload go out in one sendmsg, without joining them
+        header = HEADER.pack(op, panel, x, y, w, h, len(payload))
+        data = [memoryview(header), memoryview(payload).cast('B')]
+        while data:
+            sent = self.sock.sendmsg(data)
+            while data and sent >= len(data[0]):
+                sent -= len(data[0])
+                data.pop(0)
+            if data:
+                data[0] = data[0][sent:]
+
+    def _recv(self, n):
+        buf = bytearray()
+        while len(buf) < n:
+            chunk = self.sock.recv(n - len(buf))
+            if not chunk:
+                raise ConnectionError('display server closed the connection')
+            buf += chunk
+        return bytes(buf)
+
+    def info(self):
+        """[(width, height)] of each panel"""
+        self._send(OP_INFO)
+        count = self._recv(1)[0]
+        return [struct.unpack('<HH', self._recv(4)) for _ in range(count)]
+
+    def region(self, panel, x, y, w, h, buf):
+        """RGB565 bytes (e.g. from image_to_rgb565) for a w x h window"""
+        self._send(OP_REGION, panel, x, y, w, h, buf)
+
+    def png(self, panel, data, x=0, y=0):
+        self._send(OP_PNG, panel, x, y, 0, 0, data)
+
+    def image(self, panel, image, x=0, y=0):
+        """PIL image, sent PNG-encoded (the server converts it)"""
+        out = io.BytesIO()
+        image.save(out, 'PNG')
+        self.png(panel, out.getbuffer(), x, y)
+
+    def fill(self, panel, x, y, w, h, color):
+        """Fill a rectangle with an (r, g, b) colour"""
+        self._send(OP_FILL, panel, x, y, w, h, lcdconfig.color_to_rgb565(color))
+
+    def sync(self):
+        """Wait until everything sent so far has been written to the panels"""
+        self._send(OP_SYNC)
+        self._recv(1)
+
+    def close(self):
+        self.sock.close()
@@ -0,0 +1,290 @@
+import numpy as np
+from PIL import Image
+
+SWRESET = 0x01
+SLPIN = 0x10
+SLPOUT = 0x11
+NORON = 0x13
+INVOFF = 0x20
+INVON = 0x21
+DISPOFF = 0x28
+DISPON = 0x29
+CASET = 0x2A
+RASET = 0x2B
+RAMWR = 0x2C
+VSCRDEF = 0x33
+MADCTL = 0x36
+VSCSAD = 0x37
+COLMOD = 0x3A
+
+PARAMS = {CASET: 4, RASET: 4, MADCTL: 1, COLMOD: 1, VSCRDEF: 6, VSCSAD: 2}
+
+MADCTL_MY = 0x80
+MADCTL_MX = 0x40
+MADCTL_MV = 0x20
+
+# Controller GRAM size (columns, rows) and where the glass sits in it
+# (column, row, width, height), both in memory order. Both HAT panels are
+# IPS glass, which shows colours correctly only with INVON.
+PANELS = {
+    'LCD_0inch96': {'gram': (132, 162), 'glass': (26, 1, 80, 160), 'ips': True},    # ST7735S
+    'LCD_1inch3': {'gram': (240, 320), 'glass': (0, 0, 240, 240), 'ips': True},     # ST7789
+}
+
+
+class Controller():
+    """ST7735S/ST7789 model fed with the bytes a driver puts on the bus
+
+    write(data, dc) takes one SPI transfer and the level of the DC pin:
+    DC low bytes are commands, DC high bytes their parameters or, after
+    RAMWR, pixels. Pixels land in a GRAM array through the CASET/RASET
+    window and MADCTL (MY, MX, MV; the RGB/BGR bit is taken as matching the
+    glass); pixels a window puts outside GRAM are dropped. Vertical
+    scrolling (VSCRDEF/VSCSAD, left with NORON), sleep, display on/off and
+    inversion affect what snapshot() shows, as on the panel. Other commands
+    are kept in `registers` but do nothing.
+
+    Writes are numpy slice assignments, a row band at a time, so whole
+    frames cost tens of microseconds.
+    """
+    def __init__(self, gram=(132, 162), glass=None, ips=True):
+        self.gram_size = tuple(gram)
+        self.glass = tuple(glass) if glass else (0, 0) + self.gram_size
+        self.ips = ips
+        self.gram = np.zeros((gram[1], gram[0], 2), dtype=np.uint8)
+        self.commands = self.data_bytes = self.transfers = self.frames = self.pixels = 0
+        self.reset()
+
+    def reset(self):
+        """Power-on / SWRESET state (GRAM is left as it was)"""
+        self.sleeping = True
+        self.display_on = False
+        self.inverted = False
+        self.madctl = 0
+        self.colmod = 0x06
+        self.window = (0, 0, self.gram_size[0] - 1, self.gram_size[1] - 1)
+        self.scroll = None          # (top fixed, scroll area, bottom fixed)
+        self.scroll_start = None    # VSCSAD line while in scroll mode
+        self.registers = {}
+        self.cmd = None
+        self.params = bytearray()
+        self.pos = 0
+        self.odd = None             # first byte of a pixel split across transfers
+        self.scratch = None         # RAMWR window when it runs past GRAM
+
+    def write(self, data, dc):
+        """One SPI transfer (bytes-like or list of ints) at DC level `dc`"""
+        self.transfers += 1
+        if not dc:
+            for cmd in bytes(data):
+                self.command(cmd)
+            return
+        if self.cmd == RAMWR:
+            self._pixels(data)
+            return
+        data = bytes(data)
+        self.data_bytes += len(data)
+        self.params += data
+        need = PARAMS.get(self.cmd)
+        if need is not None and len(self.params) >= need:
+            self._apply(self.cmd, bytes(self.params[:need]))
+        elif need is None and self.cmd is not None:
+            self.registers[self.cmd] = bytes(self.params)
+
+    def command(self, cmd):
+        self.commands += 1
+        self.cmd = cmd
+        self.params = bytearray()
+        if cmd == SWRESET:
+            self.reset()
+        elif cmd == SLPIN:
+            self.sleeping = True
+        elif cmd == SLPOUT:
+            self.sleeping = False
+        elif cmd == NORON:
+            self.scroll_start = None
+        elif cmd in (INVOFF, INVON):
+            self.inverted = cmd == INVON
+        elif cmd in (DISPOFF, DISPON):
+            self.display_on = cmd == DISPON
+        elif cmd == RAMWR:
+            if self.colmod & 0x07 != 0x05:
+                raise NotImplementedError('only 16 bit colour (COLMOD 0x05) is emulated, not 0x%02x' % self.colmod)
+            xs, ys, xe, ye = self.window
+            if xs > xe or ys > ye:
+                raise ValueError('window (%d, %d)-(%d, %d) is empty' % (xs, ys, xe, ye))
+            w, h = self._logical_size()
+            # Like the controller, drop pixels that fall outside GRAM: they
+            # go to a window-sized scratch array and only the overlap is kept
+            self.scratch = None
+            if xe >= w or ye >= h:
+                self.scratch = np.zeros((ye - ys + 1, xe - xs + 1, 2), dtype=np.uint8)
+                inside = self._orient(self.gram)[ys:ye + 1, xs:xe + 1]
+                self.scratch[:inside.shape[0], :inside.shape[1]] = inside
+            self.pos = 0
+            self.odd = None
+            self.frames += 1
+
+    def _apply(self, cmd, p):
+        self.registers[cmd] = p
+        if cmd == CASET:
+            xs, xe = p[0] << 8 | p[1], p[2] << 8 | p[3]
+            self.window = (xs, self.window[1], xe, self.window[3])
+        elif cmd == RASET:
+            ys, ye = p[0] << 8 | p[1], p[2] << 8 | p[3]
+            self.window = (self.window[0], ys, self.window[2], ye)
+        elif cmd == MADCTL:
+            self.madctl = p[0]
+        elif cmd == COLMOD:
+            self.colmod = p[0]
+        elif cmd == VSCRDEF:
+            self.scroll = (p[0] << 8 | p[1], p[2] << 8 | p[3], p[4] << 8 | p[5])
+        elif cmd == VSCSAD:
+            self.scroll_start = p[0] << 8 | p[1]
+
+    def _logical_size(self):
+        w, h = self.gram_size
+        return (h, w) if self.madctl & MADCTL_MV else (w, h)
+
+    def _orient(self, a):
+        # Memory-order array -> the same pixels in CASET/RASET order (a view)
+        if self.madctl & MADCTL_MX:
+            a = a[:, ::-1]
+        if self.madctl & MADCTL_MY:
+            a = a[::-1]
+        if self.madctl & MADCTL_MV:
+            a = a.transpose(1, 0, 2)
+        return a
+
+    def _pixels(self, data):
+        if isinstance(data, list):
+            data = bytes(data)      # writebytes() takes lists of ints
+        px = np.frombuffer(data, dtype=np.uint8)
+        self.data_bytes += len(px)
+        if self.odd is not None:
+            px = np.concatenate(([self.odd], px))
+            self.odd = None
+        if len(px) & 1:
+            self.odd = px[-1]
+            px = px[:-1]
+        px = px.reshape(-1, 2)
+        self.pixels += len(px)
+        xs, ys, xe, ye = self.window
+        ww, wh = xe - xs + 1, ye - ys + 1
+        gram = self._orient(self.gram)[ys:ye + 1, xs:xe + 1]
+        view = gram if self.scratch is None else self.scratch
+        i = 0
+        while i < len(px):
+            row, col = divmod(self.pos, ww)
+            if col == 0 and len(px) - i >= ww:
+                rows = min((len(px) - i) // ww, wh - row)
+                view[row:row + rows] = px[i:i + rows * ww].reshape(rows, ww, 2)
+                n = rows * ww
+            else:
+                n = min(len(px) - i, ww - col)
+                view[row, col:col + n] = px[i:i + n]
+            i += n
+            self.pos = (self.pos + n) % (ww * wh)    # wraps to the window start
+        if self.scratch is not None:
+            gram[...] = self.scratch[:gram.shape[0], :gram.shape[1]]
+
+    def visible(self):
+        """What the glass shows, as a (height, width, 2) RGB565 array"""
+        h = self.gram.shape[0]
+        rows = np.arange(h)
+        if self.scroll is not None and self.scroll_start is not None:
+            top, area, _ = self.scroll
+            scrolled = rows[top:top + area]
+            rows[top:top + area] = top + (scrolled - top + self.scroll_start - top) % area
+        x, y, w, gh = self.glass
+        # The glass position is in memory order: scroll and crop there,
+        # then turn the result into the driver's orientation.
+        shown = self.gram[rows][y:y + gh, x:x + w]
+        if not self.display_on or self.sleeping:
+            return np.zeros_like(self._orient(shown))
+        if self.inverted != self.ips:
+            shown = ~shown
+        return np.ascontiguousarray(self._orient(shown))
+
+    def snapshot(self):
+        """PIL RGB image of the glass"""
+        pix = self.visible().astype(np.uint16)
+        rgb = np.empty(pix.shape[:2] + (3,), dtype=np.uint8)
+        rgb[..., 0] = pix[..., 0] & 0xF8
+        rgb[..., 1] = ((pix[..., 0] & 0x07) << 5) | ((pix[..., 1] & 0xE0) >> 3)
+        rgb[..., 2] = (pix[..., 1] & 0x1F) << 3
+        return Image.fromarray(rgb, 'RGB')
+
+    def save(self, path):
+        self.snapshot().save(path)
+
+
+class EmulatedPin():
+    """Stands in for the gpiozero output/PWM devices the drivers use"""
+    def __init__(self, pin):
+        self.pin = pin
+        self.value = 0
+        self.frequency = None
+
+    def on(self):
+        self.value = 1
+
+    def off(self):
+        self.value = 0
+
+    def close(self):
+        pass
+
+
+class EmulatedSpi():
+    """spidev.SpiDev lookalike that feeds a Controller, reading DC from `dc`"""
+    def __init__(self, controller):
+        self.controller = controller
+        self.dc = None
+        self.max_speed_hz = 0
+        self.mode = 0
+        self.bytes = 0
+
+    def writebytes(self, data):
+        self.bytes += len(data)
+        self.controller.write(data, self.dc.value)
+
+    writebytes2 = writebytes
+
+    def xfer2(self, data, *args):
+        self.writebytes(data)
+        return [0] * len(data)
+
+    xfer3 = xfer2
+
+    def close(self):
+        pass
+
+
+class Emulated():
+    # Mixin for a driver class: GPIO becomes EmulatedPin, SPI an EmulatedSpi
+    def gpio_mode(self, Pin, Mode, pull_up=None, active_state=True):
+        return EmulatedPin(Pin)
+
+    def gpio_pwm(self, Pin):
+        return EmulatedPin(Pin)
+
+
+def emulate(cls, **panel):
+    """Instance of driver class `cls` drawing into an emulated panel
+
+    The real driver code runs unchanged; its controller is `disp.emulator`.
+    `panel` overrides the PANELS entry for the class (gram, glass, ips).
+
+        disp = emulate(LCD_0inch96.LCD_0inch96)
+        disp.Init()
+        disp.ShowImage(image)
+        disp.emulator.save('frame.png')
+    """
+    settings = dict(PANELS.get(cls.__name__, {}), **panel)
+    controller = Controller(**settings)
+    spi = EmulatedSpi(controller)
+    disp = type('Emulated' + cls.__name__, (Emulated, cls), {})(spi=spi)
+    spi.dc = disp.DC_PIN
+    disp.emulator = controller
+    return disp
@@ -0,0 +1,74 @@
+import multiprocessing
+from multiprocessing import shared_memory
+
+from . import lcdconfig
+
+
+def to_rgb565(Image, size=None):
+    """PIL image (optionally resized to size) -> RGB565 bytes, like ShowImage"""
+    if size is not None and Image.size != tuple(size):
+        Image = Image.resize(size)
+    return lcdconfig.image_to_rgb565(Image)
+
+
+class FrameRing():
+    """Fixed set of RGB565 frame slots in shared memory, passed between processes
+
+    A slot always has exactly one owner. The producer takes a free slot
+    with acquire() (blocking when every slot is in use: that is the
+    backpressure), fills view(slot) and hands it over with publish(slot,
+    meta). The consumer receives it with get(), sends view(slot) to the
+    panel and gives it back with release(slot).
+
+    The creating process owns the memory and must call close(unlink=True);
+    other processes get the ring as a Process argument and attach by name.
+    Several rings may share one `ready` queue so a single consumer can
+    serve them all (put something in meta to tell them apart).
+    """
+    def __init__(self, slots, frame_bytes, ctx=None, ready=None):
+        ctx = ctx or multiprocessing.get_context()
+        self.slots = slots
+        self.frame_bytes = frame_bytes
+        self.shm = shared_memory.SharedMemory(create=True, size=slots * frame_bytes)
+        self.free = ctx.Queue()
+        self.ready = ready if ready is not None else ctx.Queue()
+        for slot in range(slots):
+            self.free.put(slot)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['shm'] = self.shm.name
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.shm = shared_memory.SharedMemory(name=state['shm'])
+
+    def view(self, slot):
+        # memoryview into the slot; release() it before close()
+        start = slot * self.frame_bytes
+        return self.shm.buf[start:start + self.frame_bytes]
+
+    def acquire(self, timeout=None):
+        """Free slot for the producer; raises queue.Empty on timeout"""
+        return self.free.get(timeout=timeout)
+
+    def publish(self, slot, meta=None):
+        self.ready.put((slot, meta))
+
+    def finish(self, meta=None):
+        # Producer is done: the consumer's get() returns (None, meta)
+        self.ready.put((None, meta))
+
+    def get(self, timeout=None):
+        """Next (slot, meta) for the consumer; (None, meta) after finish()"""
+        return self.ready.get(timeout=timeout)
+
+    def release(self, slot):
+        self.free.put(slot)
+
+    def close(self, unlink=False):
+        self.shm.close()
+        if unlink:
+            self.shm.unlink()
+
@@ -1,27 +1,519 @@
 import os
 import re 
 import time
+import select
 import socket
+import struct
+import collections
+
+
+class ProcFile():
+    """A /proc file kept open and re-read with preadv into one buffer
+
+    read() returns the number of valid bytes in self.buf; the buffer grows
+    only if the file outgrows it.
+    """
+    def __init__(self, path, size=4096):
+        self.fd = os.open(path, os.O_RDONLY)
+        self.buf = bytearray(size)
+
+    def read(self):
+        n = os.preadv(self.fd, [self.buf], 0)
+        while n == len(self.buf):
+            self.buf.extend(bytes(len(self.buf)))
+            n = os.preadv(self.fd, [self.buf], 0)
+        return n
+
+    def close(self):
+        os.close(self.fd)
+
+
+class CPUSampler():
+    """CPU utilization from /proc/stat deltas
+
+    The file stays open and is re-read with preadv into the same buffer.
+    sample() returns total usage in percent; per-core values are left in
+    self.cores (index 0 is cpu0). The first sample is the average since boot.
+    """
+    def __init__(self, path='/proc/stat'):
+        self.file = ProcFile(path)
+        self.total = 0.0
+        self.cores = []
+        self._busy = []   # previous busy/total jiffies, [0] = aggregate line
+        self._all = []
+        self._f = [0] * 8
+
+    def _fields(self, buf, start, end):
+        # user nice system idle iowait irq softirq steal (guest is in user),
+        # converted straight from the read buffer into self._f. Fields are
+        # separated by one space; the aggregate "cpu" label has two.
+        f = self._f
+        pos = buf.find(b' ', start, end) + 1
+        if buf[pos] == 0x20:
+            pos += 1
+        for k in range(8):
+            stop = buf.find(b' ', pos, end)
+            if stop < 0:
+                stop = end
+            f[k] = int(buf[pos:stop])
+            pos = stop + 1
+        return f
+
+    def sample(self):
+        n = self.file.read()
+        buf = self.file.buf
+        i = 0
+        start = 0
+        # Only the leading cpu lines are parsed, not the long intr/softirq lines
+        while start < n and buf.startswith(b'cpu', start):
+            end = buf.find(b'\n', start, n)
+            if end < 0:
+                end = n
+            f = self._fields(buf, start, end)
+            start = end + 1
+            idle = f[3] + f[4]
+            total = f[0] + f[1] + f[2] + idle + f[5] + f[6] + f[7]
+            busy = total - idle
+            if i == len(self._busy):
+                self._busy.append(0)
+                self._all.append(0)
+                if i:
+                    self.cores.append(0.0)
+            d_total = total - self._all[i]
+            usage = 100.0 * (busy - self._busy[i]) / d_total if d_total else 0.0
+            self._busy[i] = busy
+            self._all[i] = total
+            if i:
+                self.cores[i - 1] = usage
+            else:
+                self.total = usage
+            i += 1
+        return self.total
+
+    def close(self):
+        self.file.close()
+
+
+DiskInfo = collections.namedtuple('DiskInfo', 'mountpoint device fstype total used free percent')
+
+
+class DiskSampler():
+    """Usage of every block-device mount, cached for `interval` seconds
+
+    Mounts come from /proc/self/mountinfo, which is kept open and re-read
+    only when poll() reports the mount table changed. Sizes come from
+    os.statvfs; percent is computed the way df does (used / (used + avail)).
+    """
+    def __init__(self, interval=5.0, path='/proc/self/mountinfo'):
+        self.interval = interval
+        self.path = path
+        self.file = open(path, 'rb')
+        self.poller = select.poll()
+        self.poller.register(self.file, select.POLLPRI | select.POLLERR)
+        self.mounts = self._read_mounts()
+        self.disks = []
+        self.stamp = None
+
+    @staticmethod
+    def _unescape(field):
+        # mountinfo escapes space, tab, newline and backslash as \ooo
+        return re.sub(r'\\([0-7]{3})', lambda m: chr(int(m.group(1), 8)), field.decode())
+
+    def _read_mounts(self):
+        self.file.seek(0)
+        mounts = []
+        seen = set()
+        for line in self.file.read().splitlines():
+            fields = line.split()
+            sep = fields.index(b'-')
+            device, mountpoint = fields[2], self._unescape(fields[4])
+            fstype, source = fields[sep + 1].decode(), self._unescape(fields[sep + 2])
+            if not (source.startswith('/dev/') or mountpoint == '/') or device in seen:
+                continue    # pseudo filesystems and bind mounts of the same device
+            seen.add(device)
+            mounts.append((mountpoint, source, fstype))
+        return mounts
+
+    def refresh(self):
+        if self.poller.poll(0):
+            self.mounts = self._read_mounts()
+        disks = []
+        for mountpoint, source, fstype in self.mounts:
+            try:
+                st = os.statvfs(mountpoint)
+            except OSError:
+                continue
+            total = st.f_blocks * st.f_frsize
+            used = (st.f_blocks - st.f_bfree) * st.f_frsize
+            free = st.f_bavail * st.f_frsize
+            percent = -(-100 * used // (used + free)) if used + free else 0
+            disks.append(DiskInfo(mountpoint, source, fstype, total, used, free, percent))
+        self.disks = disks
+        self.stamp = time.monotonic()
+        return disks
+
+    def sample(self):
+        if self.stamp is None or time.monotonic() - self.stamp >= self.interval:
+            return self.refresh()
+        return self.disks
+
+    def usage(self, mountpoint='/'):
+        for disk in self.sample():
+            if disk.mountpoint == mountpoint:
+                return disk
+        return None
+
+    def close(self):
+        self.file.close()
+
+
+Address = collections.namedtuple('Address', 'interface family address prefixlen')
+
+# rtnetlink constants (linux/netlink.h, linux/rtnetlink.h, linux/if_addr.h)
+NLMSG_ERROR = 2
+NLMSG_DONE = 3
+RTM_NEWADDR = 20
+RTM_DELADDR = 21
+RTM_GETADDR = 22
+NLM_F_REQUEST = 0x1
+NLM_F_DUMP = 0x300
+RTMGRP_IPV4_IFADDR = 0x10
+RTMGRP_IPV6_IFADDR = 0x100
+IFA_ADDRESS = 1
+IFA_LOCAL = 2
+IFA_LABEL = 3
+NLMSG_HDR = struct.Struct('=LHHLL')
+IFADDRMSG = struct.Struct('=BBBBI')
+RTATTR = struct.Struct('=HH')
+
+
+class AddressSampler():
+    """Interface addresses from an rtnetlink dump, cached
+
+    The list is fetched once and kept until the kernel announces an address
+    change (RTM_NEWADDR/RTM_DELADDR on a subscribed netlink socket) or `ttl`
+    seconds pass. Nothing is sent on the network, so it works offline.
+    """
+    def __init__(self, ttl=60.0):
+        self.ttl = ttl
+        self.events = socket.socket(socket.AF_NETLINK, socket.SOCK_RAW, socket.NETLINK_ROUTE)
+        self.events.bind((0, RTMGRP_IPV4_IFADDR | RTMGRP_IPV6_IFADDR))
+        self.events.setblocking(False)
+        self.addresses = []
+        self.stamp = None
+
+    def _changed(self):
+        changed = False
+        while True:
+            try:
+                data = self.events.recv(65536)
+            except BlockingIOError:
+                return changed
+            except OSError:
+                return True     # ENOBUFS: events were lost, refetch
+            if not data:
+                return changed
+            changed = True
+
+    def _dump(self):
+        sock = socket.socket(socket.AF_NETLINK, socket.SOCK_RAW, socket.NETLINK_ROUTE)
+        try:
+            sock.bind((0, 0))
+            body = IFADDRMSG.pack(socket.AF_UNSPEC, 0, 0, 0, 0)
+            sock.send(NLMSG_HDR.pack(NLMSG_HDR.size + len(body), RTM_GETADDR,
+                                     NLM_F_REQUEST | NLM_F_DUMP, 1, 0) + body)
+            addresses = []
+            while True:
+                data = sock.recv(65536)
+                offset = 0
+                while offset < len(data):
+                    length, kind, _, _, _ = NLMSG_HDR.unpack_from(data, offset)
+                    if kind == NLMSG_DONE:
+                        return addresses
+                    if kind == NLMSG_ERROR:
+                        raise OSError('RTM_GETADDR dump failed')
+                    if kind == RTM_NEWADDR:
+                        addresses.append(self._parse(data, offset + NLMSG_HDR.size, offset + length))
+                    offset += (length + 3) & ~3
+        finally:
+            sock.close()
+
+    @staticmethod
+    def _parse(data, start, end):
+        family, prefixlen, _, scope, index = IFADDRMSG.unpack_from(data, start)
+        attrs = {}
+        offset = start + IFADDRMSG.size
+        while offset + RTATTR.size <= end:
+            length, kind = RTATTR.unpack_from(data, offset)
+            attrs[kind] = data[offset + RTATTR.size:offset + length]
+            offset += (length + 3) & ~3
+        # IFA_LOCAL is the local end on point-to-point links, IFA_ADDRESS the peer
+        raw = attrs.get(IFA_LOCAL, attrs.get(IFA_ADDRESS))
+        if IFA_LABEL in attrs:
+            name = attrs[IFA_LABEL].rstrip(b'\0').decode()
+        else:
+            try:
+                name = socket.if_indextoname(index)
+            except OSError:
+                name = str(index)
+        return Address(name, family, socket.inet_ntop(family, raw), prefixlen)
+
+    def sample(self):
+        changed = self._changed()
+        if changed or self.stamp is None or time.monotonic() - self.stamp >= self.ttl:
+            self.addresses = self._dump()
+            self.stamp = time.monotonic()
+        return self.addresses
+
+    def primary(self):
+        # First IPv4 address off loopback, then IPv6, then loopback itself
+        addresses = self.sample()
+        for family in (socket.AF_INET, socket.AF_INET6):
+            for addr in addresses:
+                if addr.family == family and addr.interface != 'lo' and not addr.address.startswith(('127.', 'fe80:')):
+                    return addr.address
+        return '127.0.0.1'
+
+    def close(self):
+        self.events.close()
+
+
+class ThermalSampler():
+    """All thermal zones, read through fds that stay open
+
+    Zones and their types are discovered once. sample() preads every zone
+    in one pass and returns {type: degrees C}; the last `window` samples of
+    each zone are kept for stats(). Zones with the same type get a _N suffix.
+    """
+    def __init__(self, root='/sys/class/thermal', window=60):
+        self.names = []
+        self.fds = []
+        zones = [d for d in os.listdir(root) if d.startswith('thermal_zone')] if os.path.isdir(root) else []
+        for zone in sorted(zones, key=lambda d: int(d[12:])):
+            path = os.path.join(root, zone)
+            try:
+                with open(os.path.join(path, 'type')) as f:
+                    name = f.read().strip()
+                fd = os.open(os.path.join(path, 'temp'), os.O_RDONLY)
+            except OSError:
+                continue
+            if name in self.names:
+                name = '%s_%d' % (name, len(self.names))
+            self.names.append(name)
+            self.fds.append(fd)
+        self.temps = [0.0] * len(self.fds)
+        self.windows = [collections.deque(maxlen=window) for _ in self.fds]
+        self.sums = [0.0] * len(self.fds)
+
+    def sample(self):
+        temps, windows, sums = self.temps, self.windows, self.sums
+        for i, fd in enumerate(self.fds):
+            try:
+                temp = int(os.pread(fd, 16, 0)) / 1000.0
+            except (OSError, ValueError):
+                continue    # some zones return EAGAIN/EINVAL while the sensor is off
+            window = windows[i]
+            if len(window) == window.maxlen:
+                sums[i] -= window[0]
+            window.append(temp)
+            sums[i] += temp
+            temps[i] = temp
+        return dict(zip(self.names, temps))
+
+    def stats(self, name):
+        # (min, max, avg) over the rolling window of one zone
+        i = self.names.index(name)
+        window = self.windows[i]
+        if not window:
+            return (0.0, 0.0, 0.0)
+        return (min(window), max(window), self.sums[i] / len(window))
+
+    def close(self):
+        for fd in self.fds:
+            os.close(fd)
+        self.fds = []
+
+
+MemInfo = collections.namedtuple('MemInfo', 'total available used percent')
+
+
+class MemorySampler():
+    """Memory use from /proc/meminfo (MemTotal and MemAvailable only)
+
+    The field offsets are found by a search in the reused read buffer; only
+    the two numbers are converted. Sizes are in bytes.
+    """
+    def __init__(self, path='/proc/meminfo'):
+        self.file = ProcFile(path)
+
+    def _field(self, name, n):
+        buf = self.file.buf
+        start = buf.find(name, 0, n)
+        if start < 0:
+            return 0
+        start += len(name)
+        return int(buf[start:buf.find(b' kB', start, n)]) * 1024
+
+    def sample(self):
+        n = self.file.read()
+        total = self._field(b'MemTotal:', n)
+        available = self._field(b'MemAvailable:', n)
+        used = total - available
+        return MemInfo(total, available, used, 100.0 * used / total if total else 0.0)
+
+    def close(self):
+        self.file.close()
+
+
+class NetSampler():
+    """Per-interface receive/transmit rates from /proc/net/dev
+
+    Counters are timestamped with time.monotonic() and rates are bytes per
+    second between consecutive sample() calls (0 on the first call).
+    sample() updates and returns self.rates: {interface: [rx, tx]}.
+    Interfaces that disappear are dropped; a counter that goes backwards
+    (reset, or an interface re-created under the same name) reads as 0.
+    """
+    def __init__(self, path='/proc/net/dev'):
+        self.file = ProcFile(path)
+        self.counters = {}   # interface -> [rx bytes, tx bytes, generation]
+        self.rates = {}
+        self.stamp = None
+        self._names = {}     # interface name as bytes -> str
+        self._generation = 0
+
+    def _counter(self, buf, pos, end, skip):
+        # Field number `skip` (0-based) after pos, read in place
+        while True:
+            while buf[pos] == 0x20:
+                pos += 1
+            stop = buf.find(b' ', pos, end)
+            if stop < 0:
+                stop = end
+            if not skip:
+                return int(buf[pos:stop]), stop
+            skip -= 1
+            pos = stop
+
+    def sample(self):
+        n = self.file.read()
+        now = time.monotonic()
+        dt = now - self.stamp if self.stamp is not None else 0.0
+        self.stamp = now
+        self._generation += 1
+        generation = self._generation
+        buf = self.file.buf
+        seen = 0
+        # Skip the two header lines
+        start = buf.find(b'\n', buf.find(b'\n', 0, n) + 1, n) + 1
+        while start < n:
+            end = buf.find(b'\n', start, n)
+            if end < 0:
+                end = n
+            colon = buf.find(b':', start, end)
+            while buf[start] == 0x20:
+                start += 1
+            key = bytes(buf[start:colon])
+            name = self._names.get(key)
+            if name is None:
+                name = self._names[key] = key.decode()
+            # receive bytes is the first field, transmit bytes the ninth
+            rx, pos = self._counter(buf, colon + 1, end, 0)
+            tx, _ = self._counter(buf, pos, end, 7)
+            seen += 1
+            prev = self.counters.get(name)
+            if prev is None:
+                self.counters[name] = [rx, tx, generation]
+                self.rates[name] = [0.0, 0.0]
+            else:
+                rate = self.rates[name]
+                if dt > 0:
+                    rate[0] = max(rx - prev[0], 0) / dt
+                    rate[1] = max(tx - prev[1], 0) / dt
+                prev[0], prev[1], prev[2] = rx, tx, generation
+            start = end + 1
+        if seen != len(self.counters):
+            for name in [k for k, c in self.counters.items() if c[2] != generation]:
+                del self.counters[name]
+                del self.rates[name]
+        return self.rates
+
+    def close(self):
+        self.file.close()
 
 
 class Gain_Param():
     Get_back = [0,0,0,0,0] # Returns the memory of Disk     
     flag = 0 # Unmounted or unpartitioned   
+    cpu = None # CPUSampler, opened on first use
+    disk = None # DiskSampler, opened on first use
+    disk_interval = 5.0 # Seconds between statvfs refreshes
+    ip = None # AddressSampler, opened on first use
+    thermal = None # ThermalSampler, opened on first use
+    memory = None # MemorySampler, opened on first use
+    net = None # NetSampler, opened on first use
+
+    def GET_CPU(self):
+        # Total CPU usage (%) since the previous call
+        if self.cpu is None:
+            self.cpu = CPUSampler()
+        return self.cpu.sample()
+
+    def GET_CPU_Cores(self):
+        # Per-core usage (%) from the last GET_CPU() call
+        if self.cpu is None:
+            self.GET_CPU()
+        return self.cpu.cores
+
+    def GET_Disks(self):
+        # DiskInfo for every mounted block device (cached)
+        if self.disk is None:
+            self.disk = DiskSampler(self.disk_interval)
+        return self.disk.sample()
+
+    def GET_Disk(self, mountpoint='/'):
+        # Disk usage (%) of one mount point, 0 if it is not mounted
+        self.GET_Disks()
+        disk = self.disk.usage(mountpoint)
+        return disk.percent if disk else 0
+
     def GET_IP(self):
-        #There will be exceptions, get stuck, get it carefully
-        #Threading is better
-        s=socket.socket(socket.AF_INET,socket.SOCK_DGRAM)
-        s.connect_ex(('8.8.8.8',80))
-        ip=s.getsockname()[0]
-        s.close()
-        return ip
+        # Cached; refreshed on netlink address events (see AddressSampler)
+        if self.ip is None:
+            self.ip = AddressSampler()
+        return self.ip.primary()
+
+
+    def GET_Temps(self):
+        # {zone type: degrees C} for every thermal zone
+        if self.thermal is None:
+            self.thermal = ThermalSampler()
+        return self.thermal.sample()
 
+    def GET_Temp(self, zone=None):
+        # One zone in degrees C, the first zone (thermal_zone0) by default
+        temps = self.GET_Temps()
+        if not temps:
+            raise FileNotFoundError('no thermal zones under /sys/class/thermal')
+        if zone is None:
+            return self.thermal.temps[0]
+        return temps[zone]
 
-    def GET_Temp(self):
-        with open('/sys/class/thermal/thermal_zone0/temp', 'rt') as f:
-            temp = (int)(f.read() ) / 1000.0
-        return temp
+    def GET_MemInfo(self):
+        # MemInfo(total, available, used, percent), sizes in bytes
+        if self.memory is None:
+            self.memory = MemorySampler()
+        return self.memory.sample()
 
-    
+    def GET_Mem(self):
+        # Memory usage (%)
+        return self.GET_MemInfo().percent
 
-                  
+    def GET_Net(self, interface=None):
+        # {interface: [rx, tx]} in bytes/s since the previous call, or one [rx, tx]
+        if self.net is None:
+            self.net = NetSampler()
+        rates = self.net.sample()
+        if interface is None:
+            return rates
+        return rates.get(interface, [0.0, 0.0])
@@ -0,0 +1,162 @@
+import os
+import time
+import heapq
+import selectors
+import threading
+import collections
+from types import MappingProxyType
+
+from . import Gain_Param
+
+# values/stamps/errors/histories are read-only mappings (histories of
+# tuples); seq counts published snapshots
+Snapshot = collections.namedtuple('Snapshot', 'values stamps errors histories seq')
+
+EMPTY = Snapshot(MappingProxyType({}), MappingProxyType({}), MappingProxyType({}),
+                 MappingProxyType({}), 0)
+
+
+class Sampler():
+    """Runs metric functions on their own schedules in a background thread
+
+    Each metric is a function with an interval in seconds. A metric may also
+    give a `wake` object (anything with fileno()); when it becomes readable
+    the metric is sampled immediately, e.g. the netlink socket of
+    Gain_Param.AddressSampler for "IP on change".
+
+    Every sample publishes a new immutable Snapshot by swapping one
+    reference, so renderers read `sampler.snapshot` without locking:
+
+        sampler = default_sampler()
+        sampler.start()
+        snap = sampler.snapshot
+        cpu = snap.values.get('cpu', 0)
+
+    The last `history` samples of each metric are published in the
+    snapshot too, as a tuple of (time, value) pairs. wait(seq) blocks until
+    a snapshot newer than seq is published.
+    """
+    def __init__(self, history=120):
+        self.snapshot = EMPTY
+        self.metrics = {}
+        self.history_size = history
+        self.thread = None
+        self.running = False
+        self.published = threading.Condition()
+        self.selector = selectors.DefaultSelector()
+        self.wake_r, self.wake_w = _pipe()
+        self.selector.register(self.wake_r, selectors.EVENT_READ, None)
+
+    def add(self, name, fn, interval, wake=None):
+        # Call fn() every `interval` seconds (and whenever `wake` is readable)
+        self.metrics[name] = (fn, interval)
+        if wake is not None:
+            self.selector.register(wake, selectors.EVENT_READ, name)
+        self._nudge()
+
+    def history(self, name):
+        # Tuple of (time.time(), value) samples, oldest first
+        return self.snapshot.histories.get(name, ())
+
+    def sample(self, name):
+        # Run one metric and publish the result (sampler thread only)
+        fn, _ = self.metrics[name]
+        now = time.time()
+        old = self.snapshot
+        values, stamps, errors = dict(old.values), dict(old.stamps), dict(old.errors)
+        histories = old.histories
+        try:
+            value = fn()
+        except Exception as e:
+            errors[name] = e
+        else:
+            values[name] = value
+            stamps[name] = now
+            errors.pop(name, None)
+            # A new tuple rather than a shared deque, so readers never see
+            # it change under them
+            histories = dict(histories)
+            histories[name] = (histories.get(name, ()) + ((now, value),))[-self.history_size:]
+            histories = MappingProxyType(histories)
+        self.snapshot = Snapshot(MappingProxyType(values), MappingProxyType(stamps),
+                                 MappingProxyType(errors), histories, old.seq + 1)
+        with self.published:
+            self.published.notify_all()
+
+    def wait(self, seq, timeout=None):
+        # Latest snapshot once its seq differs from `seq` (or after timeout)
+        with self.published:
+            self.published.wait_for(lambda: self.snapshot.seq != seq, timeout)
+        return self.snapshot
+
+    def _run(self):
+        queue = []
+        scheduled = set()
+        while self.running:
+            now = time.monotonic()
+            for name in self.metrics.keys() - scheduled:
+                heapq.heappush(queue, (now, name))
+                scheduled.add(name)
+            timeout = max(0.0, queue[0][0] - now) if queue else None
+            for key, _ in self.selector.select(timeout):
+                if key.data is None:
+                    _drain(self.wake_r)
+                else:
+                    self.sample(key.data)
+            now = time.monotonic()
+            while queue and queue[0][0] <= now and self.running:
+                due, name = heapq.heappop(queue)
+                self.sample(name)
+                interval = self.metrics[name][1]
+                # Skip missed periods instead of bursting to catch up
+                due += interval
+                if due < now:
+                    due = now + interval
+                heapq.heappush(queue, (due, name))
+
+    def start(self):
+        if self.thread is None:
+            self.running = True
+            self.thread = threading.Thread(target=self._run, name='Gain_Sampler', daemon=True)
+            self.thread.start()
+        return self
+
+    def stop(self):
+        self.running = False
+        self._nudge()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+
+    def _nudge(self):
+        try:
+            os.write(self.wake_w, b'x')
+        except BlockingIOError:
+            pass
+
+
+def _pipe():
+    r, w = os.pipe()
+    os.set_blocking(r, False)
+    os.set_blocking(w, False)
+    return r, w
+
+
+def _drain(fd):
+    try:
+        while os.read(fd, 512):
+            pass
+    except BlockingIOError:
+        pass
+
+
+def default_sampler(gain=None, history=120):
+    # The CPU.py metrics: cpu/temp every second, disk every 30 s, IP on change
+    gain = gain if gain is not None else Gain_Param.Gain_Param()
+    gain.GET_IP()
+    sampler = Sampler(history)
+    sampler.add('cpu', gain.GET_CPU, 1.0)
+    sampler.add('temp', gain.GET_Temp, 1.0)
+    sampler.add('disk', gain.GET_Disk, 30.0)
+    sampler.add('ip', gain.GET_IP, gain.ip.ttl, wake=gain.ip.events)
+    return sampler
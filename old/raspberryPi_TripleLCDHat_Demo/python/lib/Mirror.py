@@ -0,0 +1,67 @@
+import numpy as np
+import concurrent.futures
+
+
+class MirrorGroup():
+    """Show one frame on several panels, converting it to RGB565 once
+
+    Each member may place the frame at an offset and/or rotate it by 90,
+    180 or 270 degrees (clockwise). Rotation reorders the already converted
+    pixels; it never converts again, and each rotation is done once per
+    frame however many members use it. Members on different SPI buses are
+    written in parallel, members sharing a bus one after another:
+
+        mirror = MirrorGroup()
+        mirror.add(disp_0, bus=0)
+        mirror.add(disp_1, bus=0)
+        mirror.add(disp_2, bus=1, offset=(40, 80))
+        mirror.show(image)
+    """
+    def __init__(self):
+        self.members = {}    # bus -> [(disp, offset, rotation)]
+        self.executor = None
+
+    def add(self, disp, bus=0, offset=(0, 0), rotation=0):
+        if rotation not in (0, 90, 180, 270):
+            raise ValueError('rotation must be 0, 90, 180 or 270')
+        self.members.setdefault(bus, []).append((disp, offset, rotation))
+        if self.executor is not None:
+            self.executor.shutdown()
+        self.executor = concurrent.futures.ThreadPoolExecutor(len(self.members), thread_name_prefix='mirror')
+
+    def convert(self, Image):
+        """RGB565 array (height, width, 2) of a PIL image"""
+        disp = next(iter(self.members.values()))[0][0]
+        w, h = Image.size
+        return np.frombuffer(disp.image_to_rgb565(Image), dtype=np.uint8).reshape(h, w, 2)
+
+    def show(self, Image):
+        self.show_array(self.convert(Image))
+
+    def show_array(self, pix):
+        """Fan an RGB565 array from convert() out to every member"""
+        rotated = {}
+        for members in self.members.values():
+            for disp, (x, y), rotation in members:
+                if rotation not in rotated:
+                    a = np.rot90(pix, -rotation // 90) if rotation else pix
+                    rotated[rotation] = (a.shape[1], a.shape[0], a.tobytes())
+                w, h, _ = rotated[rotation]
+                if x + w > disp.width or y + h > disp.height:
+                    raise ValueError('frame %dx%d at (%d, %d) does not fit a %dx%d panel'
+                                     % (w, h, x, y, disp.width, disp.height))
+        jobs = [self.executor.submit(self._write_bus, members, rotated)
+                for members in self.members.values()]
+        for job in jobs:
+            job.result()
+
+    @staticmethod
+    def _write_bus(members, rotated):
+        for disp, (x, y), rotation in members:
+            w, h, buf = rotated[rotation]
+            disp.ShowBuffer(buf, x, y, w, h)
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
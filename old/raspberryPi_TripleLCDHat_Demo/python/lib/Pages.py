@@ -0,0 +1,74 @@
+import threading
+
+
+class PageCache():
+    """Pages rendered once into panel-ready RGB565 buffers
+
+    A page is a render function render(width, height, **inputs) returning a
+    PIL image. Its buffer is made on first use (or by prerender()) and kept
+    until set_inputs() changes one of the page's inputs. Panels of the same
+    size share one buffer. show() is then one SetWindows plus one buffer
+    write per panel:
+
+        pages = PageCache({'left': disp_0, 'right': disp_1})
+        pages.add('hello', render_hello)
+        pages.add('status', render_status, ip=gain.GET_IP())
+        pages.prerender()
+        key1.when_activated = lambda: pages.show('hello')
+    """
+    def __init__(self, panels):
+        self.panels = panels
+        self.pages = {}      # name -> [render, inputs]
+        self.buffers = {}    # (name, width, height) -> bytes
+        self.current = {}    # panel name -> page shown
+        self.lock = threading.RLock()
+        self.renders = 0
+
+    def add(self, name, render, **inputs):
+        with self.lock:
+            self.pages[name] = [render, inputs]
+            self._invalidate(name)
+
+    def set_inputs(self, name, **inputs):
+        """Update a page's inputs; returns True if its buffers were dropped"""
+        with self.lock:
+            page = self.pages[name]
+            if all(page[1].get(k) == v for k, v in inputs.items()):
+                return False
+            page[1] = dict(page[1], **inputs)
+            self._invalidate(name)
+            # Re-send right away if the page is on screen
+            shown_on = [p for p, n in self.current.items() if n == name]
+            if shown_on:
+                self.show(name, shown_on)
+            return True
+
+    def _invalidate(self, name):
+        for key in [k for k in self.buffers if k[0] == name]:
+            del self.buffers[key]
+
+    def buffer(self, name, disp):
+        with self.lock:
+            key = (name, disp.width, disp.height)
+            buf = self.buffers.get(key)
+            if buf is None:
+                render, inputs = self.pages[name]
+                buf = disp.image_to_rgb565(render(disp.width, disp.height, **inputs))
+                self.buffers[key] = buf
+                self.renders += 1
+            return buf
+
+    def prerender(self):
+        """Render every page for every panel size now"""
+        with self.lock:
+            for name in self.pages:
+                for disp in self.panels.values():
+                    self.buffer(name, disp)
+
+    def show(self, name, panels=None):
+        """Put a page on the given panels (default: all)"""
+        with self.lock:
+            for panel in panels or self.panels:
+                disp = self.panels[panel]
+                disp.ShowBuffer(self.buffer(name, disp))
+                self.current[panel] = name
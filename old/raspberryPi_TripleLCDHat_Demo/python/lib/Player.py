@@ -0,0 +1,137 @@
+import os
+import time
+import queue
+import multiprocessing
+from PIL import Image, ImageSequence
+
+from . import Frame_Ring
+
+IMAGE_TYPES = ('.png', '.jpg', '.jpeg', '.bmp', '.gif')
+
+
+def frames(source, fps=10):
+    """(PIL image, duration ms) for each frame of a GIF/APNG, a directory
+    of images or a list of image paths. Sequences play at `fps`."""
+    if isinstance(source, str) and os.path.isdir(source):
+        source = sorted(os.path.join(source, f) for f in os.listdir(source)
+                        if f.lower().endswith(IMAGE_TYPES))
+    if isinstance(source, (list, tuple)):
+        for path in source:
+            with Image.open(path) as image:
+                yield image, 1000.0 / fps
+        return
+    with Image.open(source) as image:
+        for frame in ImageSequence.Iterator(image):
+            yield frame, frame.info.get('duration') or 1000.0 / fps
+
+
+def _decode(source, size, ring, fps, loop, stop):
+    # Worker process: decode, resize and convert ahead of the writer
+    try:
+        index = 0
+        while not stop.is_set():
+            for image, duration in frames(source, fps):
+                while True:
+                    try:
+                        slot = ring.acquire(timeout=0.1)
+                        break
+                    except queue.Empty:
+                        if stop.is_set():
+                            return
+                view = ring.view(slot)
+                try:
+                    view[:] = Frame_Ring.to_rgb565(image, size)
+                finally:
+                    view.release()
+                ring.publish(slot, (index, duration))
+                index += 1
+            if not loop:
+                break
+        ring.finish()
+    except Exception as e:
+        ring.finish('%s: %s' % (type(e).__name__, e))
+    finally:
+        ring.close()
+
+
+class Player():
+    """Plays animations on one panel with decoding in a separate process
+
+    The decoder process fills a ring of `slots` RGB565 frames in shared
+    memory; this process only waits for each frame's due time and writes
+    the buffer. Per-frame durations are honoured on an absolute clock, and
+    a frame whose display time has already passed is dropped instead of
+    delaying the ones after it.
+
+        report = Player(disp).play('../pic/anim.gif')
+        print(report['achieved_fps'], report['target_fps'], report['dropped'])
+    """
+    def __init__(self, disp, slots=4, fps=10):
+        self.disp = disp
+        self.slots = slots
+        self.fps = fps
+        self.ctx = multiprocessing.get_context()
+
+    def play(self, source, loop=False, seconds=None):
+        """Play until the source ends (or `seconds` pass); returns a report"""
+        disp = self.disp
+        size = (disp.width, disp.height)
+        ring = Frame_Ring.FrameRing(self.slots, disp.width * disp.height * 2, self.ctx)
+        stop = self.ctx.Event()
+        worker = self.ctx.Process(target=_decode, args=(source, size, ring, self.fps, loop, stop),
+                                  name='Player-decode', daemon=True)
+        worker.start()
+        shown = dropped = 0
+        media_time = 0.0
+        start = due = None
+        try:
+            while True:
+                try:
+                    slot, meta = ring.get(timeout=0.5)
+                except queue.Empty:
+                    if worker.is_alive():
+                        continue
+                    # Killed (OOM, signal) without reaching its finish() call
+                    raise RuntimeError('decoder exited (code %s) without finishing' % worker.exitcode)
+                if slot is None:
+                    if meta:
+                        raise RuntimeError('decoder failed: ' + meta)
+                    break
+                index, duration = meta
+                duration /= 1000.0
+                now = time.monotonic()
+                if start is None:
+                    start = due = now
+                media_time += duration
+                if now >= due + duration:
+                    dropped += 1
+                    ring.release(slot)
+                else:
+                    if due > now:
+                        time.sleep(due - now)
+                    view = ring.view(slot)
+                    try:
+                        disp.ShowBuffer(view)
+                    finally:
+                        # An unreleased view makes ring.close() raise
+                        # BufferError over the display's own error
+                        view.release()
+                        ring.release(slot)
+                    shown += 1
+                due += duration
+                if seconds is not None and time.monotonic() - start >= seconds:
+                    break
+        finally:
+            stop.set()
+            worker.join(1.0)
+            if worker.is_alive():
+                worker.terminate()
+            ring.close(unlink=True)
+        elapsed = time.monotonic() - start if start is not None else 0.0
+        return {
+            'frames': shown,
+            'dropped': dropped,
+            'seconds': elapsed,
+            'target_fps': (shown + dropped) / media_time if media_time else 0.0,
+            'achieved_fps': shown / elapsed if elapsed else 0.0,
+        }
@@ -0,0 +1,210 @@
+import time
+import queue
+import signal
+import importlib
+import multiprocessing
+
+from . import Frame_Ring
+
+_rings = None     # panel name -> FrameRing, in each render worker
+POLL = 0.5        # seconds between checks that the writers are still alive
+
+
+def _driver(spec):
+    name = spec.get('driver', 'LCD_0inch96')
+    return getattr(importlib.import_module('.' + name, __package__), name)
+
+
+def panel_size(spec):
+    """(width, height) of a panel spec: 'size' if given, else the driver's"""
+    if 'size' in spec:
+        return tuple(spec['size'])
+    cls = _driver(spec)
+    return (cls.width, cls.height)
+
+
+def open_panel(spec):
+    """Create and Init the driver described by a panel spec (in the writer)
+
+    A spec is a dict of driver ('LCD_0inch96'), bus, device, rst, dc, bl,
+    spi_freq and backlight; or a module-level 'factory' returning a ready
+    display plus its 'size'.
+    """
+    if 'factory' in spec:
+        return spec['factory']()
+    import spidev
+    disp = _driver(spec)(spi=spidev.SpiDev(spec.get('bus', 0), spec.get('device', 0)),
+               spi_freq=spec.get('spi_freq', 10000000),
+               rst=spec['rst'], dc=spec['dc'], bl=spec['bl'])
+    disp.Init()
+    disp.bl_DutyCycle(spec.get('backlight', 100))
+    return disp
+
+
+def _init_worker(rings):
+    global _rings
+    # Ctrl+C is for the parent, which shuts the pool down with close()
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    _rings = rings
+
+
+def _render(panel, slot, seq, size, render, args):
+    # Render worker: draw, convert into the slot we were given, hand it on
+    ring = _rings[panel]
+    try:
+        buf = Frame_Ring.to_rgb565(render(size[0], size[1], *args), size)
+        view = ring.view(slot)
+        view[:] = buf
+        view.release()
+    except Exception:
+        ring.release(slot)
+        raise
+    ring.publish(slot, (panel, seq))
+
+
+def _writer(bus, specs, rings, ready, stats):
+    # One process per SPI bus: the only place that touches these panels.
+    # It must always report to `stats`, or close() has to wait it out.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    try:
+        displays = {name: open_panel(spec) for name, spec in specs.items()}
+    except Exception as e:
+        for ring in rings.values():
+            ring.close()
+        stats.put({'bus': bus, 'error': '%s: %s' % (type(e).__name__, e)})
+        return
+    last = dict.fromkeys(specs, -1)
+    shown = dict.fromkeys(specs, 0)
+    stale = dict.fromkeys(specs, 0)
+    while True:
+        slot, meta = ready.get()
+        if slot is None:
+            break
+        panel, seq = meta
+        ring = rings[panel]
+        if seq < last[panel]:
+            stale[panel] += 1     # a newer frame for this panel already went out
+        else:
+            view = ring.view(slot)
+            displays[panel].ShowBuffer(view)
+            view.release()
+            last[panel] = seq
+            shown[panel] += 1
+        ring.release(slot)
+    for ring in rings.values():
+        ring.close()
+    stats.put({'bus': bus, 'shown': shown, 'stale': stale})
+
+
+class RenderPool():
+    """Render processes feeding one SPI writer process per bus
+
+    Each panel has its own ring of `slots` RGB565 frames in shared memory.
+    submit() takes a free slot for that panel in the caller (this is the
+    backpressure: with block=False a busy panel just skips the frame), a
+    pool worker renders into it, and the panel's bus writer sends it and
+    frees the slot. A panel can only have `slots` frames in flight, so a
+    slow render on one panel never holds up the others.
+
+    Render functions run in other processes, so they must be module-level:
+    render(width, height, *args) -> PIL image.
+
+        pool = RenderPool({'left': {'bus': 0, 'device': 0, 'rst': 24, 'dc': 4, 'bl': 13},
+                           'big': {'driver': 'LCD_1inch3', 'bus': 1, 'device': 0,
+                                   'rst': 27, 'dc': 22, 'bl': 19}})
+        pool.submit('left', render_status, ip)
+        pool.close()
+    """
+    def __init__(self, panels, processes=None, slots=2):
+        ctx = multiprocessing.get_context()
+        self.panels = panels
+        self.sizes = {}
+        buses = {}
+        for name, spec in panels.items():
+            self.sizes[name] = panel_size(spec)
+            buses.setdefault(spec.get('bus', 0), {})[name] = spec
+        self.readies = {bus: ctx.Queue() for bus in buses}
+        self.rings = {name: Frame_Ring.FrameRing(slots, size[0] * size[1] * 2, ctx,
+                                                 self.readies[panels[name].get('bus', 0)])
+                      for name, size in self.sizes.items()}
+        self.stats = ctx.Queue()
+        self.writers = []
+        self.writer_of = {}     # panel name -> its bus writer process
+        for bus, specs in buses.items():
+            writer = ctx.Process(target=_writer, name='writer-bus%d' % bus,
+                                 args=(bus, specs, {n: self.rings[n] for n in specs},
+                                       self.readies[bus], self.stats))
+            self.writers.append(writer)
+            self.writer_of.update(dict.fromkeys(specs, writer))
+        for writer in self.writers:
+            writer.start()
+        self.pool = ctx.Pool(processes, initializer=_init_worker, initargs=(self.rings,))
+        self.seq = dict.fromkeys(panels, 0)
+        self.submitted = dict.fromkeys(panels, 0)
+        self.skipped = dict.fromkeys(panels, 0)
+        self.errors = []
+
+    def submit(self, panel, render, *args, block=True, timeout=None):
+        """Queue a frame for a panel; False if no slot was free (frame skipped)
+
+        Waits at most `timeout` seconds for a slot (no wait with
+        block=False). Raises RuntimeError if the panel's writer has died,
+        as its slots would never come back.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            wait = POLL if block else 0.0
+            if block and deadline is not None:
+                wait = max(0.0, min(wait, deadline - time.monotonic()))
+            try:
+                slot = self.rings[panel].acquire(timeout=wait)
+                break
+            except queue.Empty:
+                writer = self.writer_of[panel]
+                if not writer.is_alive():
+                    raise RuntimeError('%s exited (code %s); panel %r is not being written'
+                                       % (writer.name, writer.exitcode, panel))
+                if not block or (deadline is not None and time.monotonic() >= deadline):
+                    self.skipped[panel] += 1
+                    return False
+        self.seq[panel] += 1
+        self.submitted[panel] += 1
+        self.pool.apply_async(_render, (panel, slot, self.seq[panel], self.sizes[panel], render, args),
+                              error_callback=self.errors.append)
+        return True
+
+    def close(self, timeout=10.0):
+        """Finish queued frames, stop the writers; returns per-bus stats
+
+        Writers still running after `timeout` seconds are terminated.
+        Raises RuntimeError if a writer failed or exited without reporting.
+        """
+        self.pool.close()
+        self.pool.join()
+        for ready in self.readies.values():
+            ready.put((None, None))
+        deadline = time.monotonic() + timeout
+        results = []
+        while len(results) < len(self.writers):
+            try:
+                results.append(self.stats.get(timeout=min(POLL, max(0.0, deadline - time.monotonic()))))
+            except queue.Empty:
+                if time.monotonic() >= deadline or not any(w.is_alive() for w in self.writers):
+                    break
+        for writer in self.writers:
+            writer.join(max(0.0, deadline - time.monotonic()))
+            if writer.is_alive():
+                writer.terminate()
+                writer.join()
+        for ring in self.rings.values():
+            ring.close(unlink=True)
+        failed = [r for r in results if 'error' in r]
+        if failed or len(results) < len(self.writers):
+            raise RuntimeError('%d of %d writers reported; failures: %s'
+                               % (len(results), len(self.writers), failed))
+        return {
+            'submitted': self.submitted,
+            'skipped': self.skipped,
+            'errors': [repr(e) for e in self.errors],
+            'buses': results,
+        }
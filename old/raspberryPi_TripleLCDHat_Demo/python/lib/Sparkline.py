@@ -0,0 +1,113 @@
+from . import lcdconfig
+
+
+class Sparkline():
+    """Scrolling history graph that updates one column per sample
+
+    The plot is kept as an RGB565 ring buffer of columns (each column is
+    `height` pixels, 2 bytes each). push() renders only the new column and
+    sends it through a 1-pixel-wide SetWindows region, so a sample costs
+    O(height) no matter how large the panel is.
+
+    - sweep (default): the write position moves left to right and wraps,
+      like an oscilloscope; with gap=True the column ahead is blanked.
+    - scroll=True: the ST7735S vertical scroll (VSCRDEF/VSCSAD) moves the
+      plot, newest sample on the right. With MADCTL 0xA8 (LCD_0inch96) the
+      controller's scroll axis is the panel's x axis, so this needs a graph
+      that spans the full panel height. Call close() to leave scroll mode
+      before drawing full frames again.
+
+    redraw() resends the whole plot, e.g. after a ShowImage over it.
+    """
+    def __init__(self, disp, x, y, width, height, vmin=0, vmax=100,
+                 fg=(0, 255, 0), bg=(0, 0, 0), fill=False, scroll=False, gap=True):
+        if scroll and (y != 0 or height != disp.height or (disp.width, disp.height) != (160, 80)):
+            raise ValueError('scroll mode needs a full-height graph on LCD_0inch96')
+        self.disp = disp
+        self.x, self.y = x, y
+        self.width, self.height = width, height
+        self.vmin, self.vmax = vmin, vmax
+        self.fg, self.bg = lcdconfig.color_to_rgb565(fg), lcdconfig.color_to_rgb565(bg)
+        self.fill = fill
+        self.scroll = scroll
+        self.gap = gap and not scroll
+        self.column_bytes = 2 * height
+        self.ring = bytearray(self.bg * (width * height))
+        self.cursor = width - 1   # ring slot (= plot x) of the newest column
+        self.last_row = None
+        if scroll:
+            self._define_scroll()
+
+    def _row(self, value):
+        span = self.vmax - self.vmin
+        frac = (value - self.vmin) / span if span else 0
+        frac = min(1.0, max(0.0, frac))
+        return self.height - 1 - int(round(frac * (self.height - 1)))
+
+    def _column(self, row):
+        # Line from the previous sample's row to this one, optionally filled below
+        top, bottom = row, row
+        if self.last_row is not None and not self.fill:
+            top, bottom = min(row, self.last_row), max(row, self.last_row)
+        if self.fill:
+            bottom = self.height - 1
+        self.last_row = row
+        return self.bg * top + self.fg * (bottom - top + 1) + self.bg * (self.height - 1 - bottom)
+
+    def _send_column(self, slot):
+        start = slot * self.column_bytes
+        x = self.x + slot
+        self.disp.SetWindows(x, self.y, x + 1, self.y + self.height)
+        self.disp.digital_write(self.disp.DC_PIN, True)
+        self.disp.spi_writebuffer(memoryview(self.ring)[start:start + self.column_bytes])
+
+    def push(self, value):
+        """Add one sample and send only the changed column(s)"""
+        self.cursor = (self.cursor + 1) % self.width
+        start = self.cursor * self.column_bytes
+        self.ring[start:start + self.column_bytes] = self._column(self._row(value))
+        self._send_column(self.cursor)
+        if self.gap:
+            ahead = (self.cursor + 1) % self.width
+            start = ahead * self.column_bytes
+            self.ring[start:start + self.column_bytes] = self.bg * self.height
+            self._send_column(ahead)
+        if self.scroll:
+            self._scroll_to(self.cursor)
+
+    def redraw(self):
+        """Send the whole plot (row-major, as the panel expects)"""
+        cb = self.column_bytes
+        ring = self.ring
+        rows = []
+        for r in range(0, cb, 2):
+            rows.append(b''.join(ring[c:c + 2] for c in range(r, len(ring), cb)))
+        pix = b''.join(rows)
+        self.disp.SetWindows(self.x, self.y, self.x + self.width, self.y + self.height)
+        self.disp.digital_write(self.disp.DC_PIN, True)
+        self.disp.spi_writebuffer(pix)
+
+    # Hardware scroll. With MADCTL 0xA8 (MV=1, MY=1) and SetWindows' x+1
+    # offset, panel column x is frame-memory line 160 - x of the 162 lines,
+    # and line TFA (the top of the scroll area) is shown at the right edge.
+    def _memory_line(self, x):
+        return 160 - x
+
+    def _define_scroll(self):
+        tfa = self._memory_line(self.x + self.width - 1)
+        vsa = self.width
+        bfa = 162 - tfa - vsa
+        self.disp.command(0x33)    # VSCRDEF
+        for v in (tfa, vsa, bfa):
+            self.disp.data(v >> 8)
+            self.disp.data(v & 0xff)
+
+    def _scroll_to(self, slot):
+        line = self._memory_line(self.x + slot)
+        self.disp.command(0x37)    # VSCSAD
+        self.disp.data(line >> 8)
+        self.disp.data(line & 0xff)
+
+    def close(self):
+        if self.scroll:
+            self.disp.command(0x13)    # NORON: back to normal (non-scrolled) mode
@@ -35,9 +35,29 @@ import logging
 import numpy as np
 from gpiozero import *
 
+
+def image_to_rgb565(Image):
+    """PIL image -> panel-ready RGB565 bytes (same packing as ShowImage)"""
+    img = np.asarray(Image.convert('RGB'))
+    pix = np.empty((img.shape[0], img.shape[1], 2), dtype = np.uint8)
+    pix[...,0] = np.bitwise_and(img[...,0],0xF8) | np.right_shift(img[...,1],5)
+    pix[...,1] = np.bitwise_and(np.left_shift(img[...,1],3),0xE0) | np.right_shift(img[...,2],3)
+    return pix.tobytes()
+
+
+def color_to_rgb565(color):
+    """(r, g, b) -> the two bytes image_to_rgb565() gives for that pixel"""
+    r, g, b = color
+    return bytes(((r & 0xF8) | (g >> 5), ((g << 3) & 0xE0) | (b >> 3)))
+
+
 class RaspberryPi:
-    def __init__(self,spi=spidev.SpiDev(0,0),spi_freq=40000000,rst = 22,dc = 23,bl = 19,bl_freq=1000,i2c=None,i2c_freq=100000):     
+    def __init__(self,spi=None,spi_freq=40000000,rst = 22,dc = 23,bl = 19,bl_freq=1000,i2c=None,i2c_freq=100000):     
         self.np=np
+        if spi is None :
+            # Opened here rather than as the default value, so importing this
+            # module does not need /dev/spidev0.0 (e.g. for the emulator)
+            spi = spidev.SpiDev(0,0)
         self.INPUT = False
         self.OUTPUT = True
         
@@ -71,6 +91,22 @@ class RaspberryPi:
     def digital_read(self, pin):
         return pin.value
 
+    def image_to_rgb565(self, Image):
+        """PIL image -> panel-ready RGB565 bytes (same packing as ShowImage)"""
+        return image_to_rgb565(Image)
+
+    def ShowBuffer(self, buf, x=0, y=0, w=None, h=None):
+        """Write RGB565 bytes from image_to_rgb565() to a window (default: full screen)"""
+        w = self.width if w is None else w
+        h = self.height if h is None else h
+        self.SetWindows(x, y, x + w, y + h)
+        self.digital_write(self.DC_PIN, True)
+        self.spi_writebuffer(buf)
+
+    def ShowImageWindow(self, Image, x, y):
+        """Write a PIL image to the window starting at (x, y), not the whole screen"""
+        self.ShowBuffer(self.image_to_rgb565(Image), x, y, Image.size[0], Image.size[1])
+
     def delay_ms(self, delaytime):
         time.sleep(delaytime / 1000.0)
 
@@ -80,6 +116,12 @@ class RaspberryPi:
     def spi_writebyte(self, data):
         if self.SPI!=None :
             self.SPI.writebytes(data)
+
+    def spi_writebuffer(self, data):
+        # bytes-like data; writebytes2 splits it into transfers itself
+        if self.SPI!=None :
+            self.SPI.writebytes2(data)
+
     def bl_DutyCycle(self, duty):
         # self._pwm.ChangeDutyCycle(duty)
         self.BL_PIN.value = duty / 100
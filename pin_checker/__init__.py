@@ -0,0 +1,25 @@
+"""
+Orange Pi Zero 2W GPIO toolkit
+
+Importable API for the pin_checker tools:
+
+    from pin_checker import Pin, PinBank
+    leds = PinBank([18, 22, 24], "out")
+    leds.set(0b101)
+"""
+
+from .gpio_control import (
+    ORANGEPI_ZERO2W_PINOUT,
+    POWER_PINS,
+    GPIOController,
+    Pin,
+    PinBank,
+    PinSession,
+    PWMWave,
+    WaveformScheduler,
+    blink,
+    pattern,
+    physical_to_gpio,
+    walking_ones,
+)
+from .gpio_client import GPIOClient
@@ -9,15 +9,7 @@ import sys
 import time
 from pathlib import Path
 
-def run_gpio_cmd(cmd_list):
-    """Helper to run GPIO control commands"""
-    script_path = Path(__file__).parent / "gpio_control.py"
-    result = subprocess.run([sys.executable, str(script_path)] + cmd_list, 
-                          capture_output=True, text=True)
-    if result.returncode != 0:
-        print(f"❌ GPIO command failed: {result.stderr}")
-        return False
-    return True
+from gpio_control import Pin, PinBank, PWMWave, WaveformScheduler
 
 def example_led_control():
     """Example: Simple LED control"""
@@ -26,15 +18,17 @@ def example_led_control():
     print("Connect LED between pin 18 and ground (with resistor)")
     input("Press Enter when ready...")
     
+    led = Pin(18)
     print("Turning LED on...")
-    if run_gpio_cmd(["--on", "18"]):
-        print("✅ LED should be ON")
+    led.on()
+    print("✅ LED should be ON")
     
     time.sleep(2)
     
     print("Turning LED off...")
-    if run_gpio_cmd(["--off", "18"]):
-        print("✅ LED should be OFF")
+    led.off()
+    print("✅ LED should be OFF")
+    led.close()
 
 def example_button_reading():
     """Example: Button input reading"""
@@ -45,23 +39,23 @@ def example_button_reading():
     input("Press Enter when ready...")
     
     print("Reading button for 10 seconds (press and release)...")
+    button = Pin(22, "in")
     start_time = time.time()
     last_state = None
     
     while time.time() - start_time < 10:
         # Read button state
-        result = subprocess.run([sys.executable, str(Path(__file__).parent / "gpio_control.py"), 
-                               "--read", "22"], capture_output=True, text=True)
-        
-        if result.returncode == 0:
-            if "LOW" in result.stdout and last_state != "pressed":
-                print("🔽 Button PRESSED!")
-                last_state = "pressed"
-            elif "HIGH" in result.stdout and last_state != "released":
-                print("🔼 Button RELEASED!")
-                last_state = "released"
+        value = button.read()
+        if value == 0 and last_state != "pressed":
+            print("🔽 Button PRESSED!")
+            last_state = "pressed"
+        elif value == 1 and last_state != "released":
+            print("🔼 Button RELEASED!")
+            last_state = "released"
         
-        time.sleep(0.1)
+        time.sleep(0.01)
+    
+    button.close()
 
 def example_pwm_simulation():
     """Example: Simulated PWM for LED dimming"""
@@ -72,23 +66,31 @@ def example_pwm_simulation():
     
     print("Dimming LED up and down...")
     
-    # Brighten LED (faster switching)
+    led = Pin(18, "out")
+    
+    # 100 Hz PWM on the scheduler thread; we only change the duty cycle
+    scheduler = WaveformScheduler()
+    pwm = PWMWave(led.set, frequency=100, duty=0.0)
+    handle = scheduler.add(pwm)
+    
+    # Brighten LED
     for duty in range(1, 10):
-        for _ in range(20):
-            run_gpio_cmd(["--on", "18"])
-            time.sleep(duty * 0.001)  # ON time
-            run_gpio_cmd(["--off", "18"])
-            time.sleep((10-duty) * 0.001)  # OFF time
+        pwm.duty = duty / 10
+        time.sleep(0.2)
     
-    # Dim LED (slower switching)
+    # Dim LED
     for duty in range(10, 0, -1):
-        for _ in range(20):
-            run_gpio_cmd(["--on", "18"])
-            time.sleep(duty * 0.001)
-            run_gpio_cmd(["--off", "18"])
-            time.sleep((10-duty) * 0.001)
+        pwm.duty = duty / 10
+        time.sleep(0.2)
+    
+    pwm.running = False
+    handle.wait()
+    scheduler.close()
+    stats = scheduler.stats()
+    print(f"PWM timing: p99 {stats['p99_us']:.0f} µs late over {stats['steps']} edges")
     
-    run_gpio_cmd(["--off", "18"])
+    led.off()
+    led.close()
     print("✅ Dimming complete")
 
 def example_multiple_leds():
@@ -100,29 +102,29 @@ def example_multiple_leds():
     
     led_pins = [18, 22, 24]
     
+    leds = PinBank(led_pins, "out")
+    
     # Turn all off first
-    for pin in led_pins:
-        run_gpio_cmd(["--off", str(pin)])
+    leds.all(0)
     
     print("Running LED chase pattern...")
     for _ in range(5):
         for pin in led_pins:
-            run_gpio_cmd(["--on", str(pin)])
+            leds[pin].on()
             time.sleep(0.2)
-            run_gpio_cmd(["--off", str(pin)])
+            leds[pin].off()
     
     print("Running blink pattern...")
     for _ in range(3):
         # All on
-        for pin in led_pins:
-            run_gpio_cmd(["--on", str(pin)])
+        leds.all(1)
         time.sleep(0.5)
         
         # All off
-        for pin in led_pins:
-            run_gpio_cmd(["--off", str(pin)])
+        leds.all(0)
         time.sleep(0.5)
     
+    leds.cleanup()
     print("✅ Pattern complete")
 
 def example_hat_testing():
@@ -142,22 +144,27 @@ def example_hat_testing():
         16: "PWM4"
     }
     
+    pins = PinBank(hat_pins)
     print("Testing HAT pins...")
     for pin, description in hat_pins.items():
         print(f"Testing pin {pin} ({description})")
         
         # Set as output and test
-        if run_gpio_cmd(["--on", str(pin)]):
+        try:
+            pins[pin].on()
+        except OSError as e:
+            print(f"  ❌ Pin {pin} cannot set HIGH: {e}")
+        else:
             time.sleep(0.1)
-            if run_gpio_cmd(["--off", str(pin)]):
+            try:
+                pins[pin].off()
                 print(f"  ✅ Pin {pin} working")
-            else:
-                print(f"  ❌ Pin {pin} cannot set LOW")
-        else:
-            print(f"  ❌ Pin {pin} cannot set HIGH")
+            except OSError as e:
+                print(f"  ❌ Pin {pin} cannot set LOW: {e}")
         
         time.sleep(0.1)
     
+    pins.cleanup()
     print("HAT compatibility test complete")
 
 def example_script_integration():
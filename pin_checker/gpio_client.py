@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Thin client for the gpio_control.py daemon
+One socket round trip per call instead of one Python process per call.
+
+    from gpio_client import GPIOClient
+    with GPIOClient(autostart=True) as gpio:
+        gpio.on(18)
+        print(gpio.read(22))
+"""
+
+import os
+import sys
+import time
+import signal
+import socket
+import subprocess
+from pathlib import Path
+
+DEFAULT_SOCKET = os.environ.get("GPIO_CONTROL_SOCKET", "/tmp/gpio_control.sock")
+
+
+class GPIOClient:
+    """Connection to a running `gpio_control.py --daemon`
+
+    With autostart=True a daemon is launched in the background if none is
+    listening yet; it keeps running after close() unless shutdown() is
+    called. Daemon errors are raised as RuntimeError.
+    """
+
+    def __init__(self, path=DEFAULT_SOCKET, autostart=False, timeout=5.0):
+        self.path = path
+        self.daemon = None
+        try:
+            self.sock = self._connect()
+        except OSError:
+            if not autostart:
+                raise
+            self.sock = self._start_daemon(timeout)
+        self.reader = self.sock.makefile("rb")
+
+    def _connect(self):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.connect(self.path)
+        except OSError:
+            sock.close()
+            raise
+        return sock
+
+    def _start_daemon(self, timeout):
+        script = Path(__file__).parent / "gpio_control.py"
+        self.daemon = subprocess.Popen([sys.executable, str(script), "--daemon", "--socket", self.path],
+                                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                                       start_new_session=True)
+        # A crashed daemon leaves its socket file behind, so keep trying to
+        # connect until the new one has re-bound it
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                return self._connect()
+            except (FileNotFoundError, ConnectionRefusedError):
+                if self.daemon.poll() is not None:
+                    raise RuntimeError(f"GPIO daemon exited with code {self.daemon.returncode}")
+                if time.monotonic() > deadline:
+                    raise TimeoutError(f"GPIO daemon did not start on {self.path}")
+                time.sleep(0.01)
+
+    def _reply(self):
+        line = self.reader.readline()
+        if not line:
+            raise ConnectionError("GPIO daemon closed the connection")
+        line = line.decode().rstrip("\n")
+        if line.startswith("ERR"):
+            raise RuntimeError(line[4:])
+        return line[3:]
+
+    def call(self, command):
+        """Send one protocol line and return the reply payload"""
+        self.sock.sendall(command.encode() + b"\n")
+        return self._reply()
+
+    def pipeline(self, commands):
+        """Send many protocol lines in one write; returns the payloads"""
+        self.sock.sendall("".join(c + "\n" for c in commands).encode())
+        return [self._reply() for _ in commands]
+
+    def set(self, pin, value):
+        """Set physical pin HIGH(1) or LOW(0)"""
+        self.call(f"S {pin} {1 if value else 0}")
+
+    def on(self, pin):
+        self.set(pin, 1)
+
+    def off(self, pin):
+        self.set(pin, 0)
+
+    def read(self, pin):
+        """Read physical pin value"""
+        return int(self.call(f"R {pin}"))
+
+    def set_many(self, values):
+        """Set several pins at once from a {pin: value} mapping"""
+        self.call("M " + " ".join(f"{pin}={1 if v else 0}" for pin, v in values.items()))
+
+    def read_many(self, pins):
+        """Read several pins at once; returns a list of values"""
+        return [int(v) for v in self.call("Q " + " ".join(str(p) for p in pins)).split()]
+
+    def blink(self, pin, count, period_ms=1000):
+        """Blink a pin count times; returns when the blinking is done"""
+        self.call(f"B {pin} {count} {int(period_ms)}")
+
+    def cleanup(self):
+        """Ask the daemon to unexport all pins"""
+        self.call("U")
+
+    def close(self):
+        self.reader.close()
+        self.sock.close()
+
+    def shutdown(self, timeout=5.0):
+        """Close, and stop the daemon if this client started it"""
+        self.close()
+        if self.daemon is not None:
+            self.daemon.send_signal(signal.SIGINT)
+            try:
+                self.daemon.wait(timeout)
+            except subprocess.TimeoutExpired:
+                self.daemon.kill()
+                self.daemon.wait()
+            self.daemon = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
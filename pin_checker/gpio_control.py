@@ -6,8 +6,15 @@ Easy-to-use CLI for controlling GPIO pins individually or in groups
 
 import os
 import sys
+import grp
+import errno
 import time
+import heapq
+import socket
 import argparse
+import selectors
+import threading
+import collections
 from pathlib import Path
 
 # Orange Pi Zero 2W GPIO pin mapping (Physical Pin -> GPIO Number)
@@ -46,50 +53,88 @@ ORANGEPI_ZERO2W_PINOUT = {
 # Power/Ground pins that should not be controlled
 POWER_PINS = [1, 2, 4, 6, 9, 14, 17, 20, 25, 30, 34, 39]
 
+# sysfs GPIO directory (override with GPIO_ROOT, e.g. to point at a test tree)
+GPIO_ROOT = os.environ.get("GPIO_ROOT", "/sys/class/gpio")
+
+# Default UNIX socket for --daemon (override with GPIO_CONTROL_SOCKET)
+DEFAULT_SOCKET = os.environ.get("GPIO_CONTROL_SOCKET", "/tmp/gpio_control.sock")
+
+# Group allowed to use the daemon socket besides its owner (mode 0660)
+SOCKET_GROUP = "gpio"
+
 class GPIOController:
     """Simple GPIO controller using sysfs interface"""
     
-    def __init__(self):
+    def __init__(self, root=None):
+        self.root = root or GPIO_ROOT
         self.exported_pins = set()
+        self.directions = {}    # gpio_num -> direction we last set
+        self.fds = {}           # gpio_num -> open value file descriptor
         
     def export_pin(self, gpio_num):
         """Export a GPIO pin for use"""
-        try:
+        return self.export_pins([gpio_num])[gpio_num]
+    
+    def export_pins(self, gpio_nums):
+        """Export several GPIO pins, waiting for all of them together"""
+        requested = []
+        for gpio_num in gpio_nums:
             if gpio_num in self.exported_pins:
-                return True
-                
-            with open("/sys/class/gpio/export", "w") as f:
-                f.write(str(gpio_num))
-            self.exported_pins.add(gpio_num)
-            time.sleep(0.1)  # Give system time to create files
-            return True
-        except (PermissionError, OSError) as e:
-            if "Device or resource busy" in str(e):
-                # Pin already exported by another process
+                continue
+            try:
+                if not os.path.exists(f"{self.root}/gpio{gpio_num}/value"):
+                    with open(f"{self.root}/export", "w") as f:
+                        f.write(str(gpio_num))
+                requested.append(gpio_num)
+            except (PermissionError, OSError) as e:
+                if e.errno == errno.EBUSY:
+                    # Pin already exported by another process
+                    requested.append(gpio_num)
+        pending = self._wait_ready(requested)
+        for gpio_num in requested:
+            if gpio_num not in pending:
                 self.exported_pins.add(gpio_num)
-                return True
-            return False
+        return {gpio_num: gpio_num in self.exported_pins for gpio_num in gpio_nums}
+    
+    def _wait_ready(self, gpio_nums, timeout=1.0):
+        """Wait until the pins' value files are writable (udev may chmod
+        them a little after export); returns the pins that never became ready"""
+        # Same loop as old/lib/sysfs_gpio.wait_ready. It is repeated here
+        # because install.sh copies this file on its own to ~/.local/bin,
+        # where old/lib cannot be imported.
+        pending = {g for g in gpio_nums if not os.access(f"{self.root}/gpio{g}/value", os.W_OK)}
+        deadline = time.monotonic() + timeout
+        delay = 0.0002
+        while pending and time.monotonic() < deadline:
+            time.sleep(delay)
+            delay = min(delay * 2, 0.01)
+            pending = {g for g in pending if not os.access(f"{self.root}/gpio{g}/value", os.W_OK)}
+        return pending
             
     def set_direction(self, gpio_num, direction):
-        """Set pin direction (in/out)"""
+        """Set pin direction (in/out); a no-op if already set by us"""
+        if self.directions.get(gpio_num) == direction:
+            return True
         try:
-            direction_path = f"/sys/class/gpio/gpio{gpio_num}/direction"
-            if not os.path.exists(direction_path):
-                return False
-            with open(direction_path, "w") as f:
+            with open(f"{self.root}/gpio{gpio_num}/direction", "w") as f:
                 f.write(direction)
+            self.directions[gpio_num] = direction
             return True
         except (PermissionError, OSError):
             return False
+    
+    def value_fd(self, gpio_num):
+        """Open (once) and return the pin's value file descriptor"""
+        fd = self.fds.get(gpio_num)
+        if fd is None:
+            fd = os.open(f"{self.root}/gpio{gpio_num}/value", os.O_RDWR)
+            self.fds[gpio_num] = fd
+        return fd
             
     def set_value(self, gpio_num, value):
         """Set pin value (0/1)"""
         try:
-            value_path = f"/sys/class/gpio/gpio{gpio_num}/value"
-            if not os.path.exists(value_path):
-                return False
-            with open(value_path, "w") as f:
-                f.write(str(value))
+            os.pwrite(self.value_fd(gpio_num), b"1" if value else b"0", 0)
             return True
         except (PermissionError, OSError):
             return False
@@ -97,18 +142,18 @@ class GPIOController:
     def get_value(self, gpio_num):
         """Read pin value"""
         try:
-            value_path = f"/sys/class/gpio/gpio{gpio_num}/value"
-            if not os.path.exists(value_path):
-                return None
-            with open(value_path, "r") as f:
-                return int(f.read().strip())
+            return int(os.pread(self.value_fd(gpio_num), 1, 0))
         except (PermissionError, OSError, ValueError):
             return None
             
     def unexport_pin(self, gpio_num):
         """Unexport a GPIO pin"""
+        fd = self.fds.pop(gpio_num, None)
+        if fd is not None:
+            os.close(fd)
+        self.directions.pop(gpio_num, None)
         try:
-            with open("/sys/class/gpio/unexport", "w") as f:
+            with open(f"{self.root}/unexport", "w") as f:
                 f.write(str(gpio_num))
             self.exported_pins.discard(gpio_num)
             return True
@@ -120,6 +165,748 @@ class GPIOController:
         for gpio_num in self.exported_pins.copy():
             self.unexport_pin(gpio_num)
 
+class Pin:
+    """One header pin with export state, direction and value file cached
+
+    Physical pin numbers. The first set()/read() exports and configures the
+    pin; after that each operation is a single pwrite/pread.
+
+        led = Pin(18)
+        led.on()
+        button = Pin(22, "in")
+        print(button.value)
+    """
+    
+    def __init__(self, pin, direction=None, gpio=None):
+        self.pin = pin
+        self.gpio_num = physical_to_gpio(pin)
+        self.gpio = gpio if gpio is not None else GPIOController()
+        self.direction = None
+        self.fd = None
+        self.last = None    # last value written by us
+        if direction is not None:
+            self.setup(direction)
+    
+    def setup(self, direction):
+        """Export the pin (if needed) and set its direction"""
+        if direction == self.direction:
+            return
+        if not (self.gpio.export_pin(self.gpio_num) and self.gpio.set_direction(self.gpio_num, direction)):
+            raise OSError(f"cannot configure pin {self.pin} (GPIO {self.gpio_num}) as {direction}")
+        self.direction = direction
+        self.fd = self.gpio.value_fd(self.gpio_num)
+        self.last = None
+    
+    def set(self, value):
+        """Drive the pin HIGH(1) or LOW(0)"""
+        if self.direction != "out":
+            self.setup("out")
+        os.pwrite(self.fd, b"1" if value else b"0", 0)
+        self.last = 1 if value else 0
+    
+    def on(self):
+        self.set(1)
+    
+    def off(self):
+        self.set(0)
+    
+    def read(self):
+        """Read the pin; configures it as input only if not yet set up"""
+        if self.direction is None:
+            self.setup("in")
+        return 1 if os.pread(self.fd, 1, 0) == b"1" else 0
+    
+    @property
+    def value(self):
+        return self.read()
+    
+    @value.setter
+    def value(self, value):
+        self.set(value)
+    
+    def close(self):
+        """Unexport the pin"""
+        self.gpio.unexport_pin(self.gpio_num)
+        self.direction = None
+        self.fd = None
+
+class PinBank:
+    """A group of Pins set and read together
+
+    All pins are exported in one batch. set() accepts a sequence (in bank
+    order), a {pin: value} dict or an int bitmask (bit i = i-th pin) and
+    skips pins already at the requested level.
+    """
+    
+    def __init__(self, pins, direction=None, gpio=None):
+        self.gpio = gpio if gpio is not None else GPIOController()
+        self.pins = [Pin(pin, gpio=self.gpio) for pin in pins]
+        self.by_number = {p.pin: p for p in self.pins}
+        self.gpio.export_pins([p.gpio_num for p in self.pins])
+        if direction is not None:
+            for p in self.pins:
+                p.setup(direction)
+    
+    def __len__(self):
+        return len(self.pins)
+    
+    def __iter__(self):
+        return iter(self.pins)
+    
+    def __getitem__(self, pin):
+        """Pin object by physical pin number"""
+        return self.by_number[pin]
+    
+    def set(self, values, force=False):
+        """Set many pins; force=True rewrites pins already at the level"""
+        if isinstance(values, dict):
+            items = [(self.by_number[pin], value) for pin, value in values.items()]
+        elif isinstance(values, int):
+            items = [(p, (values >> i) & 1) for i, p in enumerate(self.pins)]
+        else:
+            items = zip(self.pins, values)
+        for p, value in items:
+            value = 1 if value else 0
+            if force or p.last != value or p.direction != "out":
+                p.set(value)
+    
+    def all(self, value):
+        """Drive every pin to the same level"""
+        self.set([value] * len(self.pins))
+    
+    def read(self):
+        """Values of all pins, in bank order"""
+        return [p.read() for p in self.pins]
+    
+    def read_mask(self):
+        """Values of all pins as an int bitmask (bit i = i-th pin)"""
+        mask = 0
+        for i, p in enumerate(self.pins):
+            if p.read():
+                mask |= 1 << i
+        return mask
+    
+    def cleanup(self):
+        """Unexport every pin in the bank"""
+        for p in self.pins:
+            p.close()
+
+class PinSession:
+    """Pins exported once, with cached directions and open value files
+
+    Shared by the daemon, --script and interactive mode so that repeated
+    operations on a pin cost a single pwrite/pread. Pins are physical pin
+    numbers.
+    """
+
+    def __init__(self, gpio=None):
+        self.gpio = gpio if gpio is not None else GPIOController()
+        self.pins = {}          # physical pin -> Pin
+
+    def pin(self, pin):
+        """Pin object for a physical pin number"""
+        p = self.pins.get(pin)
+        if p is None:
+            p = self.pins[pin] = Pin(pin, gpio=self.gpio)
+        return p
+
+    def fd(self, pin, direction=None):
+        """Value fd for a physical pin, exporting/configuring it once
+
+        direction=None keeps whatever the pin already is ("in" if new).
+        """
+        p = self.pin(pin)
+        p.setup(direction or p.direction or "in")
+        return p.fd
+
+    def set(self, pin, value):
+        """Drive a pin HIGH(1) or LOW(0)"""
+        self.pin(pin).set(value)
+
+    def read(self, pin):
+        """Read a pin (configures it as input only if not yet set up)"""
+        return self.pin(pin).read()
+
+    def cleanup(self):
+        """Close value files and unexport every pin"""
+        self.pins.clear()
+        self.gpio.cleanup()
+
+class GPIOServer:
+    """Long-running GPIO service on a UNIX socket
+
+    Keeps every pin exported with its value file open between requests, so
+    an operation costs one pwrite/pread instead of a Python start-up plus
+    export/direction/open. Line protocol, physical pin numbers, one reply
+    line per command (commands may be pipelined):
+
+      S <pin> <0|1>             set output          -> OK
+      R <pin>                   read value          -> OK <0|1>
+      M <pin>=<v> [<pin>=<v>..] set several pins    -> OK
+      Q <pin> [<pin>..]         read several pins   -> OK <v> [<v>..]
+      B <pin> <count> [<ms>]    blink, replies when done -> OK
+      U                         unexport all pins   -> OK
+      P                         ping                -> OK
+
+    Failures reply "ERR <message>". A blink only holds up the client that
+    asked for it; other clients keep being served meanwhile.
+    """
+
+    def __init__(self, path=DEFAULT_SOCKET, gpio=None):
+        self.path = path
+        self.session = PinSession(gpio)
+        self.blinks = []        # [due, client, fd, toggles_left, half_period]
+        self.selector = selectors.DefaultSelector()
+        self.running = False
+        # stop() writes here so a select() waiting for clients returns
+        self._wake_r, self._wake_w = os.pipe()
+        os.set_blocking(self._wake_r, False)
+        os.set_blocking(self._wake_w, False)
+        self.selector.register(self._wake_r, selectors.EVENT_READ, None)
+
+    def _set(self, pin, value):
+        if value not in ("0", "1"):
+            raise ValueError("Value must be 0 or 1")
+        self.session.set(int(pin), int(value))
+
+    def _read(self, pin):
+        return str(self.session.read(int(pin)))
+
+    def execute(self, client, line):
+        """Run one command line; returns the reply, or None if deferred"""
+        parts = line.split()
+        if not parts:
+            return "ERR empty command"
+        cmd, args = parts[0].upper(), parts[1:]
+        try:
+            if cmd == "S" and len(args) == 2:
+                self._set(*args)
+                return "OK"
+            elif cmd == "R" and len(args) == 1:
+                return "OK " + self._read(args[0])
+            elif cmd == "M" and args:
+                for item in args:
+                    self._set(*item.split("=", 1))
+                return "OK"
+            elif cmd == "Q" and args:
+                return "OK " + " ".join(self._read(pin) for pin in args)
+            elif cmd == "B" and len(args) in (2, 3):
+                fd = self.session.fd(int(args[0]), "out")
+                half = (int(args[2]) if len(args) == 3 else 1000) / 2000.0
+                toggles = int(args[1]) * 2
+                if toggles <= 0:
+                    return "OK"
+                os.pwrite(fd, b"1", 0)
+                self.blinks.append([time.monotonic() + half, client, fd, toggles - 1, half])
+                return None
+            elif cmd == "U" and not args:
+                # Pending blinks hold value fds that cleanup() closes (and
+                # that a new socket could reuse): end them first
+                blinks, self.blinks = self.blinks, []
+                self.session.cleanup()
+                for blink in blinks:
+                    self._end_blink(blink, "ERR pins unexported")
+                return "OK"
+            elif cmd == "P" and not args:
+                return "OK"
+            return f"ERR bad command: {line.strip()}"
+        except (ValueError, TypeError, OSError) as e:
+            return f"ERR {e}"
+
+    def _reply(self, client, text):
+        client["out"] += text.encode() + b"\n"
+
+    def _flush(self, client):
+        if client["out"]:
+            try:
+                sent = client["sock"].send(client["out"])
+                del client["out"][:sent]
+            except (BlockingIOError, InterruptedError):
+                pass
+            except OSError:
+                self._drop(client)
+                return
+        events = selectors.EVENT_READ | (selectors.EVENT_WRITE if client["out"] else 0)
+        self.selector.modify(client["sock"], events, client)
+
+    def _process(self, client):
+        """Execute buffered lines until one defers (blink) or input runs out"""
+        buf = client["in"]
+        while not client["busy"]:
+            end = buf.find(b"\n")
+            if end < 0:
+                break
+            line = buf[:end].decode(errors="replace")
+            del buf[:end + 1]
+            reply = self.execute(client, line)
+            if reply is None:
+                client["busy"] = True
+            else:
+                self._reply(client, reply)
+        self._flush(client)
+
+    def _drop(self, client):
+        self.blinks = [b for b in self.blinks if b[1] is not client]
+        try:
+            self.selector.unregister(client["sock"])
+        except (KeyError, ValueError):
+            pass
+        client["sock"].close()
+
+    def _end_blink(self, blink, reply):
+        """Reply to a finished (or failed) blink and resume its client"""
+        if blink in self.blinks:
+            self.blinks.remove(blink)
+        client = blink[1]
+        client["busy"] = False
+        self._reply(client, reply)
+        self._process(client)
+
+    def _run_blinks(self):
+        now = time.monotonic()
+        for blink in list(self.blinks):
+            if blink not in self.blinks:
+                continue    # ended by a U run from an earlier blink's client
+            due, client, fd, left, half = blink
+            if due > now:
+                continue
+            try:
+                os.pwrite(fd, b"1" if left % 2 == 0 else b"0", 0)
+            except OSError as e:
+                self._end_blink(blink, f"ERR {e}")
+                continue
+            if left > 1:
+                blink[0] = due + half
+                blink[3] = left - 1
+            else:
+                self._end_blink(blink, "OK")
+
+    def _restrict_socket(self):
+        """Limit the socket to the owner and the gpio group
+
+        The daemon usually runs as root, and under the default umask any
+        local user could otherwise connect and drive the pins. Done before
+        listen(), so no client can connect in between.
+        """
+        try:
+            os.chown(self.path, -1, grp.getgrnam(SOCKET_GROUP).gr_gid)
+        except (KeyError, PermissionError):
+            pass
+        os.chmod(self.path, 0o660)
+
+    def serve_forever(self):
+        """Serve clients until stop() or KeyboardInterrupt"""
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+        listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        listener.bind(self.path)
+        self._restrict_socket()
+        listener.listen(16)
+        listener.setblocking(False)
+        self.selector.register(listener, selectors.EVENT_READ, None)
+        self.running = True
+        try:
+            while self.running:
+                timeout = None
+                if self.blinks:
+                    timeout = max(0.0, min(b[0] for b in self.blinks) - time.monotonic())
+                for key, mask in self.selector.select(timeout):
+                    if key.fd == self._wake_r:
+                        try:
+                            os.read(self._wake_r, 64)
+                        except BlockingIOError:
+                            pass
+                        continue
+                    if key.data is None:
+                        conn, _ = listener.accept()
+                        conn.setblocking(False)
+                        client = {"sock": conn, "in": bytearray(), "out": bytearray(), "busy": False}
+                        self.selector.register(conn, selectors.EVENT_READ, client)
+                        continue
+                    client = key.data
+                    if mask & selectors.EVENT_READ:
+                        try:
+                            data = client["sock"].recv(65536)
+                        except (BlockingIOError, InterruptedError):
+                            data = None
+                        except OSError:
+                            data = b""
+                        if data == b"":
+                            self._drop(client)
+                            continue
+                        if data:
+                            client["in"] += data
+                            self._process(client)
+                    elif mask & selectors.EVENT_WRITE:
+                        self._flush(client)
+                self._run_blinks()
+        finally:
+            self.selector.unregister(listener)
+            listener.close()
+            if os.path.exists(self.path):
+                os.unlink(self.path)
+            self.session.cleanup()
+
+    def stop(self):
+        """Make serve_forever() return; safe to call from another thread"""
+        self.running = False
+        try:
+            os.write(self._wake_w, b"x")
+        except BlockingIOError:
+            pass
+
+class _AbsoluteSleep:
+    """Sleep until an absolute CLOCK_MONOTONIC deadline
+
+    Uses clock_nanosleep(TIMER_ABSTIME) through ctypes when libc has it, so
+    a late wake-up never pushes later deadlines back; falls back to
+    time.sleep() on the remaining time otherwise.
+    """
+
+    CLOCK_MONOTONIC = 1
+    TIMER_ABSTIME = 1
+
+    def __init__(self):
+        self._call = None
+        try:
+            import ctypes
+            import ctypes.util
+
+            class timespec(ctypes.Structure):
+                _fields_ = [("tv_sec", ctypes.c_long), ("tv_nsec", ctypes.c_long)]
+
+            libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+            self._timespec = timespec
+            self._call = libc.clock_nanosleep
+            self._call.argtypes = [ctypes.c_int, ctypes.c_int,
+                                   ctypes.POINTER(timespec), ctypes.POINTER(timespec)]
+        except (OSError, AttributeError):
+            self._call = None
+
+    def __call__(self, deadline_ns):
+        if self._call is not None:
+            ts = self._timespec(deadline_ns // 1_000_000_000, deadline_ns % 1_000_000_000)
+            # EINTR returns early; WaveformScheduler._run sleeps again
+            self._call(self.CLOCK_MONOTONIC, self.TIMER_ABSTIME, ts, None)
+        else:
+            remaining = deadline_ns - time.monotonic_ns()
+            if remaining > 0:
+                time.sleep(remaining / 1e9)
+
+def blink(set_pin, period=1.0, count=None, duty=0.5):
+    """Waveform: on for period*duty, off for the rest; count=None forever"""
+    n = 0
+    while count is None or n < count:
+        yield [(set_pin, 1)], period * duty
+        yield [(set_pin, 0)], period * (1 - duty)
+        n += 1
+
+def pattern(set_pin, steps, repeat=1):
+    """Waveform from [(value, seconds), ...]; repeat=None loops forever"""
+    n = 0
+    while repeat is None or n < repeat:
+        for value, seconds in steps:
+            yield [(set_pin, value)], seconds
+        n += 1
+
+class PWMWave:
+    """Waveform: software PWM whose duty (0.0-1.0) may change while running"""
+
+    def __init__(self, set_pin, frequency=100, duty=0.5):
+        self.set_pin = set_pin
+        self.frequency = frequency
+        self.duty = duty
+        self.running = True
+
+    def __iter__(self):
+        level = None
+        while self.running:
+            period = 1.0 / self.frequency
+            duty = min(max(self.duty, 0.0), 1.0)
+            if duty in (0.0, 1.0):
+                # Flat output: write only on change, then idle a period
+                value = int(duty)
+                yield ([(self.set_pin, value)] if value != level else []), period
+                level = value
+                continue
+            yield [(self.set_pin, 1)], period * duty
+            yield [(self.set_pin, 0)], period * (1 - duty)
+            level = 0
+
+def walking_ones(setters, step, cycles=None, duty=0.5):
+    """Waveform: one pin at a time goes HIGH for step*duty, in order"""
+    n = 0
+    while cycles is None or n < cycles:
+        for set_pin in setters:
+            yield [(set_pin, 1)], step * duty
+            yield [(set_pin, 0)], step * (1 - duty)
+        n += 1
+
+class WaveformHandle:
+    """A running waveform; cancel() stops it, wait() blocks until it ends"""
+
+    def __init__(self, steps):
+        self.steps = iter(steps)
+        self.cancelled = False
+        self.error = None
+        self.done = threading.Event()
+
+    def cancel(self):
+        self.cancelled = True
+
+    def wait(self, timeout=None):
+        return self.done.wait(timeout)
+
+class WaveformScheduler:
+    """One thread driving many waveforms from absolute deadlines
+
+    A waveform is any iterable of (writes, hold_seconds) steps, where writes
+    is a list of (callable, value) applied together at the step's deadline;
+    blink(), pattern(), PWMWave and walking_ones() build the common ones.
+    Each next deadline is the previous deadline plus the hold time, never
+    "now" plus the hold time, so timing errors do not accumulate.
+
+    Pending deadlines live in a binary heap: the thread sleeps straight to
+    the earliest one (interruptibly while far away, with clock_nanosleep
+    for the last stretch) instead of ticking a wheel. Lateness of every
+    fired step is recorded; see stats().
+    """
+
+    SPIN_NS = 2_000_000     # switch to precise absolute sleep this close to a deadline
+
+    def __init__(self, history=4096):
+        self._heap = []
+        self._seq = 0
+        self._cond = threading.Condition()
+        self._sleep = _AbsoluteSleep()
+        self.lateness = collections.deque(maxlen=history)   # ns, most recent steps
+        self.fired = 0
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="WaveformScheduler", daemon=True)
+        self._thread.start()
+
+    def add(self, steps, start=None):
+        """Start a waveform now (or at monotonic time start); returns a handle"""
+        handle = WaveformHandle(steps)
+        due = time.monotonic_ns() if start is None else int(start * 1e9)
+        with self._cond:
+            self._seq += 1
+            heapq.heappush(self._heap, (due, self._seq, handle))
+            self._cond.notify()
+        return handle
+
+    def _fire(self, due, handle):
+        """Run one step of a waveform and queue its next deadline"""
+        if handle.cancelled:
+            handle.done.set()
+            return
+        try:
+            writes, hold = next(handle.steps)
+        except StopIteration:
+            handle.done.set()
+            return
+        try:
+            for fn, value in writes:
+                fn(value)
+        except Exception as e:
+            # A failing write ends its own waveform, not the scheduler
+            handle.error = e
+            handle.done.set()
+            return
+        self.lateness.append(time.monotonic_ns() - due)
+        self.fired += 1
+        with self._cond:
+            self._seq += 1
+            heapq.heappush(self._heap, (due + int(hold * 1e9), self._seq, handle))
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while self._running:
+                    if not self._heap:
+                        self._cond.wait()
+                        continue
+                    remaining = self._heap[0][0] - time.monotonic_ns()
+                    if remaining <= self.SPIN_NS:
+                        break
+                    self._cond.wait((remaining - self.SPIN_NS) / 1e9)
+                if not self._running:
+                    break
+                due, _, handle = heapq.heappop(self._heap)
+            # A signal cuts clock_nanosleep short; sleep again until due
+            while due > time.monotonic_ns():
+                self._sleep(due)
+            self._fire(due, handle)
+        for _, _, handle in self._heap:
+            handle.done.set()
+
+    def stats(self):
+        """Lateness of recent steps in microseconds (count/mean/p50/p99/max)"""
+        samples = sorted(self.lateness)
+        if not samples:
+            return {"steps": self.fired, "samples": 0}
+        pick = lambda q: samples[min(len(samples) - 1, int(q * len(samples)))] / 1000.0
+        return {
+            "steps": self.fired,
+            "samples": len(samples),
+            "mean_us": sum(samples) / len(samples) / 1000.0,
+            "p50_us": pick(0.50),
+            "p99_us": pick(0.99),
+            "max_us": samples[-1] / 1000.0,
+        }
+
+    def close(self):
+        """Stop the scheduler thread; running waveforms are abandoned"""
+        with self._cond:
+            self._running = False
+            self._cond.notify()
+        self._thread.join()
+
+def _parse_pin(text, lineno):
+    """Physical pin number, rejecting power/invalid pins at parse time"""
+    try:
+        pin = int(text)
+        physical_to_gpio(pin)
+    except ValueError as e:
+        raise ValueError(f"line {lineno}: {e}")
+    return pin
+
+def _parse_pins_values(args, lineno):
+    """'<pin> <v>' or '<pin>=<v> ...' -> [(pin, value), ...]"""
+    if len(args) == 2 and "=" not in args[0]:
+        args = [f"{args[0]}={args[1]}"]
+    pairs = []
+    for item in args:
+        pin, sep, value = item.partition("=")
+        if not sep or value not in ("0", "1"):
+            raise ValueError(f"line {lineno}: expected <pin>=<0|1>, got '{item}'")
+        pairs.append((_parse_pin(pin, lineno), int(value)))
+    return pairs
+
+def _parse_duration(text, lineno):
+    """'0.5', '0.5s' or '500ms' -> seconds"""
+    try:
+        if text.endswith("ms"):
+            return float(text[:-2]) / 1000.0
+        return float(text[:-1] if text.endswith("s") else text)
+    except ValueError:
+        raise ValueError(f"line {lineno}: bad duration '{text}'")
+
+def parse_script(text):
+    """Parse a GPIO script into a list of (lineno, command, args) steps
+
+    Script syntax, one command per line, '#' starts a comment:
+
+      set <pin> <0|1>            set one pin
+      set <pin>=<v> <pin>=<v>..  set several pins at once
+      on <pin> [<pin>..]         set pins HIGH
+      off <pin> [<pin>..]        set pins LOW
+      read <pin> [<pin>..]       print pin values
+      blink <pin> <count> [<period>]
+      wait <duration>            e.g. 0.5, 0.5s, 500ms
+      repeat [<count>]           repeat the block up to 'end' (forever
+      end                        without a count)
+
+    The whole script is validated before anything touches a pin; errors
+    raise ValueError naming the line.
+    """
+    steps = []
+    stack = [(steps, 0)]
+    for lineno, raw in enumerate(text.splitlines(), 1):
+        line = raw.split("#", 1)[0].strip().lower()
+        if not line:
+            continue
+        cmd, *args = line.split()
+        try:
+            if cmd == "repeat":
+                count = int(args[0]) if args else None
+                block = []
+                stack[-1][0].append((lineno, "repeat", (count, block)))
+                stack.append((block, lineno))
+            elif cmd == "end":
+                if len(stack) == 1:
+                    raise ValueError(f"line {lineno}: 'end' without 'repeat'")
+                stack.pop()
+            elif cmd == "set" and args:
+                pairs = _parse_pins_values(args, lineno)
+                stack[-1][0].append((lineno, "set", pairs))
+            elif cmd in ("on", "off") and args:
+                pairs = [(_parse_pin(pin, lineno), 1 if cmd == "on" else 0) for pin in args]
+                stack[-1][0].append((lineno, "set", pairs))
+            elif cmd == "read" and args:
+                stack[-1][0].append((lineno, "read", [_parse_pin(pin, lineno) for pin in args]))
+            elif cmd == "blink" and len(args) in (2, 3):
+                period = _parse_duration(args[2], lineno) if len(args) == 3 else 1.0
+                pin = _parse_pin(args[0], lineno)
+                stack[-1][0].append((lineno, "blink", (pin, int(args[1]), period)))
+            elif cmd == "wait" and len(args) == 1:
+                stack[-1][0].append((lineno, "wait", _parse_duration(args[0], lineno)))
+            else:
+                raise ValueError(f"line {lineno}: bad command '{line}'")
+        except ValueError as e:
+            if str(e).startswith("line "):
+                raise
+            raise ValueError(f"line {lineno}: {e}")
+    if len(stack) > 1:
+        raise ValueError(f"line {stack[-1][1]}: 'repeat' without 'end'")
+    return steps
+
+class ScriptRunner:
+    """Runs parsed script steps against one PinSession
+
+    Waits are scheduled against absolute deadlines, so the time spent on
+    pin operations does not stretch loops ("on; wait 0.5; off; wait 0.5"
+    repeats at exactly 1 Hz).
+    """
+
+    def __init__(self, session):
+        self.session = session
+        self.operations = 0
+        self.deadline = time.monotonic()
+
+    def _wait(self, seconds):
+        self.deadline += seconds
+        delay = self.deadline - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        else:
+            # Running late: don't try to catch up with a burst of steps
+            self.deadline = time.monotonic()
+
+    def run(self, steps):
+        self.deadline = time.monotonic()
+        self._run(steps)
+
+    def _run(self, steps):
+        for lineno, cmd, args in steps:
+            if cmd == "set":
+                for pin, value in args:
+                    self.session.set(pin, value)
+                self.operations += len(args)
+            elif cmd == "read":
+                for pin in args:
+                    value = self.session.read(pin)
+                    print(f"📖 Pin {pin} (GPIO {physical_to_gpio(pin)}) = {'HIGH' if value else 'LOW'} ({value})")
+                self.operations += len(args)
+            elif cmd == "blink":
+                pin, count, period = args
+                for _ in range(count):
+                    self.session.set(pin, 1)
+                    self._wait(period / 2)
+                    self.session.set(pin, 0)
+                    self._wait(period / 2)
+                self.operations += count * 2
+            elif cmd == "wait":
+                self._wait(args)
+            elif cmd == "repeat":
+                count, block = args
+                if count is None:
+                    while True:
+                        self._run(block)
+                else:
+                    for _ in range(count):
+                        self._run(block)
+
 def physical_to_gpio(pin):
     """Convert physical pin number to GPIO number"""
     if pin in POWER_PINS:
@@ -268,6 +1055,8 @@ Examples:
   %(prog)s --read 18          # Read pin 18 value
   %(prog)s --pinout           # Show pin layout
   %(prog)s --blink 18 5       # Blink pin 18 five times
+  %(prog)s --daemon           # Serve GPIO requests on a UNIX socket
+  %(prog)s --script demo.gpio # Run a GPIO script (- reads stdin)
         """
     )
     
@@ -285,11 +1074,17 @@ Examples:
                        help='Show Orange Pi Zero 2W pinout')
     parser.add_argument('--list', action='store_true',
                        help='List all controllable pins')
+    parser.add_argument('--script', metavar='FILE',
+                       help='Run a GPIO script in one session (- for stdin)')
+    parser.add_argument('--daemon', action='store_true',
+                       help='Run as a GPIO server (see gpio_client.py)')
+    parser.add_argument('--socket', default=DEFAULT_SOCKET, metavar='PATH',
+                       help=f'UNIX socket for --daemon (default: {DEFAULT_SOCKET})')
     
     args = parser.parse_args()
     
     # Check if running on compatible system
-    if not os.path.exists("/sys/class/gpio"):
+    if not os.path.exists(GPIO_ROOT):
         print("❌ Error: GPIO sysfs interface not found")
         print("   Make sure you're running on Orange Pi with GPIO support")
         sys.exit(1)
@@ -299,6 +1094,24 @@ Examples:
     try:
         if args.pinout:
             show_pinout()
+        elif args.script:
+            if args.script == '-':
+                text = sys.stdin.read()
+            else:
+                with open(args.script) as f:
+                    text = f.read()
+            steps = parse_script(text)
+            runner = ScriptRunner(PinSession(gpio))
+            start = time.monotonic()
+            try:
+                runner.run(steps)
+            except OSError as e:
+                print(f"❌ {e}")
+                sys.exit(1)
+            print(f"✅ Script complete: {runner.operations} pin operations in {time.monotonic() - start:.3f}s")
+        elif args.daemon:
+            print(f"🛰️  GPIO daemon listening on {args.socket}")
+            GPIOServer(args.socket, gpio).serve_forever()
         elif args.list:
             print("🍊 Orange Pi Zero 2W Controllable Pins:")
             for pin in sorted(ORANGEPI_ZERO2W_PINOUT.keys()):
@@ -348,17 +1161,26 @@ Examples:
             pin = int(args.blink[0])
             count = int(args.blink[1])
             gpio_num = physical_to_gpio(pin)
-            if not (gpio.export_pin(gpio_num) and gpio.set_direction(gpio_num, "out")):
+            try:
+                led = Pin(pin, "out", gpio=gpio)
+            except OSError:
                 print(f"❌ Failed to setup pin {pin}")
                 sys.exit(1)
             
+            def report(n):
+                print(f"  Blink {n}/{count}")
+            
             print(f"🔄 Blinking pin {pin} (GPIO {gpio_num}) {count} times...")
+            steps = []
             for i in range(count):
-                gpio.set_value(gpio_num, 1)
-                time.sleep(0.5)
-                gpio.set_value(gpio_num, 0)
-                time.sleep(0.5)
-                print(f"  Blink {i+1}/{count}")
+                steps.append(([(led.set, 1)], 0.5))
+                steps.append(([(led.set, 0), (report, i + 1)], 0.5))
+            scheduler = WaveformScheduler()
+            scheduler.add(steps).wait()
+            scheduler.close()
+            stats = scheduler.stats()
+            if stats["samples"]:
+                print(f"   timing: mean {stats['mean_us']:.0f} µs late, max {stats['max_us']:.0f} µs")
             print("✅ Blinking complete")
         else:
             # No arguments - enter interactive mode
@@ -67,6 +67,10 @@ if [ -f "$SCRIPT_DIR/gpio_control.py" ]; then
     cp "$SCRIPT_DIR/gpio_control.py" ~/.local/bin/
     chmod +x ~/.local/bin/gpio_control.py
     echo "   ✅ Installed to ~/.local/bin/gpio_control.py"
+    if [ -f "$SCRIPT_DIR/gpio_client.py" ]; then
+        cp "$SCRIPT_DIR/gpio_client.py" ~/.local/bin/
+        echo "   ✅ Installed to ~/.local/bin/gpio_client.py"
+    fi
 else
     echo "   ❌ gpio_control.py not found in $SCRIPT_DIR"
     exit 1
@@ -4,11 +4,16 @@ GPIO Test Script for Orange Pi Zero 2W
 Quick tests to verify GPIO functionality
 """
 
+import os
 import sys
 import time
+import tempfile
 import subprocess
 from pathlib import Path
 
+from gpio_client import GPIOClient
+from gpio_control import Pin
+
 def run_gpio_command(cmd):
     """Run a GPIO control command and return result"""
     try:
@@ -56,34 +61,29 @@ def test_safe_pin_control():
     
     print(f"Testing pin {test_pin} (GPIO 228)...")
     
-    # Test setting pin HIGH
-    print("1. Setting pin HIGH...")
-    success, stdout, stderr = run_gpio_command(["--on", str(test_pin)])
-    if success:
+    pin = Pin(test_pin)
+    try:
+        # Test setting pin HIGH
+        print("1. Setting pin HIGH...")
+        pin.on()
         print("   ✅ Pin set HIGH")
-    else:
-        print(f"   ❌ Failed to set pin HIGH: {stderr}")
-        return False
-    
-    time.sleep(0.5)
-    
-    # Test setting pin LOW
-    print("2. Setting pin LOW...")
-    success, stdout, stderr = run_gpio_command(["--off", str(test_pin)])
-    if success:
+        
+        time.sleep(0.5)
+        
+        # Test setting pin LOW
+        print("2. Setting pin LOW...")
+        pin.off()
         print("   ✅ Pin set LOW")
-    else:
-        print(f"   ❌ Failed to set pin LOW: {stderr}")
-        return False
-    
-    # Test reading pin (set as input)
-    print("3. Testing pin read...")
-    success, stdout, stderr = run_gpio_command(["--read", str(test_pin)])
-    if success:
-        print(f"   ✅ Pin read successful: {stdout.strip()}")
-    else:
-        print(f"   ❌ Failed to read pin: {stderr}")
+        
+        # Test reading pin (set as input)
+        print("3. Testing pin read...")
+        pin.setup("in")
+        print(f"   ✅ Pin read successful: {pin.read()}")
+    except OSError as e:
+        print(f"   ❌ Pin control failed: {e}")
         return False
+    finally:
+        pin.close()
     
     return True
 
@@ -96,14 +96,53 @@ def test_blink():
     blink_count = 2
     
     print(f"Blinking pin {test_pin} {blink_count} times...")
-    success, stdout, stderr = run_gpio_command(["--blink", str(test_pin), str(blink_count)])
-    
-    if success and "Blinking complete" in stdout:
+    pin = Pin(test_pin)
+    try:
+        for _ in range(blink_count):
+            pin.on()
+            time.sleep(0.5)
+            pin.off()
+            time.sleep(0.5)
         print("   ✅ Blink test successful")
         return True
-    else:
-        print(f"   ❌ Blink test failed: {stderr}")
+    except OSError as e:
+        print(f"   ❌ Blink test failed: {e}")
         return False
+    finally:
+        pin.close()
+
+def test_throughput(count=10000):
+    """Measure operation rate in-process and through the daemon"""
+    print("\n⚡ Testing GPIO Operation Rate...")
+    print("-" * 40)
+    
+    test_pin = 18
+    try:
+        pin = Pin(test_pin, "out")
+        start = time.perf_counter()
+        for i in range(count):
+            pin.set(i & 1)
+        elapsed = time.perf_counter() - start
+        pin.off()
+        pin.close()
+        print(f"   ✅ In-process: {count / elapsed:,.0f} operations/second")
+        
+        # Own daemon on a private socket, stopped again when done
+        with tempfile.TemporaryDirectory() as tmp:
+            gpio = GPIOClient(os.path.join(tmp, "gpio.sock"), autostart=True)
+            try:
+                start = time.perf_counter()
+                for i in range(count):
+                    gpio.set(test_pin, i & 1)
+                elapsed = time.perf_counter() - start
+                gpio.cleanup()
+            finally:
+                gpio.shutdown()
+        print(f"   ✅ Daemon: {count / elapsed:,.0f} operations/second")
+    except (RuntimeError, OSError) as e:
+        print(f"   ❌ Throughput test failed: {e}")
+        return False
+    return True
 
 def check_permissions():
     """Check GPIO permissions"""
@@ -161,7 +200,7 @@ def main():
     
     # Run tests
     tests_passed = 0
-    total_tests = 4
+    total_tests = 5
     
     try:
         # Test 1: Permissions
@@ -182,6 +221,10 @@ def main():
             # Test 4: Blink function
             if test_blink():
                 tests_passed += 1
+            
+            # Test 5: Operation rate
+            if test_throughput():
+                tests_passed += 1
         else:
             print("\n⚠️  Skipping pin control tests due to permission issues")
             print("   Try running with sudo or add user to gpio group")